@@ -0,0 +1,33 @@
+import logging
+from collections import Counter
+from civilization_sim.new_agents.people import Person, Predator
+
+
+class BirthQueue:
+    """Reproduction requests queued during the agent phase and born together after it."""
+    def __init__(self, model):
+        self.model = model
+        self.pending = [] # (child type, pos, child energy, tribe_id or pack_id)
+
+    def request(self, parent, child_type, energy, group):
+        self.pending.append((child_type, parent.pos, energy, group))
+        if not self.model.agent_phase:
+            self.flush()
+
+    def flush(self):
+        pending, self.pending = self.pending, []
+        if not pending:
+            return 0
+        model = self.model
+        for child_type, pos, energy, group in pending:
+            if child_type is Person:
+                child = Person(model, tribe_id=group)
+            else:
+                child = Predator(model, pack_id=group)
+            child.energy = energy
+            model.schedule.add(child)
+            model.grid.place_agent(child, pos)
+
+        born = Counter(child_type.__name__ for child_type, _, _, _ in pending)
+        logging.info(f"Народження: {dict(born)}")
+        return len(pending)
@@ -0,0 +1,110 @@
+import logging
+import numpy as np
+from civilization_sim.new_agents.resources import Tree, River
+from civilization_sim.new_agents.buildings import House, Farm
+from civilization_sim.space import moore_sum, moore_any, moore_max
+
+# Wildfire cell states
+UNBURNT, BURNING, BURNT = 0, 1, 2
+
+
+class CataclysmEngine:
+    """Wildfire and flood as cellular automata over the grid's tree and river rasters."""
+    def __init__(self, model, fire_chance=0.01, fire_spread=0.5, burnout_steps=20, flood_chance=0.005, flood_reach=3, flood_duration=5):
+        self.model = model
+        self.fire_chance = fire_chance
+        self.fire_spread = fire_spread
+        self.burnout_steps = burnout_steps
+        self.flood_chance = flood_chance
+        self.flood_reach = flood_reach
+        self.flood_duration = flood_duration
+
+        shape = (model.grid.width, model.grid.height)
+        self.fire = np.zeros(shape, dtype=np.int8) # UNBURNT / BURNING / BURNT
+        self.burnout = np.zeros(shape, dtype=np.int16) # Steps until a BURNT cell can burn again
+        self.water = np.zeros(shape, dtype=np.int16) # Steps until flood water recedes
+        self.surge = np.zeros(shape, dtype=np.int16) # Remaining reach on the flood front
+
+    def step(self):
+        self.step_fire()
+        self.step_flood()
+
+    def random_cell(self, mask):
+        cells = np.flatnonzero(mask)
+        if len(cells) == 0:
+            return None
+        return np.unravel_index(cells[self.model.rng.integers(len(cells))], mask.shape)
+
+    def destroy(self, mask, agent_types):
+        # Remove every agent of the given types on the masked cells
+        destroyed = []
+        for x, y in zip(*np.nonzero(mask)):
+            pos = (int(x), int(y))
+            for agent in self.model.grid.get_cell_list_contents([pos]):
+                if isinstance(agent, agent_types):
+                    destroyed.append((type(agent).__name__, pos))
+                    self.model.remove_agent(agent)
+        return destroyed
+
+    def step_fire(self):
+        rng = self.model.rng
+        wooded = (self.model.grid.resources.counts[Tree] > 0) & (self.fire == UNBURNT)
+        burning = self.fire == BURNING
+        ignited = np.zeros_like(burning)
+
+        # Burnt-out cells slowly become flammable again
+        cooling = self.fire == BURNT
+        self.burnout[cooling] -= 1
+        self.fire[cooling & (self.burnout <= 0)] = UNBURNT
+
+        # Spread from cells that were burning at the start of the step, which then burn out
+        if burning.any():
+            catch = 1.0 - (1.0 - self.fire_spread) ** moore_sum(burning.astype(np.int16))
+            ignited |= wooded & (rng.random(self.fire.shape) < catch)
+            self.fire[burning] = BURNT
+            self.burnout[burning] = self.burnout_steps
+
+        # Ignition
+        if rng.random() < self.fire_chance:
+            origin = self.random_cell(wooded)
+            if origin is not None:
+                ignited[origin] = True
+                logging.info(f"Лісова пожежа почалася в {tuple(int(c) for c in origin)}")
+
+        if ignited.any():
+            self.fire[ignited] = BURNING
+            for _, pos in self.destroy(ignited, Tree):
+                logging.info(f"Лісова пожежа поширилася на {pos}")
+        return int(ignited.sum())
+
+    def step_flood(self):
+        rng = self.model.rng
+        river = self.model.grid.resources.counts[River] > 0
+        floodplain = river | moore_any(river)
+        flooded = np.zeros_like(river)
+
+        # The front advances one ring per step over dry floodplain
+        front = self.surge > 0
+        if front.any():
+            reach = moore_max(self.surge) - 1
+            flooded |= floodplain & (self.water == 0) & (reach > 0)
+            self.surge[front] = 0
+            self.surge[flooded] = reach[flooded]
+
+        # Standing water recedes
+        wet = self.water > 0
+        self.water[wet] -= 1
+
+        # A new flood starts on a random river cell
+        if rng.random() < self.flood_chance:
+            origin = self.random_cell(river & (self.water == 0))
+            if origin is not None:
+                flooded[origin] = True
+                self.surge[origin] = self.flood_reach + 1
+                logging.info(f"Повінь почалася в {tuple(int(c) for c in origin)}")
+
+        if flooded.any():
+            self.water[flooded] = self.flood_duration
+            for name, pos in self.destroy(flooded, (House, Farm)):
+                logging.info(f"Повінь знищила {name} в {pos}")
+        return int(flooded.sum())
@@ -0,0 +1,38 @@
+import numpy as np
+from civilization_sim.new_agents.people import Person, Predator, Barbarian
+from civilization_sim.space import box_sum
+
+
+class ActiveChunks:
+    """The `size` x `size` chunks of the map where something is happening, plus `margin` chunks around them."""
+    def __init__(self, model, size=16, margin=1):
+        self.model = model
+        self.size = size
+        self.margin = margin
+        grid = model.grid
+        self.shape = (-(-grid.width // size), -(-grid.height // size))
+        self.chunks = np.zeros(self.shape, dtype=bool)
+        self.cells = np.zeros(0, dtype=np.intp) # Flat [x, y] indices of active cells
+
+    def update(self):
+        model = self.model
+        positions = [a.pos for agent_type in (Person, Predator, Barbarian) for a in model.agents_by_type.get(agent_type, ()) if a.pos is not None]
+        positions += [farm.pos for farm in model.harvests.farms if farm not in model.harvests.paused and farm.pos is not None]
+        occupied = np.zeros(self.shape, dtype=np.int32)
+        if positions:
+            xs, ys = np.array(positions).T
+            occupied[xs // self.size, ys // self.size] = 1
+        self.chunks = box_sum(occupied, self.margin) > 0 if self.margin else occupied > 0
+        # Every cell of every active chunk, clipped where the last chunk overhangs the grid
+        grid = model.grid
+        cx, cy = np.nonzero(self.chunks)
+        offsets = np.arange(self.size)
+        xs = cx[:, None, None] * self.size + offsets[None, :, None]
+        ys = cy[:, None, None] * self.size + offsets[None, None, :]
+        inside = (xs < grid.width) & (ys < grid.height)
+        self.cells = (xs * grid.height + ys)[inside]
+        return self.cells
+
+    @property
+    def active_count(self):
+        return int(self.chunks.sum())
@@ -0,0 +1,73 @@
+from enum import IntEnum
+import numpy as np
+from civilization_sim.new_agents.resources import Mountain, River
+from civilization_sim.space import moore_any
+
+
+class Season(IntEnum):
+    SPRING = 0
+    SUMMER = 1
+    AUTUMN = 2
+    WINTER = 3
+
+    @property
+    def label(self):
+        return ("Весна", "Літо", "Осінь", "Зима")[self]
+
+    def next(self):
+        return Season((self + 1) % 4)
+
+    def __str__(self):
+        return self.label
+
+    def __format__(self, spec):
+        return format(self.label, spec)
+
+
+# Temperature offset per season (degrees), and how much of the usual moisture is left in a drought
+SEASON_TEMPERATURE = np.array([0.0, 8.0, 0.0, -15.0])
+DROUGHT_MOISTURE = 0.3
+RIVER_DROUGHT_MOISTURE = 0.7 # On and next to rivers, enough to keep farms growing
+
+
+class Climate:
+    """Per-cell temperature, moisture and fertility rasters, recomputed when the season or drought changes."""
+    def __init__(self, model, farm_threshold=0.5):
+        self.model = model
+        self.farm_threshold = farm_threshold # Farms grow only where fertility reaches this
+        counts = model.grid.resources.counts
+        width, height = model.grid.width, model.grid.height
+        mountain = counts[Mountain] > 0
+        river = counts[River] > 0
+
+        # Warmer in the middle rows, colder towards the edges and on mountains
+        latitude = np.abs(np.arange(height) - (height - 1) / 2) / max((height - 1) / 2, 1)
+        self.base_temperature = np.tile(20.0 - 10.0 * latitude, (width, 1))
+        self.base_temperature[mountain] -= 8.0
+        # Wetter next to rivers
+        self.base_moisture = np.full((width, height), 0.5)
+        self.base_moisture[moore_any(river)] = 0.8
+        self.base_moisture[river] = 1.0
+        self.base_moisture[mountain] = 0.4
+        self.drought_moisture = np.full((width, height), DROUGHT_MOISTURE)
+        self.drought_moisture[moore_any(river) | river] = RIVER_DROUGHT_MOISTURE
+
+        self.key = None
+        self.version = 0
+        self.sync()
+
+    def sync(self):
+        # Recompute the seasonal rasters if the season or drought changed since the last call
+        key = (int(self.model.season), bool(self.model.drought_active))
+        if key == self.key:
+            return False
+        self.key = key
+        season, drought = key
+        self.temperature = self.base_temperature + SEASON_TEMPERATURE[season]
+        self.moisture = self.base_moisture * (self.drought_moisture if drought else 1.0)
+        self.fertility = np.clip(self.temperature / 10.0, 0.0, 1.0) * np.clip(self.moisture / 0.5, 0.0, 1.0)
+        self.version += 1
+        return True
+
+    def can_farm(self, pos):
+        return self.fertility[pos] >= self.farm_threshold
@@ -0,0 +1,130 @@
+import logging
+import numpy as np
+from civilization_sim.diplomacy import WAR
+from civilization_sim.new_agents.people import Predator, Barbarian
+
+ENGAGEMENTS = ("barbarian", "predator", "enemy")
+
+
+def offsets(radius):
+    # Moore neighborhood offsets, closest rings first
+    cells = [(dx, dy) for dx in range(-radius, radius + 1) for dy in range(-radius, radius + 1)]
+    return sorted(cells, key=lambda d: (max(abs(d[0]), abs(d[1])), abs(d[0]) + abs(d[1]), d))
+
+
+class CombatEngine:
+    """Attacks queued during the agent phase and resolved in one batch after it."""
+    def __init__(self, model, exertion=5, hunt_exertion=10):
+        self.model = model
+        self.exertion = exertion # Energy an attack costs (enemies, barbarians)
+        self.hunt_exertion = hunt_exertion # Energy killing a predator costs
+        self.engagements = {kind: [] for kind in ENGAGEMENTS}
+        self.raster = np.zeros((model.grid.width, model.grid.height), dtype=np.int32) # Targets per cell, cleared after each lookup
+
+    def engage(self, attacker, kind):
+        self.engagements[kind].append(attacker)
+        if not self.model.agent_phase:
+            self.resolve()
+
+    def damage_bonus(self, size):
+        # Per tribe: Militaristic +10, War God +5
+        bonus = np.zeros(size, dtype=np.int64)
+        for tribe_id, trait in self.model.tribe_traits.items():
+            if trait == "Militaristic" and tribe_id < size:
+                bonus[tribe_id] += 10
+        for tribe_id, religion in self.model.tribe_religion.items():
+            if religion == "War God" and tribe_id < size:
+                bonus[tribe_id] += 5
+        return bonus
+
+    def target_cells(self, attackers, radii):
+        # Closest cell in each attacker's range where self.raster > 0, (-1, -1) if none
+        width, height = self.model.grid.width, self.model.grid.height
+        xs = np.array([a.pos[0] for a in attackers])
+        ys = np.array([a.pos[1] for a in attackers])
+        tx = np.full(len(attackers), -1)
+        ty = np.full(len(attackers), -1)
+        for dx, dy in offsets(int(radii.max())):
+            open_ = (tx < 0) & (radii >= max(abs(dx), abs(dy)))
+            if not open_.any():
+                continue
+            cx = (xs + dx) % width
+            cy = (ys + dy) % height
+            hit = open_ & (self.raster[cx, cy] > 0)
+            tx[hit] = cx[hit]
+            ty[hit] = cy[hit]
+        return tx, ty
+
+    def closest(self, attackers, radii, targets):
+        # (attacker, target) for every attacker with one of targets in range; targets must be placed
+        cells = {}
+        for target in targets:
+            cells.setdefault(target.pos, []).append(target)
+        xs, ys = zip(*cells)
+        self.raster[xs, ys] = 1
+        tx, ty = self.target_cells(attackers, radii)
+        self.raster[xs, ys] = 0
+        return [(a, cells[(x, y)][0]) for a, x, y in zip(attackers, tx.tolist(), ty.tolist()) if x >= 0]
+
+    def resolve(self):
+        engaged, self.engagements = self.engagements, {kind: [] for kind in ENGAGEMENTS}
+        hits = [] # (attacker, target, damage)
+        for kind in ENGAGEMENTS:
+            attackers = [a for a in engaged[kind] if a.alive and a.pos is not None]
+            if attackers:
+                hits.extend(getattr(self, f"target_{kind}")(attackers))
+        if not hits:
+            return 0
+
+        victims = list(dict.fromkeys(target for _, target, _ in hits))
+        index = {victim: i for i, victim in enumerate(victims)}
+        damage = np.zeros(len(victims), dtype=np.int64)
+        np.add.at(damage, [index[target] for _, target, _ in hits], [amount for _, _, amount in hits])
+        energy = np.array([victim.energy for victim in victims], dtype=np.int64) - damage
+
+        for victim, left in zip(victims, energy.tolist()):
+            victim.energy = left
+        # After the damage, so an attacker that was hit also pays for its own attack
+        for attacker, target, _ in hits:
+            attacker.energy -= self.hunt_exertion if isinstance(target, Predator) else self.exertion
+        dead = [victim for victim in victims if victim.energy <= 0]
+        for victim in dead:
+            if victim.pos is not None:
+                logging.info(f"{type(victim).__name__} {victim.unique_id} загинув у бою в {victim.pos}")
+                self.model.remove_agent(victim)
+        logging.info(f"Бої: {len(hits)} атак, {len(dead)} загиблих")
+        return len(dead)
+
+    def target_barbarian(self, attackers):
+        barbarians = [b for b in self.model.agents_by_type.get(Barbarian, ()) if b.pos is not None]
+        if not barbarians:
+            return []
+        return [(a, target, 20 if a.profession == "Soldier" else 10)
+                for a, target in self.closest(attackers, np.ones(len(attackers), dtype=int), barbarians)]
+
+    def target_predator(self, attackers):
+        predators = [p for p in self.model.agents_by_type.get(Predator, ()) if p.pos is not None]
+        if not predators:
+            return []
+        # A guard kills the predator outright
+        return [(a, target, max(target.energy, 1))
+                for a, target in self.closest(attackers, np.ones(len(attackers), dtype=int), predators)]
+
+    def target_enemy(self, attackers):
+        # One lookup per attacking tribe over the members of the tribes it is at war with
+        relations = self.model.diplomacy.relations
+        bonus = self.damage_bonus(max([len(relations)] + [a.tribe_id + 1 for a in attackers if a.tribe_id is not None]))
+        by_tribe = {}
+        for a in attackers:
+            if a.tribe_id is not None and a.tribe_id < len(relations):
+                by_tribe.setdefault(a.tribe_id, []).append(a)
+        hits = []
+        for tribe_id, tribe_attackers in by_tribe.items():
+            enemies = [p for enemy in np.flatnonzero(relations[tribe_id] == WAR).tolist()
+                       for p in self.model.tribes.members(enemy) if p.pos is not None]
+            if not enemies:
+                continue
+            radii = np.array([3 if a.profession == "Archer" else 1 for a in tribe_attackers])
+            for a, target in self.closest(tribe_attackers, radii, enemies):
+                hits.append((a, target, (15 if a.profession == "Archer" else 20) + int(bonus[tribe_id])))
+        return hits
@@ -0,0 +1,119 @@
+from collections.abc import MutableSet
+import numpy as np
+
+NEUTRAL, ALLIANCE, WAR = 0, 1, 2
+RELATION_NAMES = ("Neutral", "Alliance", "War")
+
+
+class WarSet(MutableSet):
+    """Live view of the War entries of a DiplomacyMatrix as sorted (tribe_id, tribe_id) pairs."""
+    def __init__(self, diplomacy):
+        self._diplomacy = diplomacy
+
+    def __contains__(self, key):
+        try:
+            a, b = key
+        except (TypeError, ValueError):
+            return False
+        return self._diplomacy.get(a, b) == WAR
+
+    def __iter__(self):
+        rows, cols = np.nonzero(np.triu(self._diplomacy.relations == WAR, k=1))
+        return iter([(int(a), int(b)) for a, b in zip(rows, cols)])
+
+    def __len__(self):
+        return int(np.count_nonzero(np.triu(self._diplomacy.relations == WAR, k=1)))
+
+    def add(self, key):
+        self._diplomacy.set(*key, WAR)
+
+    def discard(self, key):
+        if key in self:
+            self._diplomacy.set(*key, NEUTRAL)
+
+    def copy(self):
+        # Snapshot as a plain set (the view itself keeps changing)
+        return set(self)
+
+
+class DiplomacyMatrix:
+    """Symmetric T x T relation matrix (Neutral / Alliance / War), indexed by tribe_id."""
+    def __init__(self, num_tribes=0):
+        self.size = 0
+        self._relations = np.zeros((8, 8), dtype=np.int8)
+        self.wars = WarSet(self)
+        for tribe_id in range(num_tribes):
+            self.add_tribe(tribe_id)
+
+    @property
+    def relations(self):
+        return self._relations[:self.size, :self.size]
+
+    def add_tribe(self, tribe_id):
+        # New tribes start Neutral with everyone
+        capacity = len(self._relations)
+        if tribe_id >= capacity:
+            while capacity <= tribe_id:
+                capacity *= 2
+            grown = np.zeros((capacity, capacity), dtype=np.int8)
+            grown[:self.size, :self.size] = self.relations
+            self._relations = grown
+        self._relations[tribe_id, :] = NEUTRAL
+        self._relations[:, tribe_id] = NEUTRAL
+        self.size = max(self.size, tribe_id + 1)
+
+    def get(self, a, b):
+        if a is None or b is None or a == b or not (0 <= a < self.size and 0 <= b < self.size):
+            return NEUTRAL
+        return int(self._relations[a, b])
+
+    def set(self, a, b, relation):
+        self._relations[a, b] = relation
+        self._relations[b, a] = relation
+
+    def relation(self, a, b):
+        return RELATION_NAMES[self.get(a, b)]
+
+    def update(self, food, governments, religions, rng):
+        """One diplomacy round over all tribe pairs. Returns the pairs that allied, declared war and made peace."""
+        n = self.size
+        if n < 2:
+            empty = np.empty((0, 2), dtype=int)
+            return empty, empty, empty
+
+        relations = self.relations
+        upper = np.triu(np.ones((n, n), dtype=bool), k=1)
+        at_war = relations == WAR
+        open_pairs = upper & ~at_war & (relations != ALLIANCE)
+
+        def both(mask):
+            return mask[:, None] & mask[None, :]
+
+        def either(mask):
+            return mask[:, None] | mask[None, :]
+
+        same_religion = religions[:, None] == religions[None, :]
+        monarchy = governments == "Monarchy"
+        draws = rng.random((2, n, n)) # Single batched draw: [0] alliance/peace rolls, [1] war rolls
+
+        # --- ALLIANCE: same religion (+2), both Republics (+2), both rich (+1) ---
+        alliance_score = 2 * same_religion + 2 * both(governments == "Republic") + both(food > 300)
+        new_alliances = open_pairs & (alliance_score >= 3) & (draws[0] < 0.05)
+
+        # --- WAR: scarcity next to plenty, religious conflict under a Theocracy, militaristic Monarchies ---
+        poor, wealthy = food < 50, food > 200
+        war_chance = (0.05 * (poor[:, None] & wealthy[None, :]) + 0.05 * (wealthy[:, None] & poor[None, :])
+                      + 0.02 * (~same_religion & either(governments == "Theocracy"))
+                      + 0.01 * monarchy[:, None] + 0.01 * monarchy[None, :])
+        new_wars = open_pairs & (draws[1] < war_chance)
+
+        # --- PEACE: both exhausted or both rich enough ---
+        peace_terms = both(food > 100) | both(food < 10)
+        new_peace = upper & at_war & peace_terms & (draws[0] < 0.1)
+
+        # Same outcome as the old pairwise loop: a war declared this round overrides a new alliance
+        for mask, relation in ((new_alliances, ALLIANCE), (new_wars, WAR), (new_peace, NEUTRAL)):
+            relations[mask] = relation
+            relations[mask.T] = relation
+
+        return np.argwhere(new_alliances), np.argwhere(new_wars), np.argwhere(new_peace)
@@ -0,0 +1,142 @@
+import logging
+import numpy as np
+from civilization_sim.new_agents.resources import Food, Tree, Stone, IronOre, Mountain, River
+from civilization_sim.space import moore_any
+
+# Biomes are derived from terrain, and recomputed only when mountains or rivers change
+GRASSLAND, RIVERBANK, FOOTHILLS, MOUNTAIN = range(4)
+BIOME_NAMES = ("Grassland", "Riverbank", "Foothills", "Mountain")
+
+# Per resource, per biome (Grassland, Riverbank, Foothills, Mountain):
+#   seed     - chance per step that an empty cell sprouts one item
+#   rate     - logistic growth per item already on the cell
+#   capacity - max items per cell
+# plus a global cap as a fraction of the world's cells, and whether growth is scaled by climate fertility.
+# Seed rates roughly match the old fixed spawns (10 Food, 5 Trees, 5 Stone, 0.3 Iron per step on 20x20).
+REGROWTH = {
+    Food: {"seed": (0.02, 0.04, 0.01, 0.0), "rate": (0.05, 0.08, 0.03, 0.0), "capacity": (2, 3, 1, 0), "global": 0.5, "fertility": True},
+    Tree: {"seed": (0.01, 0.015, 0.01, 0.0), "rate": (0.03, 0.04, 0.03, 0.0), "capacity": (2, 3, 2, 0), "global": 0.4, "fertility": True},
+    Stone: {"seed": (0.005, 0.005, 0.02, 0.03), "rate": (0.0, 0.0, 0.0, 0.0), "capacity": (1, 1, 2, 3), "global": 0.2, "fertility": False},
+    IronOre: {"seed": (0.0003, 0.0003, 0.002, 0.003), "rate": (0.0, 0.0, 0.0, 0.0), "capacity": (1, 1, 1, 1), "global": 0.02, "fertility": False},
+}
+
+
+class RegrowthEngine:
+    """Carrying-capacity bounded resource regrowth, updated as a raster."""
+    def __init__(self, model, rules=REGROWTH):
+        self.model = model
+        self.rules = {}
+        cells = model.grid.width * model.grid.height
+        for agent_type, rule in rules.items():
+            self.rules[agent_type] = (
+                np.array(rule["seed"], dtype=float),
+                np.array(rule["rate"], dtype=float),
+                np.array(rule["capacity"], dtype=float),
+                int(rule["global"] * cells),
+                rule.get("fertility", False),
+            )
+        self.last_spawned = {}
+        self.terrain_version = None # (Mountain, River) type_versions the cached biome raster was built from
+        self.biome = None
+        self.updated = np.zeros((model.grid.width, model.grid.height), dtype=np.int64) # Step each cell last regrew
+
+    def biomes(self):
+        versions = self.model.grid.type_versions
+        key = (versions.get(Mountain, 0), versions.get(River, 0))
+        if key == self.terrain_version:
+            return self.biome
+        counts = self.model.grid.resources.counts
+        mountain = counts[Mountain] > 0
+        river = counts[River] > 0
+        biome = np.full(mountain.shape, GRASSLAND, dtype=np.int8)
+        biome[moore_any(mountain)] = FOOTHILLS
+        biome[river | moore_any(river)] = RIVERBANK
+        biome[mountain] = MOUNTAIN
+        self.terrain_version, self.biome = key, biome
+        return biome
+
+    def growth_probability(self, agent_type, biome, cells=None):
+        # Per-cell raster, or a flat array over `cells` (flat [x, y] indices) when given
+        seed, rate, capacity, global_capacity, uses_fertility = self.rules[agent_type]
+        n = self.model.grid.resources.counts[agent_type]
+        fertility = self.model.climate.fertility if uses_fertility else None
+        if cells is not None:
+            biome, n = biome.ravel()[cells], n.ravel()[cells]
+            fertility = fertility.ravel()[cells] if uses_fertility else None
+        k = capacity[biome]
+        with np.errstate(divide="ignore", invalid="ignore"):
+            room = np.where(k > 0, 1.0 - n / k, 0.0)
+        probability = (seed[biome] + rate[biome] * n) * np.clip(room, 0.0, 1.0)
+        if uses_fertility:
+            probability = probability * fertility
+        total = self.model.grid.resources.totals[agent_type]
+        global_room = max(0.0, 1.0 - total / global_capacity) if global_capacity > 0 else 0.0
+        return np.clip(probability * global_room, 0.0, 1.0), global_capacity - total
+
+    def step(self, cells=None):
+        rng = self.model.rng
+        biome = self.biomes()
+        self.last_spawned = {}
+        if cells is not None:
+            now = self.model.schedule.steps
+            elapsed = now - self.updated.ravel()[cells]
+            self.updated.ravel()[cells] = now
+        for agent_type in self.rules:
+            probability, headroom = self.growth_probability(agent_type, biome, cells)
+            if cells is None:
+                hits = np.flatnonzero(rng.random(probability.shape) < probability)
+            else:
+                probability = 1.0 - (1.0 - probability) ** elapsed # Catch up on the steps the cell slept through
+                hits = cells[rng.random(len(cells)) < probability]
+            if len(hits) > headroom:
+                keep = np.sort(rng.choice(len(hits), size=max(headroom, 0), replace=False))
+                hits = hits[keep]
+            xs, ys = np.unravel_index(hits, biome.shape)
+            for x, y in zip(xs.tolist(), ys.tolist()):
+                agent = agent_type(self.model)
+                self.model.schedule.add(agent)
+                self.model.grid.place_agent(agent, (x, y))
+            self.last_spawned[agent_type.__name__] = len(xs)
+        logging.info(f"Відновлення ресурсів: {self.last_spawned}")
+        return self.last_spawned
+
+
+# Steps a resource item lasts once placed, and the random spread added on top so
+# items placed together don't all expire in the same step
+LIFETIMES = {
+    Food: (200, 50),
+}
+
+
+class SpoilageQueue:
+    """Expiry for perishable resources, kept as per-step buckets."""
+    def __init__(self, model, lifetimes=LIFETIMES):
+        self.model = model
+        self.lifetimes = lifetimes
+        self.buckets = {} # step -> items spoiling at that step
+        self.cursor = 0 # First step whose bucket hasn't been popped yet
+        self.last_spoiled = 0
+
+    def add(self, agent):
+        lifetime, spread = self.lifetimes[type(agent)]
+        now = self.model.schedule.steps
+        agent.placed_at = now
+        due = max(now + lifetime + int(self.model.rng.integers(spread + 1)), self.cursor)
+        self.buckets.setdefault(due, []).append(agent)
+
+    def step(self):
+        now = self.model.schedule.steps
+        spoiled = 0
+        while self.cursor <= now:
+            for agent in self.buckets.pop(self.cursor, ()):
+                if agent.pos is not None:
+                    self.model.remove_agent(agent)
+                    spoiled += 1
+            self.cursor += 1
+        self.last_spoiled = spoiled
+        if spoiled:
+            logging.info(f"Зіпсувалося ресурсів: {spoiled}")
+        return spoiled
+
+    def __len__(self):
+        return sum(len(bucket) for bucket in self.buckets.values())
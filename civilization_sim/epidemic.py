@@ -0,0 +1,82 @@
+import logging
+import numpy as np
+from civilization_sim.new_agents.buildings import Hospital
+from civilization_sim.new_agents.people import Person
+from civilization_sim.space import moore_sum
+
+
+class EpidemicEngine:
+    """Plague spread and recovery for the whole grid in one pass per step."""
+    def __init__(self, model, spread_chance=0.1, recovery_chance=0.05, medicine_bonus=0.1, hospital_bonus=0.2):
+        self.model = model
+        self.spread_chance = spread_chance
+        self.recovery_chance = recovery_chance
+        self.medicine_bonus = medicine_bonus
+        self.hospital_bonus = hospital_bonus
+        self.infected = {} # Person -> None, kept in sync by Person.infected
+        shape = (model.grid.width, model.grid.height)
+        self.occupants = np.zeros(shape, dtype=np.int32) # Persons per cell
+        self.sick = np.zeros(shape, dtype=np.int32) # Infected persons per cell
+
+    def set_infected(self, person, infected):
+        was_infected = person in self.infected
+        if infected:
+            self.infected[person] = None
+        else:
+            self.infected.pop(person, None)
+        if person.pos is not None and was_infected != bool(infected):
+            self.sick[person.pos] += 1 if infected else -1
+
+    def placed(self, person):
+        self.occupants[person.pos] += 1
+        if person in self.infected:
+            self.sick[person.pos] += 1
+
+    def removed(self, person, pos):
+        self.occupants[pos] -= 1
+        if person in self.infected:
+            self.sick[pos] -= 1
+
+    def medicine_flags(self, tribe_ids):
+        technologies = self.model.tribe_technologies
+        return np.array([t is not None and "Medicine" in technologies.get(t, ()) for t in tribe_ids], dtype=bool)
+
+    def exposed(self, exposure):
+        # Susceptible persons in cells next to an infected one
+        grid = self.model.grid
+        xs, ys = np.nonzero((exposure > 0) & (self.occupants > self.sick))
+        return [a for x, y in zip(xs.tolist(), ys.tolist()) for a in grid.get_cell_list_contents([(x, y)])
+                if isinstance(a, Person) and a not in self.infected]
+
+    def step(self):
+        if not self.infected:
+            return 0, 0
+        grid = self.model.grid
+        exposure = moore_sum(self.sick)
+        susceptible = self.exposed(exposure)
+        sick = [p for p in self.infected if p.pos is not None]
+        people = susceptible + sick
+        if not people:
+            return 0, 0
+
+        xs = np.array([p.pos[0] for p in people])
+        ys = np.array([p.pos[1] for p in people])
+        infected = np.arange(len(people)) >= len(susceptible)
+
+        # Per person: chance of catching it (susceptible) or of recovering (infected)
+        catch = 1.0 - (1.0 - self.spread_chance) ** exposure[xs, ys]
+        hospital = grid.resources.counts[Hospital][xs, ys] > 0
+        medicine = self.medicine_flags([p.tribe_id for p in people])
+        recover = self.recovery_chance + self.medicine_bonus * medicine + self.hospital_bonus * hospital
+
+        draws = self.model.rng.random(len(people))
+        new_cases = np.nonzero(~infected & (draws < catch))[0]
+        recoveries = np.nonzero(infected & (draws < recover))[0]
+
+        for i in new_cases.tolist():
+            people[i].infected = True
+            logging.info(f"Людина {people[i].unique_id} заразилася чумою")
+        for i in recoveries.tolist():
+            people[i].infected = False
+            logging.info(f"Людина {people[i].unique_id} одужала від чуми!")
+        return len(new_cases), len(recoveries)
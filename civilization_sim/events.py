@@ -0,0 +1,114 @@
+import heapq
+import itertools
+import logging
+import math
+from civilization_sim.new_agents.resources import Food
+
+
+class Event:
+    """A scheduled callback. Cancelled events stay in the heap and are skipped when popped."""
+    __slots__ = ("time", "callback", "args", "cancelled")
+
+    def __init__(self, time, callback, args):
+        self.time = time
+        self.callback = callback
+        self.args = args
+        self.cancelled = False
+
+    def cancel(self):
+        self.cancelled = True
+
+
+class EventCalendar:
+    """Min-heap of events keyed by step; events due at the same step run in scheduling order."""
+    def __init__(self):
+        self._heap = []
+        self._seq = itertools.count()
+
+    def schedule(self, time, callback, *args):
+        event = Event(time, callback, args)
+        heapq.heappush(self._heap, (time, next(self._seq), event))
+        return event
+
+    def run(self, until):
+        # Run every event with time <= until (events may schedule new ones)
+        ran = 0
+        while self._heap and self._heap[0][0] <= until:
+            _, _, event = heapq.heappop(self._heap)
+            if not event.cancelled:
+                event.callback(*event.args)
+                ran += 1
+        return ran
+
+    def __len__(self):
+        return sum(1 for _, _, event in self._heap if not event.cancelled)
+
+
+class HarvestScheduler:
+    """Farms on the event calendar, one pending harvest event per growing farm."""
+    def __init__(self, model, calendar):
+        self.model = model
+        self.calendar = calendar
+        self.farms = {} # Farm -> None, in placement order
+        self.paused = set() # Farms whose cell is too cold or dry to grow
+        self.climate_version = None
+
+    def can_grow(self, farm):
+        return self.model.climate.can_farm(farm.pos)
+
+    def add(self, farm, start):
+        # start: first step in which the farm grows
+        farm.growing_since = start
+        self.farms[farm] = None
+        if self.can_grow(farm):
+            self._schedule(farm)
+        else:
+            self.paused.add(farm)
+
+    def remove(self, farm):
+        self.farms.pop(farm, None)
+        self.paused.discard(farm)
+        if farm.harvest_event is not None:
+            farm.harvest_event.cancel()
+            farm.harvest_event = None
+
+    def _schedule(self, farm):
+        remaining = farm.harvest_threshold - farm.growth_progress
+        steps = max(1, math.ceil(remaining / farm.growth_per_step))
+        farm.harvest_event = self.calendar.schedule(farm.growing_since + steps - 1, self.harvest, farm)
+
+    def refresh(self, now):
+        # Called before the agent phase of step `now`; reschedules only when the climate changed
+        climate = self.model.climate
+        climate.sync()
+        if climate.version == self.climate_version:
+            return
+        self.climate_version = climate.version
+        for farm in self.farms:
+            growing = self.can_grow(farm)
+            if growing == (farm not in self.paused):
+                continue
+            if growing:
+                self.paused.discard(farm)
+                farm.growing_since = max(now, farm.growing_since)
+                self._schedule(farm)
+            else:
+                self.paused.add(farm)
+                farm.growth_progress += max(0, now - farm.growing_since) * farm.growth_per_step
+                if farm.harvest_event is not None:
+                    farm.harvest_event.cancel()
+                    farm.harvest_event = None
+
+    def harvest(self, farm):
+        farm.harvest_event = None
+        if farm.pos is None:
+            return
+        # Grow food on the farm's cell
+        food = Food(self.model)
+        self.model.schedule.add(food)
+        self.model.grid.place_agent(food, farm.pos)
+        farm.growth_progress = 0
+        farm.growing_since = self.model.schedule.steps # Harvests run right after the agent phase
+        self._schedule(farm)
+        source = "River Farm" if farm.growth_bonus > 0 else "Farm"
+        logging.info(f"{source} {farm.unique_id} (Tribe {farm.tribe_id}) produced food at {farm.pos}")
@@ -0,0 +1,65 @@
+import numpy as np
+from civilization_sim.new_agents.buildings import Road
+from civilization_sim.new_agents.resources import Tree, Stone, Mountain, River
+from civilization_sim.space import moore_rolls
+
+
+class FlowField:
+    """Travel cost from every cell to the nearest target building, refreshed when targets or movement costs change."""
+    IMPASSABLE = 100
+
+    def __init__(self, model, target_types):
+        self.model = model
+        self.target_types = tuple(target_types)
+        self.watched = self.target_types + (Road, Tree, Stone, River, Mountain) # Movement cost types, see model.movement_costs()
+        self.version = None
+        self.cost = None
+        self.distance = None
+        self.source_cells = set()
+
+    def sources(self):
+        return {pos for pos, types in self.model.grid.sites.types.items() if any(t in types for t in self.target_types)}
+
+    def relax(self, distance):
+        step_cost = np.where(self.cost < self.IMPASSABLE, self.cost, np.inf)
+        while True:
+            through = distance + step_cost
+            best = np.minimum.reduce(list(moore_rolls(through)))
+            improved = best < distance
+            if not improved.any():
+                return distance
+            distance = np.where(improved, best, distance)
+
+    def refresh(self):
+        grid = self.model.grid
+        version = tuple(grid.type_versions.get(t, 0) for t in self.watched)
+        if self.version == version:
+            return False
+        self.version = version
+        sources = self.sources()
+        cost = self.model.movement_costs()
+        if self.distance is not None and sources >= self.source_cells and (cost <= self.cost).all():
+            distance = self.distance.copy() # Distances can only drop
+        else:
+            distance = np.full((grid.width, grid.height), np.inf)
+        for pos in sources:
+            distance[pos] = 0
+        self.cost = cost
+        self.source_cells = sources
+        self.distance = self.relax(distance)
+        return True
+
+    def passable_steps(self, pos):
+        self.refresh()
+        neighborhood = self.model.grid.get_neighborhood(pos, moore=True, include_center=False)
+        return [p for p in neighborhood if self.cost[p] < self.IMPASSABLE]
+
+    def next_step(self, pos):
+        """Passable neighbor of pos closest to a target, None if no target is reachable."""
+        steps = self.passable_steps(pos)
+        if not steps:
+            return None
+        best = min(steps, key=lambda p: self.distance[p])
+        if not np.isfinite(self.distance[best]):
+            return None
+        return best
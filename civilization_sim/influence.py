@@ -0,0 +1,53 @@
+import numpy as np
+from civilization_sim.new_agents.people import Person, Predator, Barbarian
+from civilization_sim.space import box_sum, distance_field
+
+
+class InfluenceMaps:
+    """Threat (predators, barbarians) and prey (persons) fields, rebuilt once per step from agent positions."""
+    def __init__(self, model, radius=2):
+        self.model = model
+        self.radius = radius # Vision range of persons and predators
+        self.cap = 2 * radius + 1 # Distances past vision range all read as cap
+        self.update()
+
+    def raster(self, agent_types):
+        grid = self.model.grid
+        counts = np.zeros((grid.width, grid.height), dtype=np.int32)
+        for agent_type in agent_types:
+            for agent in self.model.agents_by_type.get(agent_type, ()):
+                if agent.pos is not None:
+                    counts[agent.pos] += 1
+        return counts
+
+    def update(self):
+        self.threat = self.raster((Predator, Barbarian))
+        self.prey = self.raster((Person,))
+        self.threat_near = box_sum(self.threat, self.radius) > 0 # Own cell included
+        self.prey_near = box_sum(self.prey, self.radius) - self.prey > 0 # Other cells only
+        self.threat_distance = distance_field(self.threat > 0, self.cap)
+        self.prey_distance = distance_field(self.prey > 0, self.cap)
+
+    def toward_threat(self, steps):
+        return min(steps, key=lambda pos: self.threat_distance[pos])
+
+    def away_from_threat(self, steps):
+        return max(steps, key=lambda pos: self.threat_distance[pos])
+
+    def toward_prey(self, steps, origin):
+        if not self.prey[origin]:
+            return min(steps, key=lambda pos: self.prey_distance[pos])
+        # Persons on the predator's own cell are not prey to step towards: measure to the other prey cells in sight
+        grid = self.model.grid
+        r = self.cap + 1
+        xs = (origin[0] + np.arange(-r, r + 1)) % grid.width
+        ys = (origin[1] + np.arange(-r, r + 1)) % grid.height
+        window = self.prey[np.ix_(xs, ys)] > 0
+        window[r, r] = False
+        px, py = np.nonzero(window)
+
+        def distance(pos):
+            dx = (pos[0] - origin[0] + 1) % grid.width - 1 + r
+            dy = (pos[1] - origin[1] + 1) % grid.height - 1 + r
+            return min(int((np.abs(px - dx) + np.abs(py - dy)).min()), self.cap) if len(px) else self.cap
+        return min(steps, key=distance)
@@ -0,0 +1,73 @@
+from civilization_sim.new_agents.people import Person, Predator, Barbarian
+from civilization_sim.new_agents.resources import River, Mountain
+from civilization_sim.new_agents.buildings import Road, Wall
+
+
+class LODScheduler:
+    """Level-of-detail thinking for Person.step: idle persons re-plan every `max_stagger` steps."""
+    # Cell contents that never give a Person something to do
+    PASSIVE_TYPES = (River, Mountain, Road, Wall)
+
+    def __init__(self, model, max_stagger=4, radius=3):
+        self.model = model
+        self.max_stagger = max(1, max_stagger)
+        self.radius = radius # Covers archer range (3) and predator flee range (2)
+        self.threat_cells = set()
+        self.war_cells = {} # tribe_id -> cells near its members (only for tribes at war)
+        self.enemies = {} # tribe_id -> set of tribe ids it is at war with
+        self.tier_counts = {"active": 0, "idle": 0}
+
+    def update(self):
+        # Rebuilt once per step, before agents act
+        self.tier_counts = {"active": 0, "idle": 0}
+        self.threat_cells = set()
+        self.war_cells = {}
+        self.enemies = {}
+        if self.max_stagger == 1:
+            return
+
+        for tribe_a, tribe_b in self.model.wars:
+            self.enemies.setdefault(tribe_a, set()).add(tribe_b)
+            self.enemies.setdefault(tribe_b, set()).add(tribe_a)
+
+        agents_by_type = self.model.agents_by_type
+        for agent_type in (Predator, Barbarian):
+            for agent in agents_by_type.get(agent_type, ()):
+                if agent.pos is not None:
+                    self.mark(self.threat_cells, agent.pos)
+
+        for person in agents_by_type.get(Person, ()):
+            if person.pos is None:
+                continue
+            if person.infected:
+                self.mark(self.threat_cells, person.pos)
+            if person.tribe_id in self.enemies:
+                self.mark(self.war_cells.setdefault(person.tribe_id, set()), person.pos)
+
+    def mark(self, cells, pos):
+        # Add every cell within `radius` of pos (the grid is a torus)
+        width, height = self.model.grid.width, self.model.grid.height
+        x, y = pos
+        for dx in range(-self.radius, self.radius + 1):
+            for dy in range(-self.radius, self.radius + 1):
+                cells.add(((x + dx) % width, (y + dy) % height))
+
+    def is_active(self, person, cell_mates):
+        if person.last_decision[0] is None:
+            return True # No intent to reuse yet
+        if person.infected or person.energy < 20:
+            return True
+        if person.pos in self.threat_cells:
+            return True
+        for enemy_id in self.enemies.get(person.tribe_id, ()):
+            if person.pos in self.war_cells.get(enemy_id, ()):
+                return True
+        # Anything to gather, work at, trade with or build around on this cell
+        return any(a is not person and not isinstance(a, self.PASSIVE_TYPES) for a in cell_mates)
+
+    def should_think(self, person, cell_mates):
+        if self.max_stagger == 1 or self.is_active(person, cell_mates):
+            self.tier_counts["active"] += 1
+            return True
+        self.tier_counts["idle"] += 1
+        return (self.model.schedule.steps + person.unique_id) % self.max_stagger == 0
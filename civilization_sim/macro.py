@@ -0,0 +1,178 @@
+import logging
+from collections import deque
+import numpy as np
+from civilization_sim.diplomacy import WAR
+from civilization_sim.new_agents.people import Person, Predator, Barbarian
+from civilization_sim.space import box_sum
+
+
+class AggregateTribe:
+    """A collapsed tribe: population and stockpile flows advanced by equations, plus its members' last state."""
+    __slots__ = ("tribe_id", "population", "size", "growth", "flows", "carry", "members", "territory", "since", "starving")
+
+    def __init__(self, tribe_id, population, growth, flows, members, territory, since):
+        self.tribe_id = tribe_id
+        self.population = population # Float, advanced by exp(growth) per step
+        self.size = population # Members at the collapse
+        self.growth = growth # Fitted log-population slope per step
+        self.flows = flows # Fitted stockpile change per member per step, per resource
+        self.carry = np.zeros_like(flows) # Fractional stockpile amounts not yet deposited
+        self.members = members # (pos, age, energy, profession) at collapse
+        self.territory = territory # Cells within `radius` of the members
+        self.since = since # Step of the collapse
+        self.starving = False # A stockpile would have gone negative
+
+
+class MacroEngine:
+    """Level of detail for whole tribes: stable tribes are collapsed and advanced by equations."""
+    def __init__(self, model, window=50, max_drift=0.1, min_population=3, radius=3):
+        self.model = model
+        self.window = window
+        self.max_drift = max_drift
+        self.min_population = min_population
+        self.radius = radius
+        self.history = {} # tribe_id -> deque of (population, stockpile row) for agent-level tribes
+        self.aggregates = {} # tribe_id -> AggregateTribe
+        self.viewed = set() # Tribes being inspected, kept at agent level
+
+    def population(self):
+        return sum(int(round(aggregate.population)) for aggregate in self.aggregates.values())
+
+    def inspect(self, tribe_id):
+        self.viewed.add(tribe_id)
+        if tribe_id in self.aggregates:
+            self.expand(tribe_id)
+
+    def release(self, tribe_id):
+        self.viewed.discard(tribe_id)
+
+    def step(self):
+        self.record()
+        if self.aggregates:
+            everyone = self.everyone()
+            for tribe_id in [t for t, aggregate in self.aggregates.items() if self.disturbed(aggregate, everyone)]:
+                self.expand(tribe_id)
+        self.advance()
+        for tribe_id in self.stable_tribes():
+            self.collapse(tribe_id)
+
+    def record(self):
+        tribe_ids = [t for t in self.model.tribes.counts if t in self.model.tribe_stockpiles and t not in self.aggregates]
+        rows = self.model.tribe_stockpiles.block(tribe_ids) if tribe_ids else []
+        for tribe_id in list(self.history):
+            if tribe_id not in self.model.tribes:
+                del self.history[tribe_id]
+        for tribe_id, row in zip(tribe_ids, rows):
+            history = self.history.setdefault(tribe_id, deque(maxlen=self.window))
+            history.append((self.model.tribes.counts[tribe_id], row))
+
+    def at_war(self, tribe_id):
+        relations = self.model.diplomacy.relations
+        return tribe_id < len(relations) and bool((relations[tribe_id] == WAR).any())
+
+    def occupancy(self, agents):
+        grid = self.model.grid
+        counts = np.zeros((grid.width, grid.height), dtype=np.int32)
+        for agent in agents:
+            if agent.pos is not None:
+                counts[agent.pos] += 1
+        return counts
+
+    def everyone(self):
+        # Persons, predators and barbarians on the map, per cell
+        agents_by_type = self.model.agents_by_type
+        return self.occupancy([a for agent_type in (Person, Predator, Barbarian) for a in agents_by_type.get(agent_type, ())])
+
+    def stable_tribes(self):
+        candidates = []
+        for tribe_id, history in self.history.items():
+            if len(history) < self.window or tribe_id in self.aggregates or tribe_id in self.viewed or self.at_war(tribe_id):
+                continue
+            first, last = history[0][0], history[-1][0]
+            if last < self.min_population or abs(last - first) > self.max_drift * first:
+                continue
+            candidates.append(tribe_id)
+        if not candidates:
+            return []
+
+        # Nobody from outside the tribe (other tribes, loners, predators, barbarians) near its members
+        everyone = self.everyone()
+        stable = []
+        for tribe_id in candidates:
+            members = list(self.model.tribes.members(tribe_id))
+            if any(member.infected for member in members):
+                continue
+            own = self.occupancy(members)
+            territory = box_sum(own, self.radius) > 0
+            if not (everyone - own)[territory].any():
+                stable.append(tribe_id)
+        return stable
+
+    def collapse(self, tribe_id):
+        history = self.history.pop(tribe_id)
+        populations = np.array([population for population, _ in history], dtype=float)
+        rows = np.array([row for _, row in history], dtype=float)
+        t = np.arange(len(history))
+        growth = np.polyfit(t, np.log(np.maximum(populations, 1)), 1)[0]
+        flows = np.polyfit(t, rows, 1)[0] / populations.mean()
+
+        members = list(self.model.tribes.members(tribe_id))
+        territory = box_sum(self.occupancy(members), self.radius) > 0
+        snapshot = [(member.pos, member.age, member.energy, member.profession) for member in members]
+        for member in members:
+            self.model.remove_agent(member)
+        self.aggregates[tribe_id] = AggregateTribe(tribe_id, float(len(members)), growth, flows, snapshot, territory, self.model.schedule.steps)
+        logging.info(f"Плем'я {tribe_id} згорнуто в агреговану модель ({len(members)} людей, ріст {growth:+.4f}/крок)")
+
+    def disturbed(self, aggregate, everyone):
+        if aggregate.starving or aggregate.tribe_id in self.viewed or self.at_war(aggregate.tribe_id):
+            return True
+        if abs(aggregate.population - aggregate.size) > self.max_drift * aggregate.size:
+            return True # Grown or shrunk out of the regime it was fitted in
+        return bool(everyone[aggregate.territory].any()) # Its own members are off the map
+
+    def advance(self):
+        # One vectorized update for every collapsed tribe
+        if not self.aggregates:
+            return
+        tribe_ids = list(self.aggregates)
+        aggregates = [self.aggregates[t] for t in tribe_ids]
+        population = np.array([a.population for a in aggregates]) * np.exp([a.growth for a in aggregates])
+        carry = np.array([a.carry for a in aggregates]) + np.array([a.flows for a in aggregates]) * population[:, None]
+        whole = np.trunc(carry)
+        current = self.model.tribe_stockpiles.block(tribe_ids)
+        updated = current + whole.astype(np.int64)
+        starving = (updated < 0).any(axis=1)
+        self.model.tribe_stockpiles.add_block(tribe_ids, np.maximum(updated, 0) - current)
+        for aggregate, size, left, hungry in zip(aggregates, population.tolist(), carry - whole, starving.tolist()):
+            aggregate.population = size
+            aggregate.carry = left
+            aggregate.starving = hungry
+
+    def expand(self, tribe_id):
+        aggregate = self.aggregates.pop(tribe_id)
+        model = self.model
+        elapsed = model.schedule.steps - aggregate.since
+        max_age = 120 if "Medicine" in model.tribe_technologies.get(tribe_id, set()) else 100
+        count = max(0, int(round(aggregate.population)))
+
+        # Members that would still be alive come back aged; newborns make up the rest
+        survivors = [(pos, age + elapsed, energy, profession) for pos, age, energy, profession in aggregate.members if age + elapsed < max_age]
+        order = model.rng.permutation(len(survivors))
+        people = [survivors[i] for i in order[:count]]
+        positions = [pos for pos, _, _, _ in aggregate.members]
+        for _ in range(count - len(people)):
+            people.append((positions[model.rng.integers(len(positions))], 0, 25, None))
+
+        for pos, age, energy, profession in people:
+            person = Person(model)
+            person.age = age
+            if profession is not None:
+                person.profession = profession
+            person.energy = energy
+            person.tribe_id = tribe_id
+            model.schedule.add(person)
+            model.grid.place_agent(person, pos)
+        self.history[tribe_id] = deque(maxlen=self.window)
+        logging.info(f"Плем'я {tribe_id} розгорнуто назад у {len(people)} людей після {elapsed} кроків")
+        return len(people)
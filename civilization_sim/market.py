@@ -0,0 +1,56 @@
+import logging
+import numpy as np
+from civilization_sim.new_agents.buildings import Market
+
+
+class ClearingHouse:
+    """Per-step call auction of wood against food between every tribe that owns a Market."""
+    def __init__(self, model, price=10, food_reserve=100, wood_reserve=20, lot=5):
+        self.model = model
+        self.price = price
+        self.food_reserve = food_reserve
+        self.wood_reserve = wood_reserve
+        self.lot = lot # Max wood a tribe buys or sells per step
+        self.last_volume = 0
+
+    def market_tribes(self):
+        stockpiles = self.model.tribe_stockpiles
+        tribes = {m.tribe_id for m in self.model.agents_by_type.get(Market, ()) if m.pos is not None}
+        return sorted(t for t in tribes if t in stockpiles)
+
+    @staticmethod
+    def fill(quantities, volume):
+        # Largest orders first; each gets what is left of the volume, up to its size
+        order = np.argsort(-quantities, kind="stable")
+        ranked = quantities[order]
+        before = np.cumsum(ranked) - ranked
+        filled = np.zeros_like(quantities)
+        filled[order] = np.clip(volume - before, 0, ranked)
+        return filled
+
+    def clear(self):
+        self.last_volume = 0
+        tribe_ids = self.market_tribes()
+        if len(tribe_ids) < 2:
+            return 0
+        stockpiles = self.model.tribe_stockpiles
+        food = stockpiles.column("food", tribe_ids)
+        wood = stockpiles.column("wood", tribe_ids)
+
+        asks = np.clip(wood - self.wood_reserve, 0, self.lot)
+        budget = np.maximum(food - self.food_reserve, 0) // self.price
+        bids = np.minimum(np.clip(self.wood_reserve - wood, 0, self.lot), budget)
+        volume = int(min(asks.sum(), bids.sum()))
+        if volume == 0:
+            return 0
+
+        sold = self.fill(asks, volume)
+        bought = self.fill(bids, volume)
+        for tribe_id, wood_change in zip(tribe_ids, (bought - sold).tolist()):
+            if wood_change:
+                stockpile = stockpiles[tribe_id]
+                stockpile["wood"] += wood_change
+                stockpile["food"] -= wood_change * self.price
+        self.last_volume = volume
+        logging.info(f"Ринок: продано {volume} дерева за {volume * self.price} їжі між {len(tribe_ids)} племенами")
+        return volume
@@ -0,0 +1,100 @@
+from collections import OrderedDict
+
+
+class MemoryIndex:
+    """Subscription index: (agent type, pos) -> set of ResourceMemory objects that remember it."""
+    def __init__(self):
+        self._subscribers = {}
+
+    def subscribe(self, agent_type, pos, memory):
+        self._subscribers.setdefault((agent_type, pos), set()).add(memory)
+
+    def unsubscribe(self, agent_type, pos, memory):
+        key = (agent_type, pos)
+        subscribers = self._subscribers.get(key)
+        if subscribers is None:
+            return
+        subscribers.discard(memory)
+        if not subscribers:
+            del self._subscribers[key]
+
+    def invalidate(self, agent_type, pos):
+        # Drop (agent_type, pos) from every memory that still holds it
+        subscribers = self._subscribers.pop((agent_type, pos), None)
+        if not subscribers:
+            return 0
+        for memory in subscribers:
+            memory.discard(agent_type, pos)
+        return len(subscribers)
+
+    def __len__(self):
+        return len(self._subscribers)
+
+
+class ResourceMemory:
+    """Bounded per-type memory of where resources and buildings were seen."""
+    def __init__(self, index, capacity=16, max_age=200):
+        self.index = index
+        self.capacity = capacity
+        self.max_age = max_age
+        self._entries = {} # Mapping: ResourceType -> OrderedDict[(x, y) -> step last seen]
+
+    def remember(self, agent_type, pos, step):
+        entries = self._entries.get(agent_type)
+        if entries is None:
+            entries = self._entries[agent_type] = OrderedDict()
+
+        if pos in entries:
+            entries.move_to_end(pos)
+        else:
+            self.index.subscribe(agent_type, pos, self)
+        entries[pos] = step
+
+        # LRU eviction
+        while len(entries) > self.capacity:
+            old_pos, _ = entries.popitem(last=False)
+            self.index.unsubscribe(agent_type, old_pos, self)
+
+    def forget(self, agent_type, pos):
+        if self.discard(agent_type, pos):
+            self.index.unsubscribe(agent_type, pos, self)
+
+    def discard(self, agent_type, pos):
+        # Remove without touching the index (used by the index itself during invalidation)
+        entries = self._entries.get(agent_type)
+        if not entries or pos not in entries:
+            return False
+        del entries[pos]
+        if not entries:
+            del self._entries[agent_type]
+        return True
+
+    def locations(self, agent_type, step):
+        entries = self._entries.get(agent_type)
+        if not entries:
+            return []
+
+        # Age-based expiry: entries are ordered by last sighting, so stale ones are at the front
+        while entries:
+            pos, seen = next(iter(entries.items()))
+            if step - seen <= self.max_age:
+                break
+            entries.popitem(last=False)
+            self.index.unsubscribe(agent_type, pos, self)
+
+        if not entries:
+            del self._entries[agent_type]
+            return []
+        return list(entries)
+
+    def clear(self):
+        for agent_type, entries in self._entries.items():
+            for pos in entries:
+                self.index.unsubscribe(agent_type, pos, self)
+        self._entries = {}
+
+    def __contains__(self, agent_type):
+        return bool(self._entries.get(agent_type))
+
+    def __len__(self):
+        return sum(len(entries) for entries in self._entries.values())
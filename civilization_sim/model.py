@@ -1,11 +1,32 @@
 from mesa import Model
 from mesa.time import RandomActivation
-from mesa.space import MultiGrid
 from mesa.datacollection import DataCollector
 import logging
+import numpy as np
+from civilization_sim.births import BirthQueue
+from civilization_sim.chunks import ActiveChunks
+from civilization_sim.cataclysms import CataclysmEngine
+from civilization_sim.climate import Climate, Season
+from civilization_sim.combat import CombatEngine
+from civilization_sim.diplomacy import DiplomacyMatrix
+from civilization_sim.ecology import RegrowthEngine, SpoilageQueue
+from civilization_sim.epidemic import EpidemicEngine
+from civilization_sim.events import EventCalendar, HarvestScheduler
+from civilization_sim.flowfield import FlowField
+from civilization_sim.influence import InfluenceMaps
+from civilization_sim.memory import MemoryIndex
+from civilization_sim.lod import LODScheduler
+from civilization_sim.macro import MacroEngine
+from civilization_sim.market import ClearingHouse
+from civilization_sim.planner import BuildPlanner
+from civilization_sim.space import CivilizationGrid
+from civilization_sim.stockpiles import StockpileTable
+from civilization_sim.tech import TechTree, ResearchTracker
+from civilization_sim.timers import TimingWheel
+from civilization_sim.tribes import TribeRegistry
 from civilization_sim.new_agents.people import Person, Predator, Barbarian
 from civilization_sim.new_agents.resources import Food, Tree, Stone, IronOre, Mountain, River
-from civilization_sim.new_agents.buildings import House, Farm, Wall, Smithy, Road, Market, Barracks, Hospital, Temple, Tavern
+from civilization_sim.new_agents.buildings import House, Farm, Wall, Smithy, Road, Market, Barracks, Library, Hospital, Temple, Tavern
 
 # Configure logging
 logging.basicConfig(
@@ -16,59 +37,71 @@ logging.basicConfig(
     force=True
 )
 
+def count_agents(model, agent_type):
+    # Read off the model's per-type registry instead of scanning every scheduled agent (terrain included)
+    return len(model.agents_by_type.get(agent_type, ()))
+
 def compute_people_count(model):
-    return sum(1 for agent in model.schedule.agents if isinstance(agent, Person))
+    # Agents on the map plus members of tribes running as aggregates
+    return count_agents(model, Person) + model.macro.population()
 
 def compute_food_count(model):
-    return sum(1 for agent in model.schedule.agents if isinstance(agent, Food))
+    return count_agents(model, Food)
 
 def compute_predator_count(model):
-    return sum(1 for agent in model.schedule.agents if isinstance(agent, Predator))
+    return count_agents(model, Predator)
 
 def compute_tree_count(model):
-    return sum(1 for agent in model.schedule.agents if isinstance(agent, Tree))
+    return count_agents(model, Tree)
 
 def compute_stone_count(model):
-    return sum(1 for agent in model.schedule.agents if isinstance(agent, Stone))
+    return count_agents(model, Stone)
 
 def compute_iron_count(model):
-    return sum(1 for agent in model.schedule.agents if isinstance(agent, IronOre))
+    return count_agents(model, IronOre)
 
 def compute_house_count(model):
-    return sum(1 for agent in model.schedule.agents if isinstance(agent, House))
+    return count_agents(model, House)
 
 def compute_farm_count(model):
-    return sum(1 for agent in model.schedule.agents if isinstance(agent, Farm))
+    return count_agents(model, Farm)
 
 def compute_smithy_count(model):
-    return sum(1 for agent in model.schedule.agents if isinstance(agent, Smithy))
+    return count_agents(model, Smithy)
 
 def compute_road_count(model):
-    return sum(1 for agent in model.schedule.agents if isinstance(agent, Road))
+    return count_agents(model, Road)
 
 def compute_market_count(model):
-    return sum(1 for agent in model.schedule.agents if isinstance(agent, Market))
+    return count_agents(model, Market)
 
 def compute_barracks_count(model):
-    return sum(1 for agent in model.schedule.agents if isinstance(agent, Barracks))
+    return count_agents(model, Barracks)
 
 def compute_hospital_count(model):
-    return sum(1 for agent in model.schedule.agents if isinstance(agent, Hospital))
+    return count_agents(model, Hospital)
 
 def compute_temple_count(model):
-    return sum(1 for agent in model.schedule.agents if isinstance(agent, Temple))
+    return count_agents(model, Temple)
 
 def compute_tavern_count(model):
-    return sum(1 for agent in model.schedule.agents if isinstance(agent, Tavern))
+    return count_agents(model, Tavern)
 
 def compute_avg_energy(model):
-    people = [agent.energy for agent in model.schedule.agents if isinstance(agent, Person)]
+    people = [agent.energy for agent in model.agents_by_type.get(Person, ())]
     return sum(people) / len(people) if people else 0
 
+def compute_decision_cache_hit_rate(model):
+    stats = model.decision_cache_stats
+    total = stats["hits"] + stats["misses"]
+    return stats["hits"] / total if total else 0
+
 class CivilizationModel(Model):
-    def __init__(self, width=20, height=20, initial_people=20, initial_food=50, initial_predators=2, initial_trees=30, initial_stone=10, initial_iron=5, num_tribes=3, num_predator_packs=1, seed=None):
+    def __init__(self, width=20, height=20, initial_people=20, initial_food=50, initial_predators=2, initial_trees=30, initial_stone=10, initial_iron=5, num_tribes=3, num_predator_packs=1, lod_max_stagger=4, cataclysms=False, macro_tribes=False, active_chunks=False, seed=None):
         super().__init__(seed=seed)
-        self.grid = MultiGrid(width, height, True)
+        if seed is not None:
+            self.rng = np.random.default_rng(seed) # Mesa 3.0 leaves rng unseeded when only seed is given
+        self.grid = CivilizationGrid(width, height, True)
         self.space = self.grid # Alias for visualization compatibility
         self.schedule = RandomActivation(self)
         self.running = True
@@ -83,22 +116,34 @@ class CivilizationModel(Model):
         self.tribe_colors = [self.available_colors[i % len(self.available_colors)] for i in range(num_tribes)] if num_tribes > 0 else []
         self.pack_colors = ["#" + ''.join(self.random.choices('0123456789ABCDEF', k=6)) for _ in range(num_predator_packs)] if num_predator_packs > 0 else []
         self.next_tribe_id = num_tribes
-        self.tribe_stockpiles = {i: {"food": 0, "wood": 0, "stone": 0, "iron": 0, "tools": 0, "science": 0} for i in range(num_tribes)}
-        self.tribe_counts = {} # Cache for performance
-        self.wars = set() # Set of tuples (tribe_id_1, tribe_id_2)
-        self.tribe_leaders = {} # Map tribe_id -> agent_id
+        self.tribe_stockpiles = StockpileTable() # (tribes x resources) array behind the tribe_id -> {"food": ...} API
+        for i in range(num_tribes):
+            self.tribe_stockpiles[i] = {"food": 0, "wood": 0, "stone": 0, "iron": 0, "tools": 0, "science": 0}
+        self.tribes = TribeRegistry(self) # tribe_id -> living members, kept up to date by Person.tribe_id
+        self.diplomacy = DiplomacyMatrix(num_tribes) # T x T Neutral/Alliance/War relations
+        self.wars = self.diplomacy.wars # Live set of sorted (tribe_id_1, tribe_id_2) pairs at war
+        self.tribe_leaders = self.tribes.leaders # Map tribe_id -> agent_id, seat marked vacant when the leader dies or leaves
+        self.memory_index = MemoryIndex() # (type, pos) -> Person memories that remember it
+        self.decision_cache_stats = {"hits": 0, "misses": 0} # Person.choose_action reuse counter
+        self.lod = LODScheduler(self, max_stagger=lod_max_stagger) # Idle persons think every lod_max_stagger steps
+        self.build_planner = BuildPlanner(self) # Tribe-level construction priorities
         
         # Stage 5: Cataclysms and Challenges
         self.drought_active = False
         self.barbarian_wave_interval = 200 # Increased from 100 to give more breathing room
-        self.barbarian_wave_timer = 0
+        self.drought_start_chance = 0.005 # Per step - Reduced from 1%
+        self.drought_end_chance = 0.05 # Per step
+        self.plague_chance = 0.005 # Per step, while population > 50
+        self.epidemic = EpidemicEngine(self) # Vectorized plague spread/recovery over the infection raster
+        self.combat = CombatEngine(self) # Attacks are queued during the agent phase and resolved in one batch
+        self.births = BirthQueue(self) # Person/Predator children are born together after the agent phase
+        self.market = ClearingHouse(self) # Wood/food auction between tribes that own a Market
         
         # Stage 6: Politics and Culture
         self.tribe_government = {}
         self.available_governments = ["Monarchy", "Republic", "Theocracy"]
         self.tribe_religion = {}
         self.available_deities = ["War God", "Harvest Goddess", "Sun God", "Sea God"]
-        self.diplomacy = {i: {j: "Neutral" for j in range(num_tribes) if i != j} for i in range(num_tribes)}
         
         for i in range(num_tribes):
             self.tribe_government[i] = self.random.choice(self.available_governments)
@@ -106,9 +151,24 @@ class CivilizationModel(Model):
             logging.info(f"Tribe {i}: Gov={self.tribe_government[i]}, Religion={self.tribe_religion[i]}")
 
         # Stage 7: Geography and Ecology
-        self.season = "Весна"
-        self.season_timer = 0
+        self.season = Season.SPRING
         self.season_length = 100 # Steps per season
+
+        # Event calendar (Farm harvests are scheduled, not ticked every step)
+        self.events = EventCalendar()
+        self.harvests = HarvestScheduler(self, self.events)
+        self.agent_phase = False
+        self.stepping = False # True inside step(), see remove_agent
+        self.tombstones = {} # Agents removed this step, waiting for flush_removals()
+        self.spoilage = SpoilageQueue(self) # Food spoils a while after it is placed
+
+        # Timing wheel for cooldowns and periodic timers, ticked once at the end of every step.
+        # Random per-step rolls (drought, plague) are drawn as geometric waiting times instead of polled.
+        self.timers = TimingWheel()
+        self.timers.schedule(self.season_length - 1, self.change_season, period=self.season_length)
+        self.timers.schedule(self.barbarian_wave_interval, self.barbarian_wave, period=self.barbarian_wave_interval)
+        self.timers.schedule(self.rng.geometric(self.drought_start_chance), self.toggle_drought)
+        self.timers.schedule(self.rng.geometric(self.plague_chance), self.plague_roll)
         
         # Tribe Technologies
         self.tribe_technologies = {i: set() for i in range(num_tribes)}
@@ -123,6 +183,7 @@ class CivilizationModel(Model):
             "Philosophy": {"cost": 80, "req": "Writing", "description": "Morale boost (+2)"},
             "Medicine": {"cost": 50, "req": "Writing", "description": "Increased lifespan (+20 steps)"}
         }
+        self.research = ResearchTracker(TechTree(self.available_technologies)) # Per-tribe frontier and next affordable cost
         
         # Tribe Traits
         self.tribe_traits = {}
@@ -133,6 +194,17 @@ class CivilizationModel(Model):
         
         # Generate Terrain
         self.generate_terrain()
+        self.climate = Climate(self) # Per-cell temperature/moisture/fertility, recomputed when season or drought changes
+        self.regrowth = RegrowthEngine(self) # Logistic, capacity-bounded Food/Tree/Stone/Iron regrowth
+        self.chunks_enabled = active_chunks # Regrow only around agents and growing farms (for large maps)
+        self.chunks = ActiveChunks(self)
+        self.cataclysms_enabled = cataclysms # Wildfire and flood (off by default)
+        self.cataclysms = CataclysmEngine(self)
+        self.macro_enabled = macro_tribes # Collapse stable, isolated tribes into aggregates (off by default)
+        self.macro = MacroEngine(self)
+        self.influence = InfluenceMaps(self) # Threat/prey fields for flee and pursue moves, rebuilt every step
+        # Barbarians head for anything they can raid; recomputed only when buildings change
+        self.settlement_field = FlowField(self, (House, Farm, Smithy, Market, Barracks, Library, Hospital, Temple, Tavern))
 
         # Initialize DataCollector
         self.datacollector = DataCollector(
@@ -152,7 +224,8 @@ class CivilizationModel(Model):
                 "Лікарні": compute_hospital_count,
                 "Храми": compute_temple_count,
                 "Таверни": compute_tavern_count,
-                "Середня енергія": compute_avg_energy
+                "Середня енергія": compute_avg_energy,
+                "Влучання кешу рішень": compute_decision_cache_hit_rate
             }
         )
 
@@ -276,15 +349,8 @@ class CivilizationModel(Model):
         self.tribe_government[new_tribe_id] = self.random.choice(["Monarchy", "Republic", "Theocracy"])
         self.tribe_religion[new_tribe_id] = self.random.choice(["Sun God", "War God", "Harvest God", "Sea God"])
         
-        # Initialize Diplomacy for new tribe
-        self.diplomacy[new_tribe_id] = {}
-        # Initialize relations with existing tribes
-        # Note: self.next_tribe_id is not incremented yet, so it points to the new tribe ID
-        # We want to iterate over all PREVIOUS tribe IDs.
-        for other_id in range(self.next_tribe_id):
-             self.diplomacy[new_tribe_id][other_id] = "Neutral"
-             if other_id in self.diplomacy:
-                 self.diplomacy[other_id][new_tribe_id] = "Neutral"
+        # Initialize Diplomacy for new tribe (Neutral with all existing tribes)
+        self.diplomacy.add_tribe(new_tribe_id)
 
         self.next_tribe_id += 1
         logging.info(f"Agents {agent1.unique_id} and {agent2.unique_id} formed a new tribe: {new_tribe_id} with trait {trait}")
@@ -324,25 +390,19 @@ class CivilizationModel(Model):
                 self.split_tribe(tribe_id)
 
     def split_tribe(self, parent_tribe_id):
-        # Find all members
-        members = [a for a in self.schedule.agents if isinstance(a, Person) and a.tribe_id == parent_tribe_id]
-        if not members:
+        # Pick a rebel leader (random member)
+        rebel_leader = self.tribes.random_member(parent_tribe_id, self.random)
+        if rebel_leader is None:
             return
 
-        # Pick a rebel leader (random member)
-        rebel_leader = self.random.choice(members)
-        
         # Find members close to the rebel leader to join the split
         # Let's take 1/3 of the population
-        split_size = len(members) // 3
+        split_size = len(self.tribes.members(parent_tribe_id)) // 3
         if split_size < 2:
             return
 
-        # Sort members by distance to rebel leader
-        members.sort(key=lambda a: abs(a.pos[0] - rebel_leader.pos[0]) + abs(a.pos[1] - rebel_leader.pos[1]))
-        
-        # The closest ones join the new tribe
-        rebels = members[:split_size]
+        # The closest ones join the new tribe (k-nearest over the tribe's position buckets)
+        rebels = self.tribes.nearest(parent_tribe_id, rebel_leader.pos, split_size)
         
         # Create new tribe
         new_tribe_id = self.next_tribe_id
@@ -361,14 +421,8 @@ class CivilizationModel(Model):
         self.tribe_government[new_tribe_id] = self.random.choice(["Monarchy", "Republic", "Theocracy"])
         self.tribe_religion[new_tribe_id] = self.random.choice(["Sun God", "War God", "Harvest God", "Sea God"])
         
-        # Initialize Diplomacy for new tribe
-        self.diplomacy[new_tribe_id] = {}
-        # Initialize relations with existing tribes
-        # Iterate over all tribes up to new_tribe_id (exclusive)
-        for other_id in range(new_tribe_id):
-             self.diplomacy[new_tribe_id][other_id] = "Neutral"
-             if other_id in self.diplomacy:
-                 self.diplomacy[other_id][new_tribe_id] = "Neutral"
+        # Initialize Diplomacy for new tribe (Neutral with all existing tribes)
+        self.diplomacy.add_tribe(new_tribe_id)
         
         # Reassign agents
         for rebel in rebels:
@@ -378,196 +432,128 @@ class CivilizationModel(Model):
 
 
     def update_politics(self):
-        # 1. Leader Selection
-        # Group agents by tribe
-        agents_by_tribe = {}
-        for agent in self.schedule.agents:
-            if isinstance(agent, Person) and agent.tribe_id is not None:
-                agents_by_tribe.setdefault(agent.tribe_id, []).append(agent)
-        
-        for tribe_id, members in agents_by_tribe.items():
-            # Check if leader exists and is alive
-            current_leader_id = self.tribe_leaders.get(tribe_id)
-            leader_alive = False
-            if current_leader_id:
-                leader = next((a for a in members if a.unique_id == current_leader_id), None)
-                if leader:
-                    leader_alive = True
-            
-            if not leader_alive and members:
-                # Elect new leader based on Government Type
-                gov = self.tribe_government.get(tribe_id, "Monarchy")
-                if gov == "Monarchy":
-                    # Oldest person (Elder)
-                    new_leader = max(members, key=lambda a: a.age)
-                elif gov == "Republic":
-                    # Random election (simulated)
-                    new_leader = self.random.choice(members)
-                elif gov == "Theocracy":
-                    # Priest or oldest
-                    priests = [m for m in members if m.profession == "Priest"]
-                    if priests:
-                        new_leader = self.random.choice(priests)
-                    else:
-                        new_leader = max(members, key=lambda a: a.age)
-                
-                self.tribe_leaders[tribe_id] = new_leader.unique_id
-                logging.info(f"Плем'я {tribe_id} ({gov}) обрало нового лідера: {new_leader.unique_id}")
-
-        # 2. Diplomacy (War, Peace, Alliance)
-        tribe_ids = list(self.tribe_stockpiles.keys())
-        for i in range(len(tribe_ids)):
-            for j in range(i + 1, len(tribe_ids)):
-                id1 = tribe_ids[i]
-                id2 = tribe_ids[j]
-                
-                stock1 = self.tribe_stockpiles[id1]
-                stock2 = self.tribe_stockpiles[id2]
-                
-                war_key = tuple(sorted((id1, id2)))
-                is_at_war = war_key in self.wars
-                relation = self.diplomacy[id1].get(id2, "Neutral")
-                
-                # Factors
-                gov1, gov2 = self.tribe_government[id1], self.tribe_government[id2]
-                rel1, rel2 = self.tribe_religion[id1], self.tribe_religion[id2]
-                
-                # --- ALLIANCE LOGIC ---
-                if relation != "Alliance" and not is_at_war:
-                    # Chance to ally if:
-                    # 1. Same Religion (Theocracy bonus)
-                    # 2. Both Republics (Trade bonus)
-                    # 3. Both Rich (> 300 food)
-                    
-                    alliance_score = 0
-                    if rel1 == rel2: alliance_score += 2
-                    if gov1 == "Republic" and gov2 == "Republic": alliance_score += 2
-                    if stock1["food"] > 300 and stock2["food"] > 300: alliance_score += 1
-                    
-                    if alliance_score >= 3:
-                        if self.random.random() < 0.05:
-                            self.diplomacy[id1][id2] = "Alliance"
-                            self.diplomacy[id2][id1] = "Alliance"
-                            logging.info(f"УТВОРЕНО АЛЬЯНС: Плем'я {id1} та Плем'я {id2} тепер союзники!")
-
-                # --- WAR LOGIC ---
-                if not is_at_war and relation != "Alliance":
-                    war_chance = 0.0
-                    
-                    # Resource Scarcity (Primary Driver)
-                    if stock1["food"] < 50 and stock2["food"] > 200: war_chance += 0.05
-                    if stock2["food"] < 50 and stock1["food"] > 200: war_chance += 0.05
-                    
-                    # Religious Conflict
-                    if rel1 != rel2:
-                        if gov1 == "Theocracy" or gov2 == "Theocracy":
-                            war_chance += 0.02
-                            
-                    # Militaristic Government
-                    if gov1 == "Monarchy": war_chance += 0.01
-                    if gov2 == "Monarchy": war_chance += 0.01
-                    
-                    if self.random.random() < war_chance:
-                        self.wars.add(war_key)
-                        self.diplomacy[id1][id2] = "War"
-                        self.diplomacy[id2][id1] = "War"
-                        logging.info(f"ОГОЛОШЕНО ВІЙНУ: Плем'я {id1} проти Племені {id2} (Причина: Дефіцит/Релігія/Уряд)")
-
-                # --- PEACE LOGIC ---
-                elif is_at_war:
-                    # Peace if both exhausted or rich enough
-                    if (stock1["food"] > 100 and stock2["food"] > 100) or (stock1["food"] < 10 and stock2["food"] < 10):
-                        if self.random.random() < 0.1:
-                            self.wars.remove(war_key)
-                            self.diplomacy[id1][id2] = "Neutral"
-                            self.diplomacy[id2][id1] = "Neutral"
-                            logging.info(f"ОГОЛОШЕНО МИР: Плем'я {id1} та Плем'я {id2} уклали мир.")
+        # 1. Leader Selection (only tribes whose leader died, left or was never elected)
+        for tribe_id in self.tribes.take_vacancies():
+            # Elect new leader based on Government Type
+            gov = self.tribe_government.get(tribe_id, "Monarchy")
+            if gov == "Republic":
+                # Random election (simulated)
+                new_leader = self.tribes.random_member(tribe_id, self.random)
+            elif gov == "Theocracy":
+                # Priest or oldest
+                new_leader = self.tribes.random_priest(tribe_id, self.random) or self.tribes.oldest(tribe_id)
+            else:
+                # Monarchy: oldest person (Elder)
+                new_leader = self.tribes.oldest(tribe_id)
+
+            self.tribe_leaders[tribe_id] = new_leader.unique_id
+            logging.info(f"Плем'я {tribe_id} ({gov}) обрало нового лідера: {new_leader.unique_id}")
+
+        # 2. Diplomacy (War, Peace, Alliance), all tribe pairs at once
+        tribe_ids = range(self.diplomacy.size)
+        food = self.tribe_stockpiles.column("food", tribe_ids).astype(float)
+        governments = np.array([self.tribe_government.get(t, "") for t in tribe_ids])
+        religions = np.array([self.tribe_religion.get(t, "") for t in tribe_ids])
+        alliances, wars, peace = self.diplomacy.update(food, governments, religions, self.rng)
+
+        for id1, id2 in alliances:
+            logging.info(f"УТВОРЕНО АЛЬЯНС: Плем'я {id1} та Плем'я {id2} тепер союзники!")
+        for id1, id2 in wars:
+            logging.info(f"ОГОЛОШЕНО ВІЙНУ: Плем'я {id1} проти Племені {id2} (Причина: Дефіцит/Релігія/Уряд)")
+        for id1, id2 in peace:
+            logging.info(f"ОГОЛОШЕНО МИР: Плем'я {id1} та Плем'я {id2} уклали мир.")
 
     def check_research(self):
         for tribe_id, stockpile in self.tribe_stockpiles.items():
             science = stockpile.get("science", 0)
-            techs = self.tribe_technologies.get(tribe_id, set())
-            
-            # Find researchable techs
-            possible_techs = []
-            for tech_name, data in self.available_technologies.items():
-                if tech_name not in techs:
-                    # Check requirements
-                    req = data.get("req")
-                    if req is None or req in techs:
-                        if science >= data["cost"]:
-                            possible_techs.append(tech_name)
-            
+            techs = self.tribe_technologies.setdefault(tribe_id, set())
+
+            # Researchable techs (empty until science reaches the cheapest one on the frontier)
+            possible_techs = self.research.affordable(tribe_id, techs, science)
+
             # Research one
             if possible_techs:
                 tech_to_research = self.random.choice(possible_techs)
                 cost = self.available_technologies[tech_to_research]["cost"]
                 stockpile["science"] -= cost
-                techs.add(tech_to_research)
+                self.research.learn(tribe_id, techs, tech_to_research)
                 logging.info(f"Плем'я {tribe_id} вивчило {tech_to_research}!")
 
-    def step(self):
-        # Update Season
-        self.season_timer += 1
-        if self.season_timer >= self.season_length:
-            self.season_timer = 0
-            seasons = ["Весна", "Літо", "Осінь", "Зима"]
-            current_idx = seasons.index(self.season)
-            self.season = seasons[(current_idx + 1) % 4]
-            logging.info(f"ЗМІНА СЕЗОНУ: Тепер {self.season}")
+    def change_season(self):
+        self.season = self.season.next()
+        logging.info(f"ЗМІНА СЕЗОНУ: Тепер {self.season}")
 
+    def toggle_drought(self):
+        # Drought starts and ends on geometric waiting times (same odds as rolling every step)
+        self.drought_active = not self.drought_active
+        if self.drought_active:
+            logging.info("ПОЧАЛАСЯ ПОСУХА! Врожаї загинуть, а ферми припинять виробництво.")
+            self.timers.schedule(self.rng.geometric(self.drought_end_chance), self.toggle_drought)
+        else:
+            logging.info("ПОСУХА закінчилася! Дощ повертається на землю.")
+            self.timers.schedule(self.rng.geometric(self.drought_start_chance), self.toggle_drought)
+
+    def plague_roll(self):
+        # Small chance to start a plague if population is high (> 50)
+        self.timers.schedule(self.rng.geometric(self.plague_chance), self.plague_roll)
+        if len(self.tribes.people) <= 50:
+            return
+        # Infect a random person
+        patient_zero = self.tribes.random_person(self.random)
+        if patient_zero is not None:
+            patient_zero.infected = True
+            logging.info(f"СПАЛАХ ЧУМИ! Нульовий пацієнт - Людина {patient_zero.unique_id} в {patient_zero.pos}")
+
+    def barbarian_wave(self):
+        # Spawn a wave of barbarians
+        num_barbarians = self.random.randint(2, 5) # Reduced from 3-8
+        logging.info(f"НАШЕСТЯ ВАРВАРІВ! {num_barbarians} варварів прибули грабувати!")
+        for _ in range(num_barbarians):
+            b = Barbarian(self)
+            self.schedule.add(b)
+            # Spawn at random edge of map
+            if self.random.random() < 0.5:
+                x = self.random.choice([0, self.grid.width - 1])
+                y = self.random.randrange(self.grid.height)
+            else:
+                x = self.random.randrange(self.grid.width)
+                y = self.random.choice([0, self.grid.height - 1])
+
+            self.grid.place_agent(b, (x, y))
+
+    def step(self):
+        self.stepping = True # Removals are tombstoned until the end of the step
         self.update_politics()
         self.check_research()
-        # Pre-calculate tribe counts for performance
-        self.tribe_counts = {}
-        for agent in self.schedule.agents:
-            if isinstance(agent, Person) and agent.tribe_id is not None:
-                self.tribe_counts[agent.tribe_id] = self.tribe_counts.get(agent.tribe_id, 0) + 1
         
         # Check for tribe splitting
         self.check_tribe_splitting()
-
+        if self.macro_enabled:
+            self.macro.step() # Expand disturbed aggregate tribes, advance the rest, collapse newly stable ones
+
+        self.epidemic.step() # Plague spread and recovery for everyone at once
+        self.lod.update()
+        self.influence.update()
+        self.harvests.refresh(self.schedule.steps) # Sync the climate raster; pause or reschedule farms whose cell changed
+        self.tribe_stockpiles.begin() # Gathers are queued during the agent phase
+        self.agent_phase = True
         self.schedule.step()
+        self.agent_phase = False
+        self.tribe_stockpiles.commit() # ...and land in the stockpiles in one batched add
+        self.combat.resolve() # Queued attacks: damage summed per target, deaths applied together
+        self.births.flush() # Children requested during the agent phase
+        self.market.clear() # One auction for all Market-owning tribes
+        self.events.run(self.schedule.steps - 1) # Harvests (and other events) due this step
         
-        # Randomly grow new food
-        # Grow multiple food items per step to sustain population
-        for _ in range(10):
-            x = self.random.randrange(self.grid.width)
-            y = self.random.randrange(self.grid.height)
-            f = Food(self)
-            self.schedule.add(f)
-            self.grid.place_agent(f, (x, y))
-            logging.info(f"Нова Їжа виросла в ({x}, {y})")
-
-        # Randomly grow new trees
-        for _ in range(5):
-            x = self.random.randrange(self.grid.width)
-            y = self.random.randrange(self.grid.height)
-            t = Tree(self)
-            self.schedule.add(t)
-            self.grid.place_agent(t, (x, y))
-            logging.info(f"Нове Дерево виросло в ({x}, {y})")
-
-        # Randomly spawn new stone (geological process, rare)
-        for _ in range(5):
-            x = self.random.randrange(self.grid.width)
-            y = self.random.randrange(self.grid.height)
-            s = Stone(self)
-            self.schedule.add(s)
-            self.grid.place_agent(s, (x, y))
-            logging.info(f"Новий Камінь з'явився в ({x}, {y})")
-
-        # Randomly spawn new iron (very rare)
-        if self.random.random() < 0.3: # 30% chance per step
-            x = self.random.randrange(self.grid.width)
-            y = self.random.randrange(self.grid.height)
-            ir = IronOre(self)
-            self.schedule.add(ir)
-            self.grid.place_agent(ir, (x, y))
-            logging.info(f"Нова Залізна Руда з'явилася в ({x}, {y})")
+        # Spoil expired food, then regrow resources towards each biome's carrying capacity
+        self.spoilage.step()
+        if self.chunks_enabled:
+            self.regrowth.step(self.chunks.update())
+        else:
+            self.regrowth.step()
 
         # Respawn predator if extinct (Migration simulation)
-        if compute_predator_count(self) == 0:
+        if not any(p.pos is not None for p in self.agents_by_type.get(Predator, ())):
             if self.random.random() < 0.1: # 10% chance per step to migrate in
                 pack_id = self.random.randrange(self.num_predator_packs) if self.num_predator_packs > 0 else None
                 p = Predator(self, pack_id=pack_id)
@@ -577,12 +563,13 @@ class CivilizationModel(Model):
                 self.grid.place_agent(p, (x, y))
                 logging.info(f"Новий Хижак зграї {pack_id} мігрував до ({x}, {y})")
 
-        # Respawn humans if near extinct (Migration simulation)
-        if compute_people_count(self) <= 2:
+        # Respawn humans if near extinct (Migration simulation); tribes running as aggregates count too
+        if len(self.tribes.people) + self.macro.population() <= 2:
             if self.random.random() < 0.2: # 20% chance per step to migrate in
-                # Spawn a small group
+                # Spawn a small group, never into a collapsed tribe
+                open_tribes = [t for t in range(self.num_tribes) if t not in self.macro.aggregates]
                 for _ in range(2):
-                    tribe_id = self.random.randrange(self.num_tribes) if self.num_tribes > 0 else None
+                    tribe_id = self.random.choice(open_tribes) if open_tribes else None
                     p = Person(self, tribe_id=tribe_id)
                     self.schedule.add(p)
                     x = self.random.randrange(self.grid.width)
@@ -591,51 +578,58 @@ class CivilizationModel(Model):
                     logging.info(f"Нова Людина з племені {tribe_id} мігрувала до ({x}, {y})")
 
         # --- Stage 5: Cataclysms and Challenges Logic ---
-        
-        # 1. Drought Logic
-        if self.drought_active:
-            # Chance to end drought (e.g., 5% per step)
-            if self.random.random() < 0.05:
-                self.drought_active = False
-                logging.info("ПОСУХА закінчилася! Дощ повертається на землю.")
-        else:
-            # Chance to start drought (e.g., 0.5% per step) - Reduced from 1%
-            if self.random.random() < 0.005:
-                self.drought_active = True
-                logging.info("ПОЧАЛАСЯ ПОСУХА! Врожаї загинуть, а ферми припинять виробництво.")
+        # Wildfire and flood cellular automata
+        if self.cataclysms_enabled:
+            self.step_cataclysms()
 
-        # 2. Plague Logic (New)
-        # Small chance to start a plague if population is high (> 50)
-        if compute_people_count(self) > 50 and self.random.random() < 0.005:
-            # Infect a random person
-            people = [a for a in self.schedule.agents if isinstance(a, Person)]
-            if people:
-                patient_zero = self.random.choice(people)
-                patient_zero.infected = True
-                logging.info(f"СПАЛАХ ЧУМИ! Нульовий пацієнт - Людина {patient_zero.unique_id} в {patient_zero.pos}")
-
-        # 3. Barbarian Invasion Logic
-        self.barbarian_wave_timer += 1
-        if self.barbarian_wave_timer >= self.barbarian_wave_interval:
-            self.barbarian_wave_timer = 0
-            # Spawn a wave of barbarians
-            num_barbarians = self.random.randint(2, 5) # Reduced from 3-8
-            logging.info(f"НАШЕСТЯ ВАРВАРІВ! {num_barbarians} варварів прибули грабувати!")
-            for _ in range(num_barbarians):
-                b = Barbarian(self)
-                self.schedule.add(b)
-                # Spawn at random edge of map
-                if self.random.random() < 0.5:
-                    x = self.random.choice([0, self.grid.width - 1])
-                    y = self.random.randrange(self.grid.height)
-                else:
-                    x = self.random.randrange(self.grid.width)
-                    y = self.random.choice([0, self.grid.height - 1])
-                
-                self.grid.place_agent(b, (x, y))
-            
+        # Drought, plague, barbarian waves, seasons and agent cooldowns all live on the timing wheel
+        self.timers.advance()
+
+        self.stepping = False
+        self.flush_removals()
         self.datacollector.collect(self)
-        logging.info(f"Крок {self.schedule.steps} завершено. Люди: {compute_people_count(self)}, Хижаки: {compute_predator_count(self)}, Їжа: {compute_food_count(self)}")
+        logging.info(f"Крок {self.schedule.steps} завершено. Люди: {compute_people_count(self)}, Хижаки: {compute_predator_count(self)}, Їжа: {compute_food_count(self)}, LOD: {self.lod.tier_counts}")
+
+    @property
+    def tribe_counts(self):
+        # Live tribe_id -> member count view over the membership registry
+        return self.tribes.counts
+
+    def remove_agent(self, agent):
+        # Single removal point for all agents (deaths, gathered resources, destroyed buildings).
+        # The agent leaves the grid and the indexes at once, so queries skip it, and is tombstoned;
+        # the schedule and model registries are compacted in one pass at the end of the step.
+        if getattr(agent, "tombstone", False):
+            return # Already removed
+        agent.tombstone = True
+        pos = agent.pos
+        if pos is not None:
+            self.grid.remove_agent(agent)
+        self.tombstones[agent] = None
+
+        if isinstance(agent, Person):
+            agent.alive = False
+            self.epidemic.set_infected(agent, False)
+            if agent.scan_timer is not None:
+                agent.scan_timer.cancel()
+            self.tribes.unregister(agent) # Marks the leader seat vacant if the leader died
+            agent.memory.clear()
+        elif pos is not None:
+            # Invalidate memories of this location once no agent of this type is left there
+            agent_type = type(agent)
+            if not any(type(a) is agent_type for a in self.grid.get_cell_list_contents([pos])):
+                self.memory_index.invalidate(agent_type, pos)
+
+        if not self.stepping:
+            self.flush_removals()
+
+    def flush_removals(self):
+        # Drop every tombstoned agent from the schedule and the model's per-type registries
+        tombstones, self.tombstones = self.tombstones, {}
+        for agent in tombstones:
+            self.schedule.remove(agent)
+            agent.remove()
+        return len(tombstones)
 
     def get_movement_cost(self, pos):
         cell_contents = self.grid.get_cell_list_contents([pos])
@@ -661,35 +655,17 @@ class CivilizationModel(Model):
             
         return cost
 
-    def step_cataclysms(self):
-        # Wildfire
-        if self.random.random() < 0.01: # 1% chance per step
-             # Start a fire at a random tree
-             trees = [a for a in self.schedule.agents if isinstance(a, Tree)]
-             if trees:
-                 target = self.random.choice(trees)
-                 logging.info(f"Лісова пожежа почалася в {target.pos}")
-                 self.grid.remove_agent(target)
-                 self.schedule.remove(target)
-                 # Spread to neighbors
-                 neighbors = self.grid.get_neighbors(target.pos, moore=True, include_center=False, radius=1)
-                 for n in neighbors:
-                     if isinstance(n, Tree) and self.random.random() < 0.5:
-                         logging.info(f"Лісова пожежа поширилася на {n.pos}")
-                         self.grid.remove_agent(n)
-                         self.schedule.remove(n)
-
-        # Flood
-        if self.random.random() < 0.005: # 0.5% chance
-             rivers = [a for a in self.schedule.agents if isinstance(a, River)]
-             if rivers:
-                 origin = self.random.choice(rivers)
-                 logging.info(f"Повінь почалася в {origin.pos}")
-                 # Destroy farms/houses near river
-                 neighbors = self.grid.get_neighbors(origin.pos, moore=True, include_center=False, radius=1)
-                 for n in neighbors:
-                     if isinstance(n, (House, Farm)):
-                         logging.info(f"Повінь знищила {type(n).__name__} в {n.pos}")
-                         self.grid.remove_agent(n)
-                         self.schedule.remove(n)
+    def movement_costs(self):
+        # get_movement_cost for every cell at once, from the terrain rasters
+        counts = self.grid.resources.counts
+        cost = np.full((self.grid.width, self.grid.height), 2, dtype=np.int32) # Grass
+        cost[counts[Tree] > 0] = 3 # Forest
+        cost[counts[Stone] > 0] = 4 # Rocky
+        cost[counts[River] > 0] = 10 # River without a bridge
+        cost[counts[Road] > 0] = 1
+        cost[counts[Mountain] > 0] = 100 # Effectively impassable
+        return cost
 
+    def step_cataclysms(self):
+        # Wildfire and flood spread as cellular automata over the tree and river rasters
+        self.cataclysms.step()
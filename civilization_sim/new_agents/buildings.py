@@ -8,6 +8,12 @@ class Building(Agent):
         super().__init__(model)
         self.tribe_id = tribe_id
 
+    def placed(self):
+        """Called by the grid once the building is on the map."""
+
+    def removed(self):
+        """Called by the grid after the building is taken off the map."""
+
 class House(Building):
     def __init__(self, model, tribe_id=None):
         super().__init__(model, tribe_id)
@@ -55,31 +61,23 @@ class Farm(Building):
         self.growth_progress = 0
         self.growth_rate = 1  # Progress per step
         self.harvest_threshold = 10 # Steps to grow food
+        self.growth_bonus = 0 # +1 next to a River (Irrigation), cached on placement
+        self.growing_since = None # First step not yet counted in growth_progress
+        self.harvest_event = None
 
-    def step(self):
-        if self.pos is None:
-            return
-
-        # Check for Drought
-        if hasattr(self.model, "drought_active") and self.model.drought_active:
-            return # No growth during drought
-            
-        # Check for Winter
-        if hasattr(self.model, "season") and self.model.season == "Winter":
-            return # No growth during winter
+    @property
+    def growth_per_step(self):
+        return self.growth_rate + self.growth_bonus
 
-        growth_bonus = 0
-        # Check for nearby River (Irrigation bonus)
+    def placed(self):
+        # Rivers don't move, so adjacency is checked once
         neighbors = self.model.grid.get_neighbors(self.pos, moore=True, include_center=False, radius=1)
-        if any(isinstance(a, River) for a in neighbors):
-            growth_bonus += 1
-
-        self.growth_progress += (self.growth_rate + growth_bonus)
-        if self.growth_progress >= self.harvest_threshold:
-            # Grow food on this cell
-            food = Food(self.model)
-            self.model.schedule.add(food)
-            self.model.grid.place_agent(food, self.pos)
-            self.growth_progress = 0
-            source = "River Farm" if growth_bonus > 0 else "Farm"
-            logging.info(f"{source} {self.unique_id} (Tribe {self.tribe_id}) produced food at {self.pos}")
+        self.growth_bonus = 1 if any(isinstance(a, River) for a in neighbors) else 0
+        # Harvests are scheduled on the model's calendar instead of ticking every step
+        if hasattr(self.model, "harvests"):
+            in_agent_phase = getattr(self.model, "agent_phase", False)
+            self.model.harvests.add(self, self.model.schedule.steps + (1 if in_agent_phase else 0))
+
+    def removed(self):
+        if hasattr(self.model, "harvests"):
+            self.model.harvests.remove(self)
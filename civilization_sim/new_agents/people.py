@@ -1,26 +1,70 @@
 from mesa import Agent
 import logging
 from ..pathfinding import a_star_search
-from .resources import Food, Tree, Stone, IronOre, Mountain
+from ..memory import ResourceMemory
+from .resources import Food, Tree, Stone, IronOre
 from .buildings import House, Farm, Wall, Smithy, Market, Road, Barracks, Library, Hospital, Temple, Tavern
 
+# Decision fingerprint: cell occupants that create actions in get_possible_actions
+GATHER_KINDS = (Tree, Stone, IronOre, Food)
+OCCUPANCY_BITS = {Smithy: 1, Library: 2, Temple: 4, Hospital: 8, Tavern: 16}
+TRADE_BIT = 32 # Member of another tribe (or a loner) on the cell
+LONER_BIT = 64 # Another loner on the cell
+
 class Person(Agent):
     def __init__(self, model, tribe_id=None):
         super().__init__(model)
         self.energy = 30
         self.age = 0
-        self.tribe_id = tribe_id
+        self.alive = True
         self.profession = self.random.choice(["Farmer", "Miner", "Guard", "Blacksmith", "Merchant", "Soldier", "Archer", "Scholar", "Healer", "Priest"])
+        model.tribes.register(self) # id -> Person index, cleared by model.remove_agent
+        self.tribe_id = tribe_id # Registers with model.tribes (needs profession for the priests index)
         self.infected = False # For Plague
         
         # Memory System
-        self.memory = {} # Mapping: ResourceType -> List of (x, y) coordinates
-        self.scanner_cooldown = 0
+        self.memory = ResourceMemory(model.memory_index) # Bounded, self-expiring: ResourceType -> (x, y) locations
+        self.scan_due = True # Set again by a timer on model.timers, 10 steps after each scan
+        self.scan_timer = None
         self.current_path = [] # List of (x, y) tuples for current movement path
+        self.last_decision = (None, None) # (fingerprint, action type) reused while the context is unchanged
+
+    @property
+    def tribe_id(self):
+        return self._tribe_id
+
+    @tribe_id.setter
+    def tribe_id(self, tribe_id):
+        # Keep the model's membership registry in sync (birth, form_new_tribe, split_tribe)
+        old_tribe_id = getattr(self, "_tribe_id", None)
+        self._tribe_id = tribe_id
+        if self.alive:
+            self.model.tribes.move(self, old_tribe_id, tribe_id)
+
+    @property
+    def infected(self):
+        return self._infected
+
+    @infected.setter
+    def infected(self, infected):
+        # Keep model.epidemic's infected set in sync
+        self._infected = infected
+        if self.alive:
+            self.model.epidemic.set_infected(self, infected)
+
+    @property
+    def profession(self):
+        return self._profession
+
+    @profession.setter
+    def profession(self, profession):
+        # Keep the per-tribe priests index in sync (Theocracy elections)
+        self._profession = profession
+        if self.alive:
+            self.model.tribes.change_profession(self, getattr(self, "_tribe_id", None), profession)
 
     def scan_environment(self):
-        if self.scanner_cooldown > 0:
-            self.scanner_cooldown -= 1
+        if not self.scan_due:
             return
 
         # Scan a larger area occasionally
@@ -30,14 +74,17 @@ class Person(Agent):
         for agent in neighbors:
             # We are interested in resources and buildings
             if isinstance(agent, (Food, Tree, Stone, IronOre, House, Farm, Smithy, Market, Library, Hospital, Temple, Tavern)):
-                agent_type = type(agent)
-                if agent_type not in self.memory:
-                    self.memory[agent_type] = set()
-                self.memory[agent_type].add(agent.pos)
+                self.memory.remember(type(agent), agent.pos, self.model.schedule.steps)
         
-        self.scanner_cooldown = 10 # Scan every 10 steps
+        # Scan again after a 10 step cooldown
+        self.scan_due = False
+        self.scan_timer = self.model.timers.schedule(11, self.mark_scan_due)
+
+    def mark_scan_due(self):
+        self.scan_due = True
+        self.scan_timer = None
 
-    def get_possible_actions(self, cell_mates):
+    def get_possible_actions(self, cell_mates, neighbors=None):
         actions = []
         
         # Gather Actions
@@ -65,8 +112,8 @@ class Person(Agent):
                  actions.append({"type": "work_hospital"})
 
         # Combat Actions
-        attack_radius = 3 if self.profession == "Archer" else 1
-        neighbors = self.model.grid.get_neighbors(self.pos, moore=True, include_center=True, radius=attack_radius)
+        if neighbors is None:
+            neighbors = self.get_combat_neighbors()
         for neighbor in neighbors:
             if isinstance(neighbor, Barbarian):
                 actions.append({"type": "attack_barbarian", "target": neighbor})
@@ -97,6 +144,85 @@ class Person(Agent):
 
         return actions
 
+    def get_combat_neighbors(self):
+        attack_radius = 3 if self.profession == "Archer" else 1
+        return self.model.grid.get_neighbors(self.pos, moore=True, include_center=True, radius=attack_radius)
+
+    def stockpile_bands(self):
+        # Every stockpile threshold that get_possible_actions and calculate_utility compare against
+        if self.tribe_id is None:
+            return None
+        stockpile = self.model.tribe_stockpiles[self.tribe_id]
+        food, wood, stone, iron = stockpile["food"], stockpile["wood"], stockpile["stone"], stockpile["iron"]
+        return (
+            food < 20, food < 50,
+            wood < 5, wood < 30, wood > 15, wood >= 15, wood >= 3, wood >= 2,
+            stone < 5, stone < 20, stone > 15, stone >= 15, stone >= 3, stone >= 2,
+            iron < 5, iron > 0,
+            stockpile.get("morale", 0) < 50, stockpile.get("science", 0) == 0,
+        )
+
+    def decision_fingerprint(self, cell_mates, neighbors):
+        # Everything the utility decision depends on. Gather and combat kinds keep first-seen order,
+        # because ties between equal scores go to the first action found.
+        gather_order = []
+        occupancy = 0
+        for agent in cell_mates:
+            kind = type(agent)
+            if kind in GATHER_KINDS:
+                if kind not in gather_order:
+                    gather_order.append(kind)
+            elif kind in OCCUPANCY_BITS:
+                occupancy |= OCCUPANCY_BITS[kind]
+            elif isinstance(agent, Person) and agent is not self:
+                if agent.tribe_id != self.tribe_id:
+                    occupancy |= TRADE_BIT
+                if agent.tribe_id is None:
+                    occupancy |= LONER_BIT
+
+        combat_order = []
+        enemy_at_war = False
+        for neighbor in neighbors:
+            if isinstance(neighbor, Barbarian):
+                kind = "attack_barbarian"
+            elif isinstance(neighbor, Predator):
+                kind = "attack_predator"
+            elif isinstance(neighbor, Person) and neighbor.tribe_id != self.tribe_id and neighbor.tribe_id is not None:
+                kind = "attack_enemy"
+                if not enemy_at_war and self.tribe_id is not None:
+                    enemy_at_war = tuple(sorted((self.tribe_id, neighbor.tribe_id))) in self.model.wars
+            else:
+                continue
+            if kind not in combat_order:
+                combat_order.append(kind)
+
+        energy_band = 0 if self.energy < 20 else 1 if self.energy < 25 else 2
+        return (
+            self.tribe_id, self.profession, self.infected, energy_band, self.stockpile_bands(),
+            occupancy, tuple(gather_order), tuple(combat_order), enemy_at_war,
+        )
+
+    def choose_action(self, cell_mates, neighbors):
+        # Reuse the previous decision while the context fingerprint is unchanged
+        fingerprint = self.decision_fingerprint(cell_mates, neighbors)
+        stats = self.model.decision_cache_stats
+        if fingerprint == self.last_decision[0]:
+            stats["hits"] += 1
+            return self.last_decision[1]
+        stats["misses"] += 1
+
+        best_action = None
+        best_score = -1
+        for action in self.get_possible_actions(cell_mates, neighbors):
+            score = self.calculate_utility(action)
+            if score > best_score:
+                best_score = score
+                best_action = action
+
+        action_type = best_action["type"] if best_action else None
+        self.last_decision = (fingerprint, action_type)
+        return action_type
+
     def calculate_utility(self, action):
         score = 0
         action_type = action["type"]
@@ -189,32 +315,9 @@ class Person(Agent):
         self.energy -= 1  # Living costs energy
         
         # Plague Effect
+        # Spread and recovery are handled for everyone at once by model.epidemic
         if self.infected:
             self.energy -= 2 # Extra damage from plague
-            
-            # Spread Plague to neighbors
-            neighbors = self.model.grid.get_neighbors(self.pos, moore=True, include_center=False, radius=1)
-            for neighbor in neighbors:
-                if isinstance(neighbor, Person) and not neighbor.infected:
-                    # 10% chance to infect neighbor
-                    if self.random.random() < 0.1:
-                        neighbor.infected = True
-                        logging.info(f"Людина {self.unique_id} заразила Людину {neighbor.unique_id} чумою")
-
-            # Chance to recover if at Hospital or with Medicine
-            recovery_chance = 0.05
-            if self.tribe_id is not None and hasattr(self.model, "tribe_technologies"):
-                if "Medicine" in self.model.tribe_technologies.get(self.tribe_id, set()):
-                    recovery_chance += 0.1
-            
-            # Hospital bonus
-            cell_mates = self.model.grid.get_cell_list_contents([self.pos])
-            if any(isinstance(a, Hospital) for a in cell_mates):
-                recovery_chance += 0.2
-                
-            if self.random.random() < recovery_chance:
-                self.infected = False
-                logging.info(f"Людина {self.unique_id} одужала від чуми!")
 
         # Try to eat from stockpile if in a tribe and hungry
         self.withdraw_food()
@@ -223,8 +326,7 @@ class Person(Agent):
         if self.energy <= 0:
             reason = "чуми" if self.infected else "голоду"
             logging.info(f"Людина {self.unique_id} з племені {self.tribe_id} померла від {reason} в {self.pos}")
-            self.model.grid.remove_agent(self)
-            self.model.schedule.remove(self)
+            self.model.remove_agent(self)
             return
         
         # Medicine Tech: Increased lifespan
@@ -235,26 +337,19 @@ class Person(Agent):
 
         if self.age >= max_age:
             logging.info(f"Людина {self.unique_id} з племені {self.tribe_id} померла від старості в {self.pos}")
-            self.model.grid.remove_agent(self)
-            self.model.schedule.remove(self)
+            self.model.remove_agent(self)
             return
 
         # --- ACTIONS (Utility AI) ---
         cell_mates = self.model.grid.get_cell_list_contents([self.pos])
-        possible_actions = self.get_possible_actions(cell_mates)
-        
-        best_action = None
-        best_score = -1
-        
-        for action in possible_actions:
-            score = self.calculate_utility(action)
-            if score > best_score:
-                best_score = score
-                best_action = action
+        thinking = self.model.lod.should_think(self, cell_mates)
+        if thinking:
+            action_type = self.choose_action(cell_mates, self.get_combat_neighbors())
+        else:
+            action_type = self.last_decision[1] # Idle: reuse last intent
         
         # Execute Best Action
-        if best_action:
-            action_type = best_action["type"]
+        if action_type:
             if action_type == "gather_wood": self.gather_wood()
             elif action_type == "gather_stone": self.gather_stone()
             elif action_type == "gather_iron": self.gather_iron()
@@ -287,7 +382,11 @@ class Person(Agent):
             self.reproduce()
             
         # --- MOVE at the end of the step ---
-        self.move()
+        # Idle persons off their think tick keep to the planned path, or wander, without re-planning
+        if thinking:
+            self.move()
+        elif not self.follow_path():
+            self.wander()
 
     def gather_wood(self):
         if self.tribe_id is None:
@@ -309,10 +408,9 @@ class Person(Agent):
                 if hasattr(self.model, "tribe_traits") and self.model.tribe_traits.get(self.tribe_id) == "Industrial":
                     amount += 1
                 
-                self.model.tribe_stockpiles[self.tribe_id]["wood"] += amount
-                logging.info(f"Людина {self.unique_id} з племені {self.tribe_id} зібрала дерево. Запаси дерева: {self.model.tribe_stockpiles[self.tribe_id]['wood']}")
-                self.model.grid.remove_agent(agent)
-                self.model.schedule.remove(agent)
+                self.model.tribe_stockpiles.deposit(self.tribe_id, "wood", amount) # Batched, applied after the agent phase
+                logging.info(f"Людина {self.unique_id} з племені {self.tribe_id} зібрала дерево (+{amount}).")
+                self.model.remove_agent(agent)
                 break
 
     def gather_stone(self):
@@ -342,10 +440,9 @@ class Person(Agent):
                     if "Mining" in self.model.tribe_technologies.get(self.tribe_id, set()):
                         amount += 1
 
-                self.model.tribe_stockpiles[self.tribe_id]["stone"] += amount
-                logging.info(f"Людина {self.unique_id} з племені {self.tribe_id} зібрала камінь. Запаси каменю: {self.model.tribe_stockpiles[self.tribe_id]['stone']}")
-                self.model.grid.remove_agent(agent)
-                self.model.schedule.remove(agent)
+                self.model.tribe_stockpiles.deposit(self.tribe_id, "stone", amount)
+                logging.info(f"Людина {self.unique_id} з племені {self.tribe_id} зібрала камінь (+{amount}).")
+                self.model.remove_agent(agent)
                 break
 
     def gather_iron(self):
@@ -375,10 +472,9 @@ class Person(Agent):
                     if "Mining" in self.model.tribe_technologies.get(self.tribe_id, set()):
                         amount += 1
                     
-                self.model.tribe_stockpiles[self.tribe_id]["iron"] += amount
-                logging.info(f"Людина {self.unique_id} з племені {self.tribe_id} зібрала залізо. Запаси заліза: {self.model.tribe_stockpiles[self.tribe_id]['iron']}")
-                self.model.grid.remove_agent(agent)
-                self.model.schedule.remove(agent)
+                self.model.tribe_stockpiles.deposit(self.tribe_id, "iron", amount)
+                logging.info(f"Людина {self.unique_id} з племені {self.tribe_id} зібрала залізо (+{amount}).")
+                self.model.remove_agent(agent)
                 break
 
     def work_smithy(self):
@@ -488,264 +584,30 @@ class Person(Agent):
     def attack_barbarian(self):
         if self.profession not in ["Guard", "Soldier"]:
             return
-            
-        neighbors = self.model.grid.get_neighbors(self.pos, moore=True, include_center=True, radius=1)
-        barbarians = [a for a in neighbors if isinstance(a, Barbarian)]
-        
-        if barbarians:
-            target = barbarians[0]
-            damage = 10
-            if self.profession == "Soldier": damage = 20
-            
-            self.energy -= 5
-            target.energy -= damage
-            logging.info(f"Захисник {self.unique_id} атакував Варвара в {target.pos}")
-            if target.energy <= 0:
-                self.model.grid.remove_agent(target)
-                self.model.schedule.remove(target)
+        # Target and damage (10, Soldier 20) are resolved with everyone else's attacks after the agent phase
+        self.model.combat.engage(self, "barbarian")
 
     def attack_predator(self):
         if self.profession != "Guard":
             return
-        
-        neighbors = self.model.grid.get_neighbors(self.pos, moore=True, include_center=True, radius=1)
-        predators = [a for a in neighbors if isinstance(a, Predator)]
-        
-        if predators:
-            target = predators[0]
-            self.energy -= 10
-            logging.info(f"Охоронець {self.unique_id} вбив Хижака {target.unique_id} в {target.pos}")
-            self.model.grid.remove_agent(target)
-            self.model.schedule.remove(target)
+        # A guard kills the closest predator next to them (resolved in model.combat)
+        self.model.combat.engage(self, "predator")
 
     def attack_enemy(self):
         if self.tribe_id is None:
             return
         if self.profession not in ["Soldier", "Archer", "Guard"]:
              return
-        
-        # Check for enemies in range
-        attack_radius = 3 if self.profession == "Archer" else 1
-        neighbors = self.model.grid.get_neighbors(self.pos, moore=True, include_center=True, radius=attack_radius)
-        enemies = [
-            a for a in neighbors 
-            if isinstance(a, Person) and a.tribe_id is not None and a.tribe_id != self.tribe_id
-        ]
-        
-        for enemy in enemies:
-            # Check if we are at war
-            # War key is sorted tuple of tribe IDs to ensure uniqueness
-            war_key = tuple(sorted((self.tribe_id, enemy.tribe_id)))
-            if hasattr(self.model, "wars") and war_key in self.model.wars:
-                # Attack!
-                damage = 20
-                if self.profession == "Archer": damage = 15 # Lower damage but range
-                
-                if hasattr(self.model, "tribe_traits") and self.model.tribe_traits.get(self.tribe_id) == "Militaristic":
-                    damage += 10
-                
-                # Religion bonus: War God
-                if hasattr(self.model, "tribe_religion") and self.model.tribe_religion.get(self.tribe_id) == "War God":
-                    damage += 5
-
-                self.energy -= 5 # Fighting is tiring
-                enemy.energy -= damage # Damage
-                logging.info(f"{self.profession} {self.unique_id} (Плем'я {self.tribe_id}) атакував Ворога {enemy.unique_id} в {enemy.pos}")
-                
-                if enemy.energy <= 0:
-                    logging.info(f"Ворога {enemy.unique_id} вбито {self.profession} {self.unique_id}")
-                    self.model.grid.remove_agent(enemy)
-                    self.model.schedule.remove(enemy)
-                return # Attack once per turn
+        # Closest enemy at war within range (Archer 3, else 1), damage 20 (Archer 15)
+        # plus Militaristic / War God bonuses, resolved in model.combat
+        self.model.combat.engage(self, "enemy")
 
     def build_house(self):
         if self.tribe_id is None:
             return # Loners cannot build houses in this implementation
 
-        stockpile = self.model.tribe_stockpiles[self.tribe_id]
-        cell_mates = self.model.grid.get_cell_list_contents([self.pos])
-        
-        # -1. Library Priority (Critical for Tech)
-        if stockpile["wood"] >= 15 and stockpile["stone"] >= 15 and stockpile.get("science", 0) == 0:
-             if not any(isinstance(agent, (House, Farm, Wall, Smithy, Market, Road, Barracks, Library)) for agent in cell_mates):
-                stockpile["wood"] -= 15
-                stockpile["stone"] -= 15
-                library = Library(self.model, tribe_id=self.tribe_id)
-                self.model.schedule.add(library)
-                self.model.grid.place_agent(library, self.pos)
-                logging.info(f"Людина {self.unique_id} з племені {self.tribe_id} побудувала Бібліотеку (Пріоритет) в {self.pos}")
-                return
-        
-        # 0. Barracks Priority (War) - Highest Priority
-        if stockpile["wood"] >= 15 and stockpile["stone"] >= 15:
-             if not any(isinstance(agent, (House, Farm, Wall, Smithy, Market, Road, Barracks)) for agent in cell_mates):
-                 tribe_pop = self.model.tribe_counts.get(self.tribe_id, 0)
-                 # Lowered threshold to 5 to encourage militarization
-                 if tribe_pop > 5:
-                    stockpile["wood"] -= 15
-                    stockpile["stone"] -= 15
-                    barracks = Barracks(self.model, tribe_id=self.tribe_id)
-                    self.model.schedule.add(barracks)
-                    self.model.grid.place_agent(barracks, self.pos)
-                    logging.info(f"Людина {self.unique_id} з племені {self.tribe_id} побудувала Казарму в {self.pos}")
-                    return
-
-        # 0.5 Library Priority (Science)
-        if stockpile["wood"] >= 15 and stockpile["stone"] >= 15:
-             # Allow building on Roads (Library on Road is fine)
-             if not any(isinstance(agent, (House, Farm, Wall, Smithy, Market, Barracks, Library)) for agent in cell_mates):
-                 # Build if we have scholars but no library, or just generally if we are rich
-                 # Check if tribe already has a library (simple check: do we have science?)
-                 # Or just build one if we have the resources, prioritizing the first one
-                 
-                 # If we have plenty of resources OR we have 0 science (implying no library/research yet)
-                 if (stockpile["wood"] >= 15 and stockpile["stone"] >= 15 and stockpile.get("science", 0) == 0) or \
-                    (stockpile["wood"] >= 20 and stockpile["stone"] >= 20):
-                    stockpile["wood"] -= 15
-                    stockpile["stone"] -= 15
-                    library = Library(self.model, tribe_id=self.tribe_id)
-                    self.model.schedule.add(library)
-                    self.model.grid.place_agent(library, self.pos)
-                    logging.info(f"Людина {self.unique_id} з племені {self.tribe_id} побудувала Бібліотеку в {self.pos}")
-                    return
-
-        # 0.6 Hospital Priority (Health)
-        if stockpile["wood"] >= 10 and stockpile["stone"] >= 5:
-             if not any(isinstance(agent, (House, Farm, Wall, Smithy, Market, Barracks, Library, Hospital, Temple, Tavern)) for agent in cell_mates):
-                 # Build if we have healers or plague is active (hard to check global plague here, so just build if rich)
-                 # Lowered threshold to ensure construction
-                 if stockpile["wood"] >= 12 and stockpile["stone"] >= 6:
-                    stockpile["wood"] -= 10
-                    stockpile["stone"] -= 5
-                    hospital = Hospital(self.model, tribe_id=self.tribe_id)
-                    self.model.schedule.add(hospital)
-                    self.model.grid.place_agent(hospital, self.pos)
-                    logging.info(f"Людина {self.unique_id} з племені {self.tribe_id} побудувала Лікарню в {self.pos}")
-                    return
-
-        # 0.7 Temple Priority (Morale)
-        if stockpile["wood"] >= 10 and stockpile["stone"] >= 10:
-             if not any(isinstance(agent, (House, Farm, Wall, Smithy, Market, Barracks, Library, Hospital, Temple, Tavern)) for agent in cell_mates):
-                 # Lowered threshold to ensure construction
-                 if stockpile["wood"] >= 12 and stockpile["stone"] >= 12:
-                    stockpile["wood"] -= 10
-                    stockpile["stone"] -= 10
-                    temple = Temple(self.model, tribe_id=self.tribe_id)
-                    self.model.schedule.add(temple)
-                    self.model.grid.place_agent(temple, self.pos)
-                    logging.info(f"Person {self.unique_id} from tribe {self.tribe_id} built a Temple at {self.pos}")
-                    return
-
-        # 0.8 Tavern Priority (Social)
-        if stockpile["wood"] >= 8 and stockpile["stone"] >= 2:
-             if not any(isinstance(agent, (House, Farm, Wall, Smithy, Market, Barracks, Library, Hospital, Temple, Tavern)) for agent in cell_mates):
-                 # Lowered threshold to ensure construction
-                 if stockpile["wood"] >= 10 and stockpile["food"] > 50: # Only build if plenty of food
-                    stockpile["wood"] -= 8
-                    stockpile["stone"] -= 2
-                    tavern = Tavern(self.model, tribe_id=self.tribe_id)
-                    self.model.schedule.add(tavern)
-                    self.model.grid.place_agent(tavern, self.pos)
-                    logging.info(f"Person {self.unique_id} from tribe {self.tribe_id} built a Tavern at {self.pos}")
-                    return
-
-        # 1. Smithy Priority: If we have Iron but no tools/smithy, build one!
-        # Check if we can build a Smithy (Cost: 3 Wood, 3 Stone)
-        if stockpile["wood"] >= 3 and stockpile["stone"] >= 3:
-             # Save resources for Hospital/Temple (Need ~12)
-             save_threshold = 25 if stockpile.get("science", 0) == 0 else 15
-             if stockpile["wood"] > save_threshold and stockpile["stone"] > 10:
-                 # Allow building on Roads (Smithy on Road is fine)
-                 if not any(isinstance(agent, (House, Farm, Wall, Smithy, Market, Library, Hospital, Temple, Tavern)) for agent in cell_mates):
-                     # Build if we have iron to process
-                     if stockpile.get("iron", 0) > 0:
-                        stockpile["wood"] -= 3
-                        stockpile["stone"] -= 3
-                        smithy = Smithy(self.model, tribe_id=self.tribe_id)
-                        self.model.schedule.add(smithy)
-                        self.model.grid.place_agent(smithy, self.pos)
-                        logging.info(f"Person {self.unique_id} from tribe {self.tribe_id} built a Smithy at {self.pos}")
-                        return
-
-        # Check if we can build a Farm (Cost: 2 Wood, 2 Stone)
-        # Prioritize farms if food is low (< 50) and we have resources
-        if stockpile["food"] < 50 and stockpile["wood"] >= 2 and stockpile["stone"] >= 2:
-             # Save resources unless food is critical (< 20)
-             save_threshold = 25 if stockpile.get("science", 0) == 0 else 15
-             if stockpile["wood"] > save_threshold or stockpile["food"] < 20:
-                 if not any(isinstance(agent, (House, Farm, Wall, Smithy, Market, Road, Library, Hospital, Temple, Tavern)) for agent in cell_mates):
-                    stockpile["wood"] -= 2
-                    stockpile["stone"] -= 2
-                    farm = Farm(self.model, tribe_id=self.tribe_id)
-                    self.model.schedule.add(farm)
-                    self.model.grid.place_agent(farm, self.pos)
-                    logging.info(f"Person {self.unique_id} from tribe {self.tribe_id} built a Farm at {self.pos}")
-                    return # Built something, done for this turn
-
-        # Check if we can build a Wall (Cost: 3 Stone)
-        # Build walls if we have excess stone and are near a house/farm (simple defense logic)
-        if stockpile["stone"] >= 3:
-             # Save stone for Temple (Need 12)
-             save_threshold = 25 if stockpile.get("science", 0) == 0 else 15
-             if stockpile["stone"] > save_threshold:
-                 # Check if building already exists here
-                 if not any(isinstance(agent, (House, Farm, Wall, Smithy, Market, Road, Library, Hospital, Temple, Tavern)) for agent in cell_mates):
-                     # Only build walls next to existing buildings to form a perimeter (simple heuristic)
-                     neighbors = self.model.grid.get_neighbors(self.pos, moore=True, include_center=False, radius=1)
-                     if any(isinstance(a, (House, Farm)) for a in neighbors):
-                        stockpile["stone"] -= 3
-                        wall = Wall(self.model)
-                        self.model.schedule.add(wall)
-                        self.model.grid.place_agent(wall, self.pos)
-                        logging.info(f"Person {self.unique_id} from tribe {self.tribe_id} built a Wall at {self.pos}")
-                        return
-
-        # 5. Market Priority (Trade)
-        # Build market if we have excess resources and no market nearby
-        if stockpile["wood"] >= 15 and stockpile["stone"] >= 15:
-             # Allow building on Roads (Market on Road is fine, actually good for trade)
-             if not any(isinstance(agent, (House, Farm, Wall, Smithy, Market, Barracks, Library, Hospital, Temple, Tavern)) for agent in cell_mates):
-                 # Only build if we have a surplus
-                 # Lowered threshold to encourage market building
-                 if stockpile["wood"] >= 15 and stockpile["stone"] >= 15:
-                    stockpile["wood"] -= 15
-                    stockpile["stone"] -= 15
-                    market = Market(self.model, tribe_id=self.tribe_id)
-                    self.model.schedule.add(market)
-                    self.model.grid.place_agent(market, self.pos)
-                    logging.info(f"Person {self.unique_id} from tribe {self.tribe_id} built a Market at {self.pos}")
-                    return
-
-        # 6. Road Priority (Infrastructure)
-        # Build road if we are on a building site or connecting them
-        if stockpile["stone"] >= 1:
-             # Save stone for Temple/Barracks (Need ~15)
-             save_threshold = 25 if stockpile.get("science", 0) == 0 else 15
-             if stockpile["stone"] > save_threshold:
-                 if not any(isinstance(agent, (Road, House, Farm, Wall, Smithy, Market, Library, Hospital, Temple, Tavern)) for agent in cell_mates):
-                     # Check neighbors for buildings
-                     neighbors = self.model.grid.get_neighbors(self.pos, moore=True, include_center=False, radius=1)
-                     if any(isinstance(a, (House, Farm, Smithy, Market, Road)) for a in neighbors):
-                        stockpile["stone"] -= 1
-                        road = Road(self.model)
-                        self.model.schedule.add(road)
-                        self.model.grid.place_agent(road, self.pos)
-                        logging.info(f"Person {self.unique_id} from tribe {self.tribe_id} built a Road at {self.pos}")
-                        return
-
-        # 7. House Priority (Expansion)
-        # Increased threshold to allow saving for other things
-        if stockpile["wood"] >= 3:
-            # Save wood for Hospital/Temple (Need ~15)
-            save_threshold = 25 if stockpile.get("science", 0) == 0 else 15
-            if stockpile["wood"] > save_threshold:
-                # Check if building already exists here
-                if not any(isinstance(agent, (House, Farm, Wall, Smithy, Market, Road, Library, Hospital, Temple, Tavern)) for agent in cell_mates):
-                    stockpile["wood"] -= 3
-                    house = House(self.model)
-                    self.model.schedule.add(house)
-                    self.model.grid.place_agent(house, self.pos)
-                    logging.info(f"Person {self.unique_id} from tribe {self.tribe_id} built a House at {self.pos}")
+        # The tribe's build planner picks the highest-priority structure this cell allows
+        self.model.build_planner.build(self)
 
     def form_tribe(self):
         if self.tribe_id is not None:
@@ -769,12 +631,8 @@ class Person(Agent):
 
         cell_mates = self.model.grid.get_cell_list_contents([self.pos])
         
-        # Market Trading Logic
-        market = next((a for a in cell_mates if isinstance(a, Market)), None)
-        if market:
-            # If at a market, trade efficiency is boosted or global trade happens
-            pass # Placeholder for advanced market logic
-
+        # Tribes that own a Market also trade with each other through model.market every step;
+        # face-to-face barter below works anywhere
         other_tribe_members = [
             agent
             for agent in cell_mates
@@ -816,52 +674,40 @@ class Person(Agent):
     def reproduce(self):
         # Only reproduce if safe in a house (optional, but good for civilization logic)
         # For now, let's keep it simple: reproduce anywhere, but maybe prefer houses later.
+        # The child (energy 25, same tribe, this cell) is born with everyone else's after the agent phase
         self.energy -= 25
-        child = Person(self.model, tribe_id=self.tribe_id)
-        child.energy = 25
-        self.model.schedule.add(child)
-        self.model.grid.place_agent(child, self.pos)
-        logging.info(f"Person {self.unique_id} from tribe {self.tribe_id} reproduced at {self.pos}. New Person {child.unique_id} created in same tribe.")
+        self.model.births.request(self, Person, 25, self.tribe_id)
 
     def move(self):
         if self.pos is None:
             return
+        self.current_path = [] # Re-planned below
             
-        # Check for predators on current cell or nearby
-        cell_mates = self.model.grid.get_cell_list_contents([self.pos])
-        neighbors = self.model.grid.get_neighbors(
-            self.pos, moore=True, include_center=False, radius=2
-        )
-        all_others_around = [a for a in (cell_mates + neighbors) if a is not self]
-        predators_near = [agent for agent in all_others_around if isinstance(agent, Predator)]
-        
-        if predators_near:
+        # Check for predators or barbarians on current cell or nearby (threat field, built once per step)
+        influence = self.model.influence
+        if influence.threat_near[self.pos]:
             # Guards don't flee, they engage
             if self.profession == "Guard":
-                nearest_predator = min(predators_near, key=lambda p: self.get_distance(self.pos, p.pos))
-                if self.get_distance(self.pos, nearest_predator.pos) > 1:
+                if influence.threat_distance[self.pos] > 1:
                      possible_steps = self.model.grid.get_neighborhood(
                         self.pos, moore=True, include_center=False
                      )
-                     best_step = min(possible_steps, key=lambda pos: self.get_distance(pos, nearest_predator.pos))
-                     self.model.grid.move_agent(self, best_step)
+                     self.model.grid.move_agent(self, influence.toward_threat(possible_steps))
                      return
                 else:
                     return # Stay put to attack
 
             # Check if I am in a house
+            cell_mates = self.model.grid.get_cell_list_contents([self.pos])
             if any(isinstance(agent, House) for agent in cell_mates):
                 # I am safe, don't move!
                 return
 
-            # Run away from the nearest predator
-            predator = min(predators_near, key=lambda p: self.get_distance(self.pos, p.pos))
+            # Run away: step to the neighbor farthest from any threat
             possible_steps = self.model.grid.get_neighborhood(
                 self.pos, moore=True, include_center=False
             )
-            # Find step that maximizes distance from predator
-            best_step = max(possible_steps, key=lambda pos: self.get_distance(pos, predator.pos))
-            self.model.grid.move_agent(self, best_step)
+            self.model.grid.move_agent(self, influence.away_from_threat(possible_steps))
             return
 
         # --- Desired Target Selection ---
@@ -921,9 +767,9 @@ class Person(Agent):
                  target_pos = current_area_targets[0].pos
             
             # 2. Check Memory
-            elif target_type in self.memory and self.memory[target_type]:
-                # Find closest memory location
-                possible_locations = list(self.memory[target_type])
+            elif target_type in self.memory:
+                # Find closest memory location (expired entries are dropped here)
+                possible_locations = self.memory.locations(target_type, self.model.schedule.steps)
                 possible_locations.sort(key=lambda p: self.get_distance(self.pos, p))
                 
                 # Verify and cleanup memory if we are there and it's empty
@@ -931,7 +777,7 @@ class Person(Agent):
                 for loc in possible_locations:
                     if loc == self.pos:
                         # We are here but didn't find it in step 1 -> It's gone
-                        self.memory[target_type].remove(loc)
+                        self.memory.forget(target_type, loc)
                         continue
                     else:
                         target_pos = loc
@@ -947,12 +793,16 @@ class Person(Agent):
                 if path and len(path) > 0:
                     next_step = path[0]
                     self.model.grid.move_agent(self, next_step)
+                    self.current_path = path[1:] # Kept for steps without thinking (LOD)
                     return
-                else:
-                     # Path blocked or unreachable, maybe remove from memory or Ignore
-                     pass
+                elif path is None:
+                     # Path blocked or unreachable, forget it so we don't search for it again
+                     self.memory.forget(target_type, target_pos)
 
-        # Random move (exploration)
+        self.wander()
+
+    def wander(self):
+        # Random move (exploration), weighted towards cheap terrain
         possible_steps = self.model.grid.get_neighborhood(
             self.pos,
             moore=True,
@@ -973,6 +823,17 @@ class Person(Agent):
         
         return 
 
+    def follow_path(self):
+        # Continue along the last planned path without re-planning
+        if not self.current_path:
+            return False
+        next_step = self.current_path.pop(0)
+        if self.model.get_movement_cost(next_step) >= 100:
+            self.current_path = []
+            return False
+        self.model.grid.move_agent(self, next_step)
+        return True
+
     def get_distance(self, pos1, pos2):
         # Manhattan distance for simplicity
         return abs(pos1[0] - pos2[0]) + abs(pos1[1] - pos2[1])
@@ -988,8 +849,7 @@ class Person(Agent):
                         amount += 5
                     self.energy += amount
                     logging.info(f"Loner {self.unique_id} ate food at {self.pos}. Energy: {self.energy}")
-                    self.model.grid.remove_agent(agent)
-                    self.model.schedule.remove(agent)
+                    self.model.remove_agent(agent)
                     break
             return
 
@@ -1023,10 +883,9 @@ class Person(Agent):
                 if hasattr(self.model, "tribe_religion") and self.model.tribe_religion.get(self.tribe_id) == "Sea God":
                     amount += 1
 
-                self.model.tribe_stockpiles[self.tribe_id]["food"] += amount
-                logging.info(f"Person {self.unique_id} of tribe {self.tribe_id} gathered food. Tribe food: {self.model.tribe_stockpiles[self.tribe_id]['food']}")
-                self.model.grid.remove_agent(agent)
-                self.model.schedule.remove(agent)
+                self.model.tribe_stockpiles.deposit(self.tribe_id, "food", amount)
+                logging.info(f"Person {self.unique_id} of tribe {self.tribe_id} gathered food (+{amount}).")
+                self.model.remove_agent(agent)
                 break
     
     def withdraw_food(self):
@@ -1071,14 +930,12 @@ class Predator(Agent):
         if self.energy <= 0:
             reason = "starvation"
             logging.info(f"Predator {self.unique_id} died of {reason} at {self.pos}")
-            self.model.grid.remove_agent(self)
-            self.model.schedule.remove(self)
+            self.model.remove_agent(self)
             return
         if self.age >= 60:
             reason = "old age"
             logging.info(f"Predator {self.unique_id} died of {reason} at {self.pos}")
-            self.model.grid.remove_agent(self)
-            self.model.schedule.remove(self)
+            self.model.remove_agent(self)
             return
 
         # --- ACTION on current cell ---
@@ -1093,11 +950,8 @@ class Predator(Agent):
     def move(self):
         if self.pos is None:
             return
-        # Look for Person in neighbors
-        neighbors = self.model.grid.get_neighbors(
-            self.pos, moore=True, include_center=False, radius=2  # Restored vision radius
-        )
-        prey_near = [agent for agent in neighbors if isinstance(agent, Person)]
+        # Look for Person in neighbors (prey field, radius 2)
+        influence = self.model.influence
         
         possible_steps = self.model.grid.get_neighborhood(
             self.pos, moore=True, include_center=False
@@ -1113,11 +967,9 @@ class Predator(Agent):
         if not valid_steps:
             return # Trapped!
 
-        if prey_near:
-            target = prey_near[0]
+        if influence.prey_near[self.pos]:
             # Only consider valid steps
-            best_step = min(valid_steps, key=lambda pos: self.get_distance(pos, target.pos))
-            self.model.grid.move_agent(self, best_step)
+            self.model.grid.move_agent(self, influence.toward_prey(valid_steps, self.pos))
         else:
             new_position = self.random.choice(valid_steps)
             self.model.grid.move_agent(self, new_position)
@@ -1147,18 +999,13 @@ class Predator(Agent):
             if isinstance(agent, Person):
                 self.energy += 20
                 logging.info(f"Predator {self.unique_id} (pack {self.pack_id}, strength {pack_strength}) ate Person {agent.unique_id} at {self.pos}")
-                self.model.grid.remove_agent(agent)
-                self.model.schedule.remove(agent)
+                self.model.remove_agent(agent)
                 # Only eat one person per step
                 break
 
     def reproduce(self):
         self.energy -= 30
-        child = Predator(self.model, pack_id=self.pack_id)
-        child.energy = 30
-        self.model.schedule.add(child)
-        self.model.grid.place_agent(child, self.pos)
-        logging.info(f"Хижак {self.unique_id} зі зграї {self.pack_id} розмножився в {self.pos}")
+        self.model.births.request(self, Predator, 30, self.pack_id) # Cub joins the pack on this cell (model.births)
 
     def get_distance(self, pos1, pos2):
         return abs(pos1[0] - pos2[0]) + abs(pos1[1] - pos2[1])
@@ -1174,8 +1021,7 @@ class Barbarian(Agent):
         
         self.energy -= 1
         if self.energy <= 0:
-            self.model.grid.remove_agent(self)
-            self.model.schedule.remove(self)
+            self.model.remove_agent(self)
             return
 
         # Attack logic
@@ -1187,27 +1033,20 @@ class Barbarian(Agent):
                     self.energy += 10
                     logging.info(f"Варвар атакував Людину {agent.unique_id} в {self.pos}")
                     if agent.energy <= 0:
-                        self.model.grid.remove_agent(agent)
-                        self.model.schedule.remove(agent)
+                        self.model.remove_agent(agent)
                 else:
                     # Destroy building
                     logging.info(f"Варвар знищив {type(agent).__name__} в {self.pos}")
-                    self.model.grid.remove_agent(agent)
-                    self.model.schedule.remove(agent)
+                    self.model.remove_agent(agent)
                 return # Attack once per turn
 
-        # Move logic: Move towards nearest building or person
-        # ... (Simple random move for now)
-        possible_steps = self.model.grid.get_neighborhood(
-            self.pos, moore=True, include_center=False
-        )
-        # Filter out Mountains
-        valid_steps = []
-        for step in possible_steps:
-            cell_contents = self.model.grid.get_cell_list_contents([step])
-            if not any(isinstance(agent, Mountain) for agent in cell_contents):
-                valid_steps.append(step)
-        
-        if valid_steps:
-            new_position = self.random.choice(valid_steps)
+        # Move logic: head for the nearest settlement along the wave's shared flow field,
+        # wander (avoiding Mountains) when no building is reachable
+        field = self.model.settlement_field
+        new_position = field.next_step(self.pos)
+        if new_position is None:
+            valid_steps = field.passable_steps(self.pos)
+            if valid_steps:
+                new_position = self.random.choice(valid_steps)
+        if new_position is not None:
             self.model.grid.move_agent(self, new_position)
@@ -0,0 +1,174 @@
+import logging
+from bisect import bisect_right
+from civilization_sim.new_agents.buildings import House, Farm, Wall, Smithy, Market, Road, Barracks, Library, Hospital, Temple, Tavern
+
+
+def save_threshold(stockpile):
+    # Save resources for Hospital/Temple/Barracks until the tribe has science
+    return 25 if stockpile.get("science", 0) == 0 else 15
+
+
+class BuildRule:
+    """One construction priority: when the tribe can afford it, what blocks the site and what it must be next to."""
+    def __init__(self, building, cost, condition, blocked_by, log_message, near=None, owned=True):
+        self.building = building
+        self.cost = cost
+        self.condition = condition # (stockpile, tribe_pop) -> bool
+        self.blocked_by = blocked_by
+        self.near = near
+        self.owned = owned # Walls, Roads and Houses are built without a tribe_id
+        self.log_message = log_message
+
+
+# Same order as the old cascading checks in Person.build_house
+CIVIC = (House, Farm, Wall, Smithy, Market, Barracks, Library, Hospital, Temple, Tavern)
+HOMESTEAD = (House, Farm, Wall, Smithy, Market, Road, Library, Hospital, Temple, Tavern)
+
+BUILD_RULES = [
+    # -1. Library Priority (Critical for Tech)
+    BuildRule(Library, {"wood": 15, "stone": 15},
+              lambda s, pop: s["wood"] >= 15 and s["stone"] >= 15 and s.get("science", 0) == 0,
+              (House, Farm, Wall, Smithy, Market, Road, Barracks, Library),
+              "Людина {person} з племені {tribe} побудувала Бібліотеку (Пріоритет) в {pos}"),
+    # 0. Barracks Priority (War). Lowered population threshold to 5 to encourage militarization
+    BuildRule(Barracks, {"wood": 15, "stone": 15},
+              lambda s, pop: s["wood"] >= 15 and s["stone"] >= 15 and pop > 5,
+              (House, Farm, Wall, Smithy, Market, Road, Barracks),
+              "Людина {person} з племені {tribe} побудувала Казарму в {pos}"),
+    # 0.5 Library Priority (Science): first library, or any time we are rich. Allowed on Roads
+    BuildRule(Library, {"wood": 15, "stone": 15},
+              lambda s, pop: (s["wood"] >= 15 and s["stone"] >= 15 and s.get("science", 0) == 0) or (s["wood"] >= 20 and s["stone"] >= 20),
+              (House, Farm, Wall, Smithy, Market, Barracks, Library),
+              "Людина {person} з племені {tribe} побудувала Бібліотеку в {pos}"),
+    # 0.6 Hospital Priority (Health)
+    BuildRule(Hospital, {"wood": 10, "stone": 5},
+              lambda s, pop: s["wood"] >= 12 and s["stone"] >= 6,
+              CIVIC,
+              "Людина {person} з племені {tribe} побудувала Лікарню в {pos}"),
+    # 0.7 Temple Priority (Morale)
+    BuildRule(Temple, {"wood": 10, "stone": 10},
+              lambda s, pop: s["wood"] >= 12 and s["stone"] >= 12,
+              CIVIC,
+              "Person {person} from tribe {tribe} built a Temple at {pos}"),
+    # 0.8 Tavern Priority (Social). Only build if plenty of food
+    BuildRule(Tavern, {"wood": 8, "stone": 2},
+              lambda s, pop: s["wood"] >= 10 and s["stone"] >= 2 and s["food"] > 50,
+              CIVIC,
+              "Person {person} from tribe {tribe} built a Tavern at {pos}"),
+    # 1. Smithy Priority: we have Iron to process. Allowed on Roads
+    BuildRule(Smithy, {"wood": 3, "stone": 3},
+              lambda s, pop: s["wood"] > save_threshold(s) and s["stone"] > 10 and s.get("iron", 0) > 0,
+              (House, Farm, Wall, Smithy, Market, Library, Hospital, Temple, Tavern),
+              "Person {person} from tribe {tribe} built a Smithy at {pos}"),
+    # Farm if food is low (< 50). Save resources unless food is critical (< 20)
+    BuildRule(Farm, {"wood": 2, "stone": 2},
+              lambda s, pop: s["food"] < 50 and s["wood"] >= 2 and s["stone"] >= 2 and (s["wood"] > save_threshold(s) or s["food"] < 20),
+              HOMESTEAD,
+              "Person {person} from tribe {tribe} built a Farm at {pos}"),
+    # Wall: excess stone, next to a house/farm to form a perimeter
+    BuildRule(Wall, {"stone": 3},
+              lambda s, pop: s["stone"] >= 3 and s["stone"] > save_threshold(s),
+              HOMESTEAD,
+              "Person {person} from tribe {tribe} built a Wall at {pos}",
+              near=(House, Farm), owned=False),
+    # 5. Market Priority (Trade). Allowed on Roads
+    BuildRule(Market, {"wood": 15, "stone": 15},
+              lambda s, pop: s["wood"] >= 15 and s["stone"] >= 15,
+              CIVIC,
+              "Person {person} from tribe {tribe} built a Market at {pos}"),
+    # 6. Road Priority (Infrastructure): connect existing buildings
+    BuildRule(Road, {"stone": 1},
+              lambda s, pop: s["stone"] >= 1 and s["stone"] > save_threshold(s),
+              HOMESTEAD,
+              "Person {person} from tribe {tribe} built a Road at {pos}",
+              near=(House, Farm, Smithy, Market, Road), owned=False),
+    # 7. House Priority (Expansion)
+    BuildRule(House, {"wood": 3},
+              lambda s, pop: s["wood"] >= 3 and s["wood"] > save_threshold(s),
+              HOMESTEAD,
+              "Person {person} from tribe {tribe} built a House at {pos}",
+              owned=False),
+]
+
+
+# Smallest amount that passes each threshold BUILD_RULES compares a resource with ("> 15" is 16)
+BAND_CUTS = {
+    "wood": (2, 3, 10, 12, 15, 16, 20, 26),
+    "stone": (1, 2, 3, 6, 11, 12, 15, 16, 20, 26),
+    "food": (20, 50, 51),
+    "iron": (1,),
+    "science": (1,),
+}
+POPULATION_CUTS = (6,)
+
+
+def stockpile_band(stockpile, tribe_pop):
+    # Stockpiles in the same band pass the same thresholds, so they afford the same rules
+    return tuple(bisect_right(cuts, stockpile.get(resource, 0)) for resource, cuts in BAND_CUTS.items()) + (bisect_right(POPULATION_CUTS, tribe_pop),)
+
+
+class BuildPlanner:
+    """Tribe-level construction priorities over an incremental per-cell index of the rules each site allows."""
+    def __init__(self, model, rules=BUILD_RULES, band=stockpile_band):
+        self.model = model
+        self.rules = rules
+        self.band = band
+        # Rules allowed on a cell with no building on or next to it
+        self.open_mask = sum(1 << i for i, rule in enumerate(rules) if rule.near is None)
+        self.allowed = {} # pos -> bitmask of rules whose site conditions hold, for cells on or next to a building
+        self.bands = {} # stockpile band -> bitmask of affordable rules
+        self.stats = {"bands": 0, "orders": 0}
+
+    def site_mask(self, pos):
+        sites = self.model.grid.sites
+        mask = 0
+        for i, rule in enumerate(self.rules):
+            if sites.has_any(pos, rule.blocked_by):
+                continue
+            if rule.near is not None and not sites.near_any(pos, rule.near):
+                continue
+            mask |= 1 << i
+        return mask
+
+    def touched(self, pos):
+        # Called by the grid after a building is placed on or removed from pos
+        grid = self.model.grid
+        for cell in grid.get_neighborhood(pos, moore=True, include_center=True):
+            if cell in grid.sites.types or cell in grid.sites.adjacent:
+                self.allowed[cell] = self.site_mask(cell)
+            else:
+                self.allowed.pop(cell, None)
+
+    def affordable(self, tribe_id):
+        stockpile = self.model.tribe_stockpiles[tribe_id]
+        tribe_pop = self.model.tribe_counts.get(tribe_id, 0)
+        band = self.band(stockpile, tribe_pop)
+        mask = self.bands.get(band)
+        if mask is None:
+            mask = sum(1 << i for i, rule in enumerate(self.rules) if rule.condition(stockpile, tribe_pop))
+            self.bands[band] = mask
+            self.stats["bands"] += 1
+        return mask
+
+    def order_for(self, tribe_id, pos):
+        # Highest-priority rule the tribe can afford and the site allows
+        mask = self.affordable(tribe_id) & self.allowed.get(pos, self.open_mask)
+        if not mask:
+            return None
+        return self.rules[(mask & -mask).bit_length() - 1]
+
+    def build(self, person):
+        rule = self.order_for(person.tribe_id, person.pos)
+        if rule is None:
+            return None
+
+        stockpile = self.model.tribe_stockpiles[person.tribe_id]
+        for resource, amount in rule.cost.items():
+            stockpile[resource] -= amount
+
+        building = rule.building(self.model, tribe_id=person.tribe_id) if rule.owned else rule.building(self.model)
+        self.model.schedule.add(building)
+        self.model.grid.place_agent(building, person.pos)
+        self.stats["orders"] += 1
+        logging.info(rule.log_message.format(person=person.unique_id, tribe=person.tribe_id, pos=person.pos))
+        return building
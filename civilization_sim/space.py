@@ -0,0 +1,156 @@
+import numpy as np
+from mesa.space import MultiGrid
+from civilization_sim.new_agents.buildings import Building, Hospital, Road
+from civilization_sim.new_agents.people import Person
+from civilization_sim.new_agents.resources import Food, Tree, Stone, IronOre, Mountain, River
+
+
+def moore_rolls(raster):
+    # The raster shifted onto each cell from its 8 torus neighbors
+    for dx in (-1, 0, 1):
+        for dy in (-1, 0, 1):
+            if dx or dy:
+                yield np.roll(raster, (dx, dy), axis=(0, 1))
+
+
+def moore_sum(raster):
+    # Sum over the 8 neighbors of every cell (Moore kernel without the center)
+    total = np.zeros_like(raster)
+    for shifted in moore_rolls(raster):
+        total += shifted
+    return total
+
+
+def moore_any(mask):
+    # True where any of the 8 neighbors is set
+    out = np.zeros_like(mask)
+    for shifted in moore_rolls(mask):
+        out |= shifted
+    return out
+
+
+def moore_max(raster):
+    # Largest value among the 8 neighbors of every cell
+    out = np.full_like(raster, np.iinfo(raster.dtype).min)
+    for shifted in moore_rolls(raster):
+        np.maximum(out, shifted, out=out)
+    return out
+
+
+def box_sum(raster, radius):
+    # Sum over the (2 * radius + 1)^2 torus window around every cell, center included (separable)
+    rows = np.zeros_like(raster)
+    for d in range(-radius, radius + 1):
+        rows += np.roll(raster, d, axis=0)
+    total = np.zeros_like(raster)
+    for d in range(-radius, radius + 1):
+        total += np.roll(rows, d, axis=1)
+    return total
+
+
+def distance_field(mask, cap):
+    # Manhattan steps (on the torus) to the nearest set cell, capped at `cap`
+    distance = np.where(mask, 0, cap).astype(np.int32)
+    for _ in range(cap):
+        nearest = np.minimum.reduce([np.roll(distance, d, axis=axis) for axis in (0, 1) for d in (-1, 1)]) + 1
+        closer = nearest < distance
+        if not closer.any():
+            break
+        distance[closer] = nearest[closer]
+    return distance
+
+
+class BuildSiteIndex:
+    """Per-cell building types, and building-type counts over each cell's Moore neighborhood."""
+    def __init__(self, grid):
+        self.grid = grid
+        self.types = {} # pos -> {BuildingType: count}
+        self.adjacent = {} # pos -> {BuildingType: count} over the 8 neighbors
+
+    def add(self, agent_type, pos):
+        self._bump(self.types, pos, agent_type, 1)
+        for neighbor in self.grid.get_neighborhood(pos, moore=True, include_center=False):
+            self._bump(self.adjacent, neighbor, agent_type, 1)
+
+    def remove(self, agent_type, pos):
+        self._bump(self.types, pos, agent_type, -1)
+        for neighbor in self.grid.get_neighborhood(pos, moore=True, include_center=False):
+            self._bump(self.adjacent, neighbor, agent_type, -1)
+
+    def _bump(self, index, pos, agent_type, delta):
+        counts = index.setdefault(pos, {})
+        count = counts.get(agent_type, 0) + delta
+        if count > 0:
+            counts[agent_type] = count
+        else:
+            counts.pop(agent_type, None)
+            if not counts:
+                del index[pos]
+
+    def has_any(self, pos, building_types):
+        counts = self.types.get(pos)
+        return bool(counts) and any(t in counts for t in building_types)
+
+    def near_any(self, pos, building_types):
+        counts = self.adjacent.get(pos)
+        return bool(counts) and any(t in counts for t in building_types)
+
+
+class ResourceRaster:
+    """Per-type (width x height) count arrays of resource, terrain and selected building agents, indexed [x, y]."""
+    def __init__(self, width, height, agent_types):
+        self.counts = {agent_type: np.zeros((width, height), dtype=np.int32) for agent_type in agent_types}
+        self.totals = dict.fromkeys(agent_types, 0) # Per-type sum of counts
+
+    def add(self, agent_type, pos):
+        counts = self.counts.get(agent_type)
+        if counts is not None:
+            counts[pos] += 1
+            self.totals[agent_type] += 1
+
+    def remove(self, agent_type, pos):
+        counts = self.counts.get(agent_type)
+        if counts is not None:
+            counts[pos] -= 1
+            self.totals[agent_type] -= 1
+
+
+class CivilizationGrid(MultiGrid):
+    """MultiGrid that keeps its indexes and rasters in sync with every placement and removal."""
+    def __init__(self, width, height, torus):
+        super().__init__(width, height, torus)
+        self.sites = BuildSiteIndex(self)
+        self.resources = ResourceRaster(width, height, (Food, Tree, Stone, IronOre, Mountain, River, Hospital, Road))
+        self.type_versions = {} # Building or raster type -> placements and removals of that type so far (flow fields)
+
+    def place_agent(self, agent, pos):
+        already_placed = agent.pos is not None
+        super().place_agent(agent, pos)
+        if already_placed:
+            return
+        self.resources.add(type(agent), agent.pos)
+        if isinstance(agent, Building) or type(agent) in self.resources.counts:
+            self.type_versions[type(agent)] = self.type_versions.get(type(agent), 0) + 1
+        if isinstance(agent, Person):
+            agent.model.tribes.placed(agent)
+            agent.model.epidemic.placed(agent)
+        elif isinstance(agent, Building):
+            self.sites.add(type(agent), agent.pos)
+            agent.model.build_planner.touched(agent.pos)
+            agent.placed()
+        elif type(agent) in agent.model.spoilage.lifetimes:
+            agent.model.spoilage.add(agent)
+
+    def remove_agent(self, agent):
+        pos = agent.pos
+        super().remove_agent(agent)
+        self.resources.remove(type(agent), pos)
+        if isinstance(agent, Building) or type(agent) in self.resources.counts:
+            self.type_versions[type(agent)] = self.type_versions.get(type(agent), 0) + 1
+        if isinstance(agent, Person):
+            agent.model.tribes.removed(agent, pos)
+            agent.model.epidemic.removed(agent, pos)
+        elif isinstance(agent, Building):
+            self.sites.remove(type(agent), pos)
+            agent.model.build_planner.touched(pos)
+            agent.removed()
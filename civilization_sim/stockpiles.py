@@ -0,0 +1,115 @@
+from collections.abc import MutableMapping
+import numpy as np
+
+RESOURCES = ("food", "wood", "stone", "iron", "tools", "science", "morale")
+
+
+class Stockpile(MutableMapping):
+    """Dict-like view of one tribe's row: stockpile["food"] += 5 reads and writes the shared array."""
+    __slots__ = ("_table", "_row")
+
+    def __init__(self, table, row):
+        self._table = table
+        self._row = row
+
+    def __getitem__(self, resource):
+        return int(self._table._data[self._row, self._table.fields[resource]])
+
+    def __setitem__(self, resource, amount):
+        self._table._data[self._row, self._table.fields[resource]] = amount
+
+    def __delitem__(self, resource):
+        raise TypeError("Stockpile resources can't be removed")
+
+    def __iter__(self):
+        return iter(self._table.fields)
+
+    def __len__(self):
+        return len(self._table.fields)
+
+    def __repr__(self):
+        return repr(dict(self))
+
+
+class StockpileTable(MutableMapping):
+    """All tribe stockpiles as one (tribes x resources) int64 array behind the dict-of-dicts API."""
+    def __init__(self, resources=RESOURCES):
+        self.fields = {resource: i for i, resource in enumerate(resources)}
+        self._data = np.zeros((8, len(self.fields)), dtype=np.int64)
+        self._rows = {} # tribe_id -> row
+        self._views = {} # tribe_id -> Stockpile
+        self._pending = None # (rows, columns, amounts) while a batch is open
+
+    @property
+    def array(self):
+        # Rows in tribe creation order, see tribe_ids
+        return self._data[:len(self._rows)]
+
+    @property
+    def tribe_ids(self):
+        return list(self._rows)
+
+    def __getitem__(self, tribe_id):
+        return self._views[tribe_id]
+
+    def __setitem__(self, tribe_id, resources):
+        row = self._rows.get(tribe_id)
+        if row is None:
+            row = len(self._rows)
+            if row == len(self._data):
+                grown = np.zeros((2 * len(self._data), len(self.fields)), dtype=np.int64)
+                grown[:row] = self._data
+                self._data = grown
+            self._rows[tribe_id] = row
+            self._views[tribe_id] = Stockpile(self, row)
+        self._data[row] = 0
+        for resource, amount in resources.items():
+            self._data[row, self.fields[resource]] = amount
+
+    def __delitem__(self, tribe_id):
+        raise TypeError("Tribe stockpiles can't be removed")
+
+    def __iter__(self):
+        return iter(self._rows)
+
+    def __len__(self):
+        return len(self._rows)
+
+    def __contains__(self, tribe_id):
+        return tribe_id in self._rows
+
+    def column(self, resource, tribe_ids):
+        # One resource for the given tribes (0 for tribes without a stockpile)
+        rows = np.array([self._rows.get(t, -1) for t in tribe_ids], dtype=int)
+        values = self._data[np.maximum(rows, 0), self.fields[resource]]
+        return np.where(rows >= 0, values, 0)
+
+    def block(self, tribe_ids):
+        # (len(tribe_ids) x resources) copy of the given tribes' rows
+        return self._data[[self._rows[t] for t in tribe_ids]].copy()
+
+    def add_block(self, tribe_ids, amounts):
+        # Add a (len(tribe_ids) x resources) array to the given tribes' rows
+        self._data[[self._rows[t] for t in tribe_ids]] += np.asarray(amounts, dtype=np.int64)
+
+    def begin(self):
+        self._pending = ([], [], [])
+
+    def deposit(self, tribe_id, resource, amount):
+        if self._pending is None:
+            self._data[self._rows[tribe_id], self.fields[resource]] += amount
+            return
+        rows, columns, amounts = self._pending
+        rows.append(self._rows[tribe_id])
+        columns.append(self.fields[resource])
+        amounts.append(amount)
+
+    def commit(self):
+        # Apply every queued deposit in one batched add
+        if self._pending is None:
+            return 0
+        rows, columns, amounts = self._pending
+        self._pending = None
+        if rows:
+            np.add.at(self._data, (rows, columns), amounts)
+        return len(rows)
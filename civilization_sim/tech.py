@@ -0,0 +1,75 @@
+import math
+
+
+class TechTree:
+    """Technology DAG compiled once into prerequisite bitmasks."""
+    def __init__(self, technologies):
+        self.names = list(technologies)
+        self.bits = {name: i for i, name in enumerate(self.names)}
+        self.costs = [technologies[name]["cost"] for name in self.names]
+        self.prereqs = []
+        for name in self.names:
+            req = technologies[name].get("req")
+            reqs = [] if req is None else [req] if isinstance(req, str) else list(req)
+            mask = 0
+            for r in reqs:
+                if r not in self.bits:
+                    raise ValueError(f"Technology {name} requires unknown technology {r}")
+                mask |= 1 << self.bits[r]
+            self.prereqs.append(mask)
+        self._check_acyclic()
+
+    def _check_acyclic(self):
+        # Kahn's algorithm over the prerequisite masks
+        known = 0
+        remaining = set(range(len(self.names)))
+        while remaining:
+            ready = {i for i in remaining if self.prereqs[i] & ~known == 0}
+            if not ready:
+                raise ValueError(f"Technology tree has a cycle: {sorted(self.names[i] for i in remaining)}")
+            for i in ready:
+                known |= 1 << i
+            remaining -= ready
+
+    def mask_of(self, names):
+        mask = 0
+        for name in names:
+            if name in self.bits:
+                mask |= 1 << self.bits[name]
+        return mask
+
+    def frontier(self, known):
+        # Techs not yet known whose prerequisites are all known, in table order
+        return [i for i, prereqs in enumerate(self.prereqs) if not known >> i & 1 and prereqs & ~known == 0]
+
+
+class ResearchTracker:
+    """Per-tribe research frontier with a 'next affordable cost' threshold."""
+    def __init__(self, tree):
+        self.tree = tree
+        self._known = {} # tribe_id -> (bitmask of known techs, number of names in the tech set)
+        self._frontier = {} # tribe_id -> [tech index], table order
+        self.thresholds = {} # tribe_id -> cheapest frontier cost (inf when nothing is left)
+
+    def _sync(self, tribe_id, techs):
+        # Rebuild from the tribe's tech set if it changed outside of learn()
+        known = self._known.get(tribe_id)
+        if known is not None and known[1] == len(techs):
+            return
+        mask = self.tree.mask_of(techs)
+        self._known[tribe_id] = (mask, len(techs))
+        frontier = self.tree.frontier(mask)
+        self._frontier[tribe_id] = frontier
+        self.thresholds[tribe_id] = min((self.tree.costs[i] for i in frontier), default=math.inf)
+
+    def affordable(self, tribe_id, techs, science):
+        self._sync(tribe_id, techs)
+        if science < self.thresholds[tribe_id]:
+            return []
+        costs = self.tree.costs
+        return [self.tree.names[i] for i in self._frontier[tribe_id] if costs[i] <= science]
+
+    def learn(self, tribe_id, techs, name):
+        techs.add(name)
+        self._known.pop(tribe_id, None) # Frontier and threshold are rebuilt on the next check
+        self._sync(tribe_id, techs)
@@ -0,0 +1,75 @@
+class Timer:
+    """Handle for a scheduled callback; cancel() makes the wheel drop it when its slot comes up."""
+    __slots__ = ("due", "callback", "args", "period", "cancelled")
+
+    def __init__(self, due, callback, args, period):
+        self.due = due
+        self.callback = callback
+        self.args = args
+        self.period = period
+        self.cancelled = False
+
+    def cancel(self):
+        self.cancelled = True
+
+
+class TimingWheel:
+    """Hierarchical timing wheel for agent cooldowns and periodic model timers."""
+    def __init__(self, slots=64, levels=3):
+        self.now = 0
+        self.slots = slots
+        self.levels = levels
+        self.wheels = [[[] for _ in range(slots)] for _ in range(levels)]
+        self.overflow = []
+
+    def schedule(self, delay, callback, *args, period=None):
+        # Fire callback(*args) `delay` ticks from now (at least 1), then every `period` ticks if given
+        timer = Timer(self.now + max(1, int(delay)), callback, args, period)
+        self._insert(timer)
+        return timer
+
+    def _insert(self, timer):
+        due = max(timer.due, self.now)
+        for level in range(self.levels):
+            span = self.slots ** (level + 1)
+            if due // span == self.now // span:
+                self.wheels[level][due // self.slots ** level % self.slots].append(timer)
+                return
+        self.overflow.append(timer)
+
+    def _cascade(self, level):
+        bucket_index = self.now // self.slots ** level % self.slots
+        bucket = self.wheels[level][bucket_index]
+        self.wheels[level][bucket_index] = []
+        for timer in bucket:
+            if not timer.cancelled:
+                self._insert(timer)
+
+    def advance(self):
+        """Move to the next tick and fire every timer due at it."""
+        self.now += 1
+        if self.now % self.slots ** self.levels == 0:
+            overflow, self.overflow = self.overflow, []
+            for timer in overflow:
+                if not timer.cancelled:
+                    self._insert(timer)
+        for level in range(self.levels - 1, 0, -1):
+            if self.now % self.slots ** level == 0:
+                self._cascade(level)
+
+        index = self.now % self.slots
+        due, self.wheels[0][index] = self.wheels[0][index], []
+        fired = 0
+        for timer in due:
+            if timer.cancelled:
+                continue
+            timer.callback(*timer.args)
+            fired += 1
+            if timer.period and not timer.cancelled:
+                timer.due += timer.period
+                self._insert(timer)
+        return fired
+
+    def __len__(self):
+        buckets = [bucket for wheel in self.wheels for bucket in wheel] + [self.overflow]
+        return sum(1 for bucket in buckets for timer in bucket if not timer.cancelled)
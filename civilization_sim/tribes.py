@@ -0,0 +1,245 @@
+import heapq
+import itertools
+from collections.abc import Mapping
+
+
+class MemberSet:
+    """Set with O(1) add, discard and random choice. Iteration order is deterministic for a given history."""
+    def __init__(self):
+        self._items = []
+        self._index = {}
+
+    def add(self, item):
+        if item not in self._index:
+            self._index[item] = len(self._items)
+            self._items.append(item)
+
+    def discard(self, item):
+        i = self._index.pop(item, None)
+        if i is None:
+            return
+        last = self._items.pop()
+        if last is not item:
+            self._items[i] = last
+            self._index[last] = i
+
+    def choice(self, rng):
+        return rng.choice(self._items)
+
+    def __iter__(self):
+        return iter(self._items)
+
+    def __len__(self):
+        return len(self._items)
+
+    def __contains__(self, item):
+        return item in self._index
+
+
+class TribeCounts(Mapping):
+    """Live read-only view: tribe_id -> number of living members."""
+    def __init__(self, members):
+        self._members = members
+
+    def __getitem__(self, tribe_id):
+        return len(self._members[tribe_id])
+
+    def __iter__(self):
+        return iter(self._members)
+
+    def __len__(self):
+        return len(self._members)
+
+
+class TribeRegistry:
+    """Incremental per-tribe membership, updated on birth, death and tribe_id changes."""
+    def __init__(self, model, bucket_size=5):
+        self.model = model
+        self.bucket_size = bucket_size
+        self.people = {} # unique_id -> living Person
+        self._everyone = MemberSet() # Living persons, for O(1) random picks
+        self.leaders = {} # tribe_id -> leader unique_id
+        self.vacancies = set() # Tribes whose leader died, left or was never elected
+        self._members = {} # tribe_id -> MemberSet
+        self._priests = {} # tribe_id -> MemberSet
+        self._elders = {} # tribe_id -> heap of (birth step, seq, Person), stale entries skipped or purged
+        self._buckets = {} # tribe_id -> {(bx, by): MemberSet} of placed members
+        self._seq = itertools.count()
+        self.counts = TribeCounts(self._members)
+
+    def register(self, person):
+        self.people[person.unique_id] = person
+        self._everyone.add(person)
+
+    def unregister(self, person):
+        self.people.pop(person.unique_id, None)
+        self._everyone.discard(person)
+        self.discard(person, person.tribe_id)
+
+    def add(self, person, tribe_id):
+        if tribe_id is None:
+            return
+        macro = getattr(self.model, "macro", None)
+        if macro is not None and tribe_id in macro.aggregates:
+            macro.expand(tribe_id) # A collapsed tribe is back on the map before anyone joins it
+        members = self._members.get(tribe_id)
+        if members is None:
+            members = self._members[tribe_id] = MemberSet()
+            self._priests[tribe_id] = MemberSet()
+            self._elders[tribe_id] = []
+            self._buckets[tribe_id] = {}
+        members.add(person)
+        if person.pos is not None:
+            self._bucket_add(person, tribe_id, person.pos)
+        if person.profession == "Priest":
+            self._priests[tribe_id].add(person)
+        # Everyone ages one year per step, so the oldest member is the one born first
+        birth_step = self.model.schedule.steps - person.age
+        heapq.heappush(self._elders[tribe_id], (birth_step, next(self._seq), person))
+        if tribe_id not in self.leaders:
+            self.vacancies.add(tribe_id)
+
+    def discard(self, person, tribe_id):
+        members = self._members.get(tribe_id)
+        if members is None or person not in members:
+            return
+        members.discard(person)
+        self._priests[tribe_id].discard(person)
+        if person.pos is not None:
+            self._bucket_discard(person, tribe_id, person.pos)
+        if self.leaders.get(tribe_id) == person.unique_id:
+            self.vacancies.add(tribe_id)
+        if members and len(self._elders[tribe_id]) > 2 * len(members):
+            self._purge_elders(tribe_id)
+        if not members:
+            del self._members[tribe_id]
+            del self._priests[tribe_id]
+            del self._elders[tribe_id]
+            del self._buckets[tribe_id]
+            self.leaders.pop(tribe_id, None)
+            self.vacancies.discard(tribe_id)
+
+    def move(self, person, old_tribe_id, new_tribe_id):
+        if old_tribe_id != new_tribe_id:
+            self.discard(person, old_tribe_id)
+            self.add(person, new_tribe_id)
+
+    def placed(self, person):
+        # Called by the grid after a person is placed (or moved) onto person.pos
+        if person in self._members.get(person.tribe_id, ()):
+            self._bucket_add(person, person.tribe_id, person.pos)
+
+    def removed(self, person, pos):
+        # Called by the grid after a person is taken off pos
+        if person in self._members.get(person.tribe_id, ()):
+            self._bucket_discard(person, person.tribe_id, pos)
+
+    def _bucket(self, pos):
+        return pos[0] // self.bucket_size, pos[1] // self.bucket_size
+
+    def _bucket_add(self, person, tribe_id, pos):
+        key = self._bucket(pos)
+        buckets = self._buckets[tribe_id]
+        bucket = buckets.get(key)
+        if bucket is None:
+            bucket = buckets[key] = MemberSet()
+        bucket.add(person)
+
+    def _bucket_discard(self, person, tribe_id, pos):
+        key = self._bucket(pos)
+        buckets = self._buckets[tribe_id]
+        bucket = buckets.get(key)
+        if bucket is not None:
+            bucket.discard(person)
+            if not bucket:
+                del buckets[key]
+
+    def nearest(self, tribe_id, pos, k):
+        """The k placed members of a tribe closest to pos (Manhattan distance), closest first."""
+        buckets = self._buckets.get(tribe_id)
+        if not buckets or k <= 0:
+            return []
+        size = self.bucket_size
+        bx, by = self._bucket(pos)
+        max_ring = max(max(abs(x - bx), abs(y - by)) for x, y in buckets)
+        best = [] # Max-heap of (-distance, -seq, Person), ties keep the member found first
+        seq = itertools.count()
+        for ring in range(max_ring + 1):
+            # Every cell in this ring is at least (ring - 1) * size + 1 steps away
+            if len(best) == k and -best[0][0] < (ring - 1) * size + 1:
+                break
+            for dx in range(-ring, ring + 1):
+                step = 1 if abs(dx) == ring else 2 * ring
+                for dy in range(-ring, ring + 1, max(step, 1)):
+                    bucket = buckets.get((bx + dx, by + dy))
+                    if bucket is None:
+                        continue
+                    for person in bucket:
+                        distance = abs(person.pos[0] - pos[0]) + abs(person.pos[1] - pos[1])
+                        entry = (-distance, -next(seq), person)
+                        if len(best) < k:
+                            heapq.heappush(best, entry)
+                        elif distance < -best[0][0]:
+                            heapq.heapreplace(best, entry)
+        return [person for _, _, person in sorted(best, key=lambda e: (-e[0], -e[1]))]
+
+    def change_profession(self, person, tribe_id, profession):
+        priests = self._priests.get(tribe_id)
+        if priests is None or person not in self._members[tribe_id]:
+            return
+        if profession == "Priest":
+            priests.add(person)
+        else:
+            priests.discard(person)
+
+    def members(self, tribe_id):
+        # Read-only, copy it before changing members' tribe_id while iterating
+        return self._members.get(tribe_id, ())
+
+    def items(self):
+        return self._members.items()
+
+    def leader(self, tribe_id):
+        return self.people.get(self.leaders.get(tribe_id))
+
+    def take_vacancies(self):
+        vacancies = sorted(self.vacancies)
+        self.vacancies.clear()
+        return vacancies
+
+    def _purge_elders(self, tribe_id):
+        # Drop entries of members who died or left once they outnumber the living ones
+        members = self._members[tribe_id]
+        seen = set()
+        heap = []
+        for entry in self._elders[tribe_id]:
+            person = entry[2]
+            if person in members and person not in seen:
+                seen.add(person)
+                heap.append(entry)
+        heapq.heapify(heap)
+        self._elders[tribe_id] = heap
+
+    def oldest(self, tribe_id):
+        heap = self._elders.get(tribe_id)
+        members = self._members.get(tribe_id, ())
+        while heap:
+            person = heap[0][2]
+            if person in members:
+                return person
+            heapq.heappop(heap)
+        return None
+
+    def random_member(self, tribe_id, rng):
+        members = self._members.get(tribe_id)
+        return members.choice(rng) if members else None
+
+    def random_person(self, rng):
+        return self._everyone.choice(rng) if self._everyone else None
+
+    def random_priest(self, tribe_id, rng):
+        priests = self._priests.get(tribe_id)
+        return priests.choice(rng) if priests else None
+
+    def __contains__(self, tribe_id):
+        return tribe_id in self._members
@@ -0,0 +1,13 @@
+import pytest
+from civilization_sim.model import CivilizationModel
+
+# One tribe and nothing else: no people, predators or scattered resources (terrain is still generated)
+EMPTY_WORLD = dict(initial_people=0, num_tribes=1, initial_food=0, initial_trees=0, initial_predators=0, initial_stone=0, initial_iron=0)
+
+
+@pytest.fixture
+def make_model():
+    """Factory for an empty-world CivilizationModel; keyword arguments override EMPTY_WORLD."""
+    def make(**kwargs):
+        return CivilizationModel(**{**EMPTY_WORLD, **kwargs})
+    return make
@@ -0,0 +1,33 @@
+from civilization_sim.new_agents.people import Person, Predator
+
+def count(model, agent_type):
+    return len(model.agents_by_type.get(agent_type, ()))
+
+def test_births_wait_for_the_end_of_the_agent_phase(make_model):
+    model = make_model(initial_people=2, initial_predators=1)
+    person = [a for a in model.schedule.agents if isinstance(a, Person)][0]
+    predator = [a for a in model.schedule.agents if isinstance(a, Predator)][0]
+    person.energy = 50
+    predator.energy = 90
+
+    model.agent_phase = True
+    person.reproduce()
+    predator.reproduce()
+    assert person.energy == 25 and predator.energy == 60 # Paid up front
+    assert count(model, Person) == 2 and count(model, Predator) == 1
+    model.agent_phase = False
+
+    assert model.births.flush() == 2
+    child = [a for a in model.agents_by_type[Person] if a is not person and a.energy == 25 and a.pos == person.pos]
+    assert child and child[0].tribe_id == person.tribe_id
+    cub = [a for a in model.agents_by_type[Predator] if a is not predator][0]
+    assert cub.pos == predator.pos and cub.pack_id == predator.pack_id and cub.energy == 30
+    assert model.births.flush() == 0
+
+def test_birth_outside_agent_phase_is_immediate(make_model):
+    model = make_model(initial_people=2, initial_predators=1)
+    person = [a for a in model.schedule.agents if isinstance(a, Person)][0]
+    person.energy = 50
+    person.reproduce()
+    assert count(model, Person) == 3
+    assert model.tribe_counts[person.tribe_id] == 3
@@ -0,0 +1,53 @@
+from civilization_sim.cataclysms import CataclysmEngine, BURNING, BURNT, UNBURNT
+from civilization_sim.new_agents.resources import Tree, River
+from civilization_sim.new_agents.buildings import House, Farm
+
+def place(model, agent_type, pos):
+    agent = agent_type(model)
+    model.schedule.add(agent)
+    model.grid.place_agent(agent, pos)
+    return agent
+
+def clear_trees(model):
+    for tree in [a for a in model.schedule.agents if isinstance(a, Tree)]:
+        model.remove_agent(tree)
+
+def test_cataclysms_are_off_by_default(make_model):
+    assert not make_model(seed=3).cataclysms_enabled
+    assert make_model(seed=3, cataclysms=True).cataclysms_enabled
+
+def test_wildfire_spreads_along_a_forest_and_burns_out(make_model):
+    model = make_model(seed=3)
+    clear_trees(model)
+    for x in range(3, 8):
+        place(model, Tree, (x, 10))
+    engine = CataclysmEngine(model, fire_chance=0.0, fire_spread=1.0, burnout_steps=3)
+    engine.fire[3, 10] = BURNING
+
+    for _ in range(4):
+        engine.step_fire()
+    assert model.grid.resources.counts[Tree][4:8, 10].sum() == 0
+    assert engine.fire[3, 10] == UNBURNT # Burnt out and cooled down
+    assert engine.fire[6, 10] == BURNT
+    assert engine.fire[7, 10] == BURNING
+
+def test_flood_spreads_over_the_floodplain_and_destroys_buildings(make_model):
+    model = make_model(seed=3)
+    river_cells = {a.pos for a in model.schedule.agents if isinstance(a, River)}
+    origin = min(river_cells, key=lambda pos: pos[1])
+    x, y = origin
+    house = place(model, House, ((x + 1) % model.grid.width, y))
+    far_farm = place(model, Farm, ((x + 8) % model.grid.width, (y + 8) % model.grid.height))
+    engine = CataclysmEngine(model, fire_chance=0.0, flood_chance=0.0, flood_reach=2)
+    engine.water[origin] = engine.flood_duration
+    engine.surge[origin] = engine.flood_reach + 1
+
+    engine.step_flood()
+    assert house.pos is None
+    assert engine.water[(x + 1) % model.grid.width, y] > 0
+
+    # Far from the river the farm survives, and the water recedes
+    for _ in range(10):
+        engine.step_flood()
+    assert far_farm.pos is not None
+    assert engine.water.sum() == 0
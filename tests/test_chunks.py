@@ -0,0 +1,79 @@
+import numpy as np
+from civilization_sim.chunks import ActiveChunks
+from civilization_sim.ecology import RegrowthEngine
+from civilization_sim.new_agents.people import Person
+from civilization_sim.new_agents.resources import Food, Mountain, River
+from civilization_sim.new_agents.buildings import Farm
+
+def place(model, agent, pos):
+    model.schedule.add(agent)
+    model.grid.place_agent(agent, pos)
+    return agent
+
+def clear_terrain(model):
+    for agent in list(model.agents_by_type.get(Mountain, ())) + list(model.agents_by_type.get(River, ())):
+        model.remove_agent(agent)
+
+def active_mask(model, cells):
+    mask = np.zeros((model.grid.width, model.grid.height), dtype=bool)
+    mask.ravel()[cells] = True
+    return mask
+
+def test_chunks_around_agents_and_growing_farms_are_active(make_model):
+    model = make_model(width=40, height=40, active_chunks=True, seed=2)
+    chunks = ActiveChunks(model, size=8, margin=1)
+    chunks.update()
+    assert len(chunks.cells) == 0
+
+    place(model, Person(model, tribe_id=0), (1, 20))
+    chunks.update()
+    # The person's chunk plus one chunk of margin, wrapping around the torus
+    assert chunks.active_count == 9
+    assert chunks.chunks[0, 2] and chunks.chunks[4, 2] and chunks.chunks[1, 3]
+    assert not chunks.chunks[2, 2]
+    mask = active_mask(model, chunks.cells)
+    assert mask[39, 20] and not mask[20, 20]
+    assert len(chunks.cells) == len(set(chunks.cells.tolist())) == 9 * 8 * 8
+
+    clear_terrain(model)
+    farm = place(model, Farm(model, tribe_id=0), (20, 20))
+    chunks.update()
+    assert active_mask(model, chunks.cells)[20, 20] == (farm not in model.harvests.paused)
+
+def test_chunks_overhanging_the_grid_are_clipped(make_model):
+    model = make_model(width=20, height=20, active_chunks=True, seed=2)
+    chunks = ActiveChunks(model, size=8, margin=0)
+    place(model, Person(model, tribe_id=0), (18, 1))
+    cells = chunks.update()
+    mask = active_mask(model, cells)
+    assert len(cells) == 4 * 8 and mask[16:, :8].all() and mask.sum() == len(cells)
+
+def test_regrowth_only_runs_in_active_cells(make_model):
+    model = make_model(width=40, height=40, active_chunks=True, seed=2)
+    engine = RegrowthEngine(model, rules={Food: {"seed": (1.0,) * 4, "rate": (0.0,) * 4, "capacity": (1,) * 4, "global": 1.0}})
+    mask = np.zeros((40, 40), dtype=bool)
+    mask[:8, :8] = True
+    mask &= model.regrowth.biomes() != 3 # Mountains can't grow food
+    model.schedule.steps = 1
+    engine.step(np.flatnonzero(mask))
+    food = model.grid.resources.counts[Food] > 0
+    assert (food == mask).all()
+
+def test_woken_cells_catch_up_on_missed_steps(make_model):
+    model = make_model(width=40, height=40, active_chunks=True, seed=2)
+    engine = RegrowthEngine(model, rules={Food: {"seed": (0.01,) * 4, "rate": (0.0,) * 4, "capacity": (1,) * 4, "global": 1.0}})
+    mask = np.zeros((40, 40), dtype=bool)
+    mask[:8, :8] = True
+    mask &= model.regrowth.biomes() != 3
+    cells = np.flatnonzero(mask)
+
+    model.schedule.steps = 2000 # Asleep since the start: 1 - 0.99^2000 is all but certain
+    engine.step(cells)
+    assert (model.grid.resources.counts[Food][mask] == 1).all()
+    assert (engine.updated[mask] == 2000).all() and (engine.updated[~mask] == 0).all()
+
+def test_model_steps_with_active_chunks(make_model):
+    model = make_model(width=40, height=40, active_chunks=True, seed=2, initial_people=5)
+    for _ in range(5):
+        model.step()
+    assert (model.regrowth.updated.ravel()[model.chunks.cells] == model.schedule.steps).all()
@@ -0,0 +1,83 @@
+import numpy as np
+from civilization_sim.climate import Season
+from civilization_sim.new_agents.resources import Food, Mountain, River
+from civilization_sim.space import moore_any
+from civilization_sim.new_agents.buildings import Farm
+
+def test_season_cycles_and_prints_ukrainian_names(make_model):
+    model = make_model(seed=1)
+    assert model.season == Season.SPRING
+    assert f"{model.season}" == "Весна"
+    for expected in (Season.SUMMER, Season.AUTUMN, Season.WINTER, Season.SPRING):
+        model.change_season()
+        assert model.season == expected
+    assert str(Season.WINTER) == "Зима"
+
+def test_winter_and_drought_lower_fertility(make_model):
+    model = make_model(seed=1)
+    climate = model.climate
+    spring = climate.fertility.copy()
+    version = climate.version
+
+    assert not climate.sync() # Nothing changed
+    model.season = Season.WINTER
+    assert climate.sync()
+    assert climate.version == version + 1
+    assert (climate.fertility <= spring).all()
+    assert climate.fertility.max() < spring.max()
+
+    model.season = Season.SPRING
+    model.drought_active = True
+    climate.sync()
+    river = model.grid.resources.counts[River] > 0
+    dry = climate.base_moisture == 0.5
+    # Rivers keep the soil farmable through a drought, open land dries out
+    assert not (climate.fertility[dry] >= climate.farm_threshold).any()
+    assert (climate.fertility[river] >= climate.farm_threshold).all()
+
+def test_river_farm_keeps_producing_in_drought(make_model):
+    model = make_model(seed=1)
+    counts = model.grid.resources.counts
+    river = counts[River] > 0
+    banks = np.argwhere(moore_any(river) & ~river & (counts[Mountain] == 0))
+    pos = tuple(int(v) for v in banks[0])
+    farm = Farm(model, tribe_id=0)
+    model.schedule.add(farm)
+    model.grid.place_agent(farm, pos)
+    assert farm.growth_bonus == 1
+
+    model.drought_active = True
+    model.harvests.refresh(0)
+    assert farm not in model.harvests.paused
+    for _ in range(farm.harvest_threshold):
+        model.season = Season.SPRING
+        model.drought_active = True
+        model.step()
+    assert any(isinstance(a, Food) for a in model.grid.get_cell_list_contents([pos]))
+
+def test_winter_pauses_farms(make_model):
+    model = make_model(seed=1)
+    farm = Farm(model, tribe_id=0)
+    model.schedule.add(farm)
+    model.grid.place_agent(farm, (0, 0)) # Edge row: coldest latitude
+    assert farm.harvest_event is not None
+
+    model.season = Season.WINTER
+    model.harvests.refresh(5)
+    assert farm in model.harvests.paused
+    assert farm.harvest_event is None
+
+    model.season = Season.SPRING
+    model.harvests.refresh(8)
+    assert farm not in model.harvests.paused
+    assert farm.harvest_event is not None
+
+def test_food_does_not_regrow_in_frozen_cells(make_model):
+    model = make_model(seed=1)
+    model.season = Season.WINTER
+    model.climate.sync()
+    frozen = model.climate.fertility == 0
+    assert frozen.any()
+    for _ in range(20):
+        model.regrowth.step()
+    assert model.grid.resources.counts[Food][frozen].sum() == 0
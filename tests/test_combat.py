@@ -0,0 +1,107 @@
+from civilization_sim.combat import offsets
+from civilization_sim.new_agents.people import Person, Predator, Barbarian
+
+def without_bonuses(model):
+    # No damage bonuses
+    for tribe_id in range(model.num_tribes):
+        model.tribe_traits[tribe_id] = "Agrarian"
+        model.tribe_religion[tribe_id] = "Sun God"
+    return model
+
+def place(model, agent, pos):
+    model.schedule.add(agent)
+    model.grid.place_agent(agent, pos)
+    return agent
+
+def fighter(model, tribe_id, profession, pos):
+    person = place(model, Person(model, tribe_id=tribe_id), pos)
+    person.profession = profession
+    person.energy = 50
+    return person
+
+def test_offsets_closest_first():
+    cells = offsets(1)
+    assert cells[0] == (0, 0)
+    assert len(cells) == 9
+    assert len(offsets(3)) == 49
+
+def test_attacks_are_summed_and_deaths_applied_after_agent_phase(make_model):
+    model = without_bonuses(make_model(num_tribes=2))
+    model.wars.add((0, 1))
+    a = fighter(model, 0, "Soldier", (5, 5))
+    b = fighter(model, 0, "Soldier", (6, 6))
+    enemy = fighter(model, 1, "Farmer", (5, 6))
+
+    model.agent_phase = True
+    a.attack_enemy()
+    b.attack_enemy()
+    assert enemy.energy == 50 # Nothing happens until the batch runs
+    model.agent_phase = False
+    model.combat.resolve()
+    assert enemy.energy == 10
+    assert a.energy == 45 and b.energy == 45
+
+    model.tribe_traits[0] = "Militaristic"
+    a.attack_enemy() # Outside the agent phase it resolves immediately
+    assert not enemy.alive
+    assert enemy.pos is None
+
+def test_no_attack_without_war_or_out_of_range(make_model):
+    model = without_bonuses(make_model(num_tribes=2))
+    soldier = fighter(model, 0, "Soldier", (5, 5))
+    archer = fighter(model, 0, "Archer", (5, 4))
+    enemy = fighter(model, 1, "Farmer", (5, 7))
+
+    soldier.attack_enemy()
+    assert enemy.energy == 50
+
+    model.wars.add((0, 1))
+    soldier.attack_enemy() # Two cells away
+    assert enemy.energy == 50 and soldier.energy == 50
+    archer.attack_enemy() # Three cells away, in archer range
+    assert enemy.energy == 35 and archer.energy == 45
+
+def test_archer_hits_closest_enemy_at_war(make_model):
+    model = without_bonuses(make_model(num_tribes=3))
+    model.wars.add((0, 2))
+    archer = fighter(model, 0, "Archer", (5, 5))
+    fighter(model, 0, "Farmer", (5, 6)) # Own tribe
+    neutral = fighter(model, 1, "Farmer", (6, 5)) # Not at war
+    far = fighter(model, 2, "Farmer", (8, 8))
+    near = fighter(model, 2, "Farmer", (7, 5))
+
+    archer.attack_enemy()
+    assert near.energy == 35 and far.energy == 50 and neutral.energy == 50
+
+def test_tribes_at_war_attack_in_one_batch(make_model):
+    model = without_bonuses(make_model(num_tribes=2))
+    model.wars.add((0, 1))
+    red = [fighter(model, 0, "Soldier", (x, 5)) for x in (2, 8)]
+    blue = [fighter(model, 1, "Soldier", (x, 6)) for x in (2, 8)]
+
+    model.agent_phase = True
+    for person in red + blue:
+        person.attack_enemy()
+    model.agent_phase = False
+    model.combat.resolve()
+    assert [p.energy for p in red + blue] == [25] * 4 # Each hit once by the enemy next to it, minus exertion
+    assert not model.combat.raster.any()
+
+def test_guards_fight_barbarians_and_predators(make_model):
+    model = without_bonuses(make_model(num_tribes=2))
+    guard = fighter(model, 0, "Guard", (5, 5))
+    soldier = fighter(model, 0, "Soldier", (5, 5))
+    barbarian = place(model, Barbarian(model), (6, 5))
+    predator = place(model, Predator(model), (4, 4))
+
+    model.agent_phase = True
+    guard.attack_barbarian()
+    soldier.attack_barbarian()
+    guard.attack_predator()
+    model.agent_phase = False
+    model.combat.resolve()
+
+    assert barbarian.energy == 50 - 10 - 20
+    assert predator.pos is None
+    assert guard.energy == 50 - 5 - 10
+    assert soldier.energy == 45
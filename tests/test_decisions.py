@@ -0,0 +1,78 @@
+import pytest
+from civilization_sim.model import CivilizationModel, compute_decision_cache_hit_rate
+from civilization_sim.new_agents.people import Person
+from civilization_sim.new_agents.resources import Tree, Food
+
+def uncached_action(person, cell_mates, neighbors):
+    best_action, best_score = None, -1
+    for action in person.get_possible_actions(cell_mates, neighbors):
+        score = person.calculate_utility(action)
+        if score > best_score:
+            best_score, best_action = score, action
+    return best_action["type"] if best_action else None
+
+def test_decision_reused_while_context_unchanged():
+    model = CivilizationModel(initial_people=1, num_tribes=1, initial_food=0, initial_trees=0, initial_predators=0, initial_stone=0, initial_iron=0)
+    person = [a for a in model.schedule.agents if isinstance(a, Person)][0]
+    person.profession = "Farmer"
+    model.grid.move_agent(person, (5, 5))
+
+    food = Food(model)
+    model.schedule.add(food)
+    model.grid.place_agent(food, (5, 5))
+
+    cell_mates = model.grid.get_cell_list_contents([(5, 5)])
+    neighbors = person.get_combat_neighbors()
+    assert person.choose_action(cell_mates, neighbors) == "gather_food"
+    assert person.choose_action(cell_mates, neighbors) == "gather_food"
+
+    assert model.decision_cache_stats == {"hits": 1, "misses": 1}
+    assert compute_decision_cache_hit_rate(model) == 0.5
+
+def test_stockpile_band_change_invalidates_decision():
+    model = CivilizationModel(initial_people=1, num_tribes=1, initial_food=0, initial_trees=0, initial_predators=0, initial_stone=0, initial_iron=0)
+    person = [a for a in model.schedule.agents if isinstance(a, Person)][0]
+    person.profession = "Scholar"
+    model.grid.move_agent(person, (5, 5))
+    stockpile = model.tribe_stockpiles[person.tribe_id]
+    stockpile["food"] = 100
+
+    tree = Tree(model)
+    model.schedule.add(tree)
+    model.grid.place_agent(tree, (5, 5))
+    food = Food(model)
+    model.schedule.add(food)
+    model.grid.place_agent(food, (5, 5))
+
+    cell_mates = model.grid.get_cell_list_contents([(5, 5)])
+    neighbors = person.get_combat_neighbors()
+    # Wood is critical, food is plentiful
+    assert person.choose_action(cell_mates, neighbors) == "gather_wood"
+
+    # Food drops into the critical band, wood is comfortable
+    stockpile["food"] = 10
+    stockpile["wood"] = 40
+    assert person.choose_action(cell_mates, neighbors) == "gather_food"
+    assert model.decision_cache_stats["misses"] == 2
+
+def test_cached_decisions_match_full_evaluation():
+    model = CivilizationModel(width=10, height=10, initial_people=30, num_tribes=3, seed=7)
+    people = [a for a in model.schedule.agents if isinstance(a, Person)]
+
+    for _ in range(5):
+        model.step()
+        for person in people:
+            if person.pos is None:
+                continue
+            cell_mates = model.grid.get_cell_list_contents([person.pos])
+            neighbors = person.get_combat_neighbors()
+            expected = uncached_action(person, cell_mates, neighbors)
+            assert person.choose_action(cell_mates, neighbors) == expected
+
+def test_hit_rate_is_collected_every_step():
+    model = CivilizationModel(width=10, height=10, initial_people=10, num_tribes=2, seed=3)
+    for _ in range(3):
+        model.step()
+    rates = model.datacollector.get_model_vars_dataframe()["Влучання кешу рішень"]
+    assert len(rates) == 4
+    assert rates.iloc[-1] == compute_decision_cache_hit_rate(model)
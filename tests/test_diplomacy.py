@@ -0,0 +1,61 @@
+import numpy as np
+from civilization_sim.diplomacy import DiplomacyMatrix, NEUTRAL, ALLIANCE, WAR
+
+class AlwaysRoll:
+    """Stand-in rng whose draws always succeed."""
+    def random(self, shape):
+        return np.zeros(shape)
+
+def test_war_set_view():
+    diplomacy = DiplomacyMatrix(3)
+    diplomacy.wars.add((0, 2))
+    assert (0, 2) in diplomacy.wars
+    assert diplomacy.relation(2, 0) == "War"
+    assert list(diplomacy.wars) == [(0, 2)]
+
+    diplomacy.wars.remove((0, 2))
+    assert len(diplomacy.wars) == 0
+    assert (0, None) not in diplomacy.wars
+
+def test_matrix_grows_with_new_tribes():
+    diplomacy = DiplomacyMatrix(2)
+    diplomacy.set(0, 1, ALLIANCE)
+    diplomacy.add_tribe(20)
+    assert diplomacy.size == 21
+    assert diplomacy.get(1, 0) == ALLIANCE
+    assert diplomacy.get(20, 0) == NEUTRAL
+
+def test_scarcity_declares_war_and_plenty_makes_peace():
+    diplomacy = DiplomacyMatrix(2)
+    governments = np.array(["Republic", "Republic"])
+    religions = np.array(["Sun God", "Sea God"])
+
+    _, wars, _ = diplomacy.update(np.array([10.0, 250.0]), governments, religions, AlwaysRoll())
+    assert wars.tolist() == [[0, 1]]
+    assert diplomacy.get(0, 1) == WAR
+
+    _, _, peace = diplomacy.update(np.array([150.0, 150.0]), governments, religions, AlwaysRoll())
+    assert peace.tolist() == [[0, 1]]
+    assert diplomacy.get(1, 0) == NEUTRAL
+
+def test_same_religion_republics_ally():
+    diplomacy = DiplomacyMatrix(2)
+    alliances, wars, _ = diplomacy.update(np.array([100.0, 100.0]), np.array(["Republic", "Republic"]), np.array(["Sun God", "Sun God"]), AlwaysRoll())
+    assert alliances.tolist() == [[0, 1]]
+    assert len(wars) == 0
+    assert diplomacy.relation(0, 1) == "Alliance"
+
+def test_new_tribe_joins_diplomacy(make_model):
+    model = make_model(initial_people=3, num_tribes=3)
+    people = [a for a in model.schedule.agents if getattr(a, "tribe_id", None) is not None]
+    model.form_new_tribe(people[0], people[1])
+    assert model.diplomacy.size == 4
+    model.update_politics()
+    assert all(0 <= a < b < 4 for a, b in model.wars)
+
+def test_war_snapshot_is_detached():
+    diplomacy = DiplomacyMatrix(2)
+    snapshot = diplomacy.wars.copy()
+    diplomacy.wars.add((0, 1))
+    assert snapshot == set()
+    assert diplomacy.wars.copy() - snapshot == {(0, 1)}
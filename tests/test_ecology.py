@@ -0,0 +1,74 @@
+import numpy as np
+from civilization_sim.ecology import RegrowthEngine, SpoilageQueue, MOUNTAIN, FOOTHILLS, RIVERBANK, GRASSLAND
+from civilization_sim.new_agents.resources import Food, Tree, Stone, IronOre, Mountain, River
+
+def test_raster_tracks_placement_and_removal(make_model):
+    model = make_model(seed=1)
+    food = Food(model)
+    model.schedule.add(food)
+    model.grid.place_agent(food, (3, 4))
+    assert model.grid.resources.counts[Food][3, 4] == 1
+    assert model.grid.resources.totals[Food] == 1
+    model.remove_agent(food)
+    assert model.grid.resources.counts[Food].sum() == 0
+    assert model.grid.resources.totals[Food] == 0
+
+def test_biomes_follow_terrain(make_model):
+    model = make_model(seed=1)
+    biome = model.regrowth.biomes()
+    counts = model.grid.resources.counts
+    assert (biome[counts[Mountain] > 0] == MOUNTAIN).all()
+    assert (biome[(counts[River] > 0) & (counts[Mountain] == 0)] == RIVERBANK).all()
+    assert set(np.unique(biome)) <= {GRASSLAND, RIVERBANK, FOOTHILLS, MOUNTAIN}
+
+    assert model.regrowth.biomes() is biome # Cached while the terrain stays put
+    mountain = next(iter(model.agents_by_type[Mountain]))
+    pos = mountain.pos
+    model.remove_agent(mountain)
+    assert model.regrowth.biomes()[pos] != MOUNTAIN or counts[Mountain][pos] > 0
+
+def test_regrowth_respects_cell_capacity(make_model):
+    model = make_model(seed=1)
+    engine = RegrowthEngine(model, rules={Food: {"seed": (1.0, 1.0, 1.0, 1.0), "rate": (0.0,) * 4, "capacity": (2, 2, 2, 2), "global": 10.0}})
+    for _ in range(5):
+        engine.step()
+    assert model.grid.resources.counts[Food].max() == 2
+
+def test_regrowth_respects_global_capacity(make_model):
+    model = make_model(seed=1)
+    engine = RegrowthEngine(model, rules={Tree: {"seed": (1.0, 1.0, 1.0, 1.0), "rate": (0.0,) * 4, "capacity": (5, 5, 5, 5), "global": 0.25}})
+    for _ in range(10):
+        engine.step()
+    assert model.grid.resources.counts[Tree].sum() <= 0.25 * model.grid.width * model.grid.height
+
+def test_resource_count_stays_bounded(make_model):
+    model = make_model(seed=1, width=10, height=10)
+    totals = []
+    for _ in range(300):
+        model.regrowth.step()
+        totals.append(sum(int(model.grid.resources.counts[t].sum()) for t in (Food, Tree, Stone, IronOre)))
+    assert max(totals) <= 100 * (0.5 + 0.4 + 0.2 + 0.02)
+    assert totals[-1] == len([a for a in model.schedule.agents if isinstance(a, (Food, Tree, Stone, IronOre))])
+
+def test_food_spoils_after_its_lifetime(make_model):
+    model = make_model(seed=1)
+    model.spoilage = SpoilageQueue(model, lifetimes={Food: (5, 0)})
+    foods = []
+    for pos in ((1, 1), (2, 2), (3, 3)):
+        food = Food(model)
+        model.schedule.add(food)
+        model.grid.place_agent(food, pos)
+        foods.append(food)
+    tree = Tree(model)
+    model.schedule.add(tree)
+    model.grid.place_agent(tree, (4, 4))
+    assert len(model.spoilage) == 3 and all(food.placed_at == 0 for food in foods)
+
+    model.remove_agent(foods[0]) # Eaten before it spoils
+    model.schedule.steps = 4
+    assert model.spoilage.step() == 0
+    model.schedule.steps = 5
+    assert model.spoilage.step() == 2
+    assert model.grid.resources.counts[Food].sum() == 0
+    assert tree.pos == (4, 4)
+    assert not model.spoilage.buckets
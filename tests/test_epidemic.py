@@ -0,0 +1,70 @@
+import numpy as np
+from civilization_sim.space import moore_sum
+from civilization_sim.new_agents.people import Person
+from civilization_sim.new_agents.buildings import Hospital
+
+class FixedDraw:
+    """Stand-in rng returning the same draw for everyone."""
+    def __init__(self, value):
+        self.value = value
+
+    def random(self, size):
+        return np.full(size, self.value)
+
+def test_moore_sum_wraps_around():
+    raster = np.zeros((4, 4), dtype=int)
+    raster[0, 0] = 1
+    total = moore_sum(raster)
+    assert total[0, 0] == 0
+    assert total[3, 3] == 1 and total[1, 1] == 1
+    assert total.sum() == 8
+
+def test_infected_set_tracks_persons(make_model):
+    model = make_model(initial_people=3)
+    person = [a for a in model.schedule.agents if isinstance(a, Person)][0]
+    person.infected = True
+    assert person in model.epidemic.infected
+    model.remove_agent(person)
+    assert not model.epidemic.infected
+
+def test_cell_counts_follow_moves_infection_and_removal(make_model):
+    model = make_model(initial_people=3)
+    epidemic = model.epidemic
+    sick, other, _ = [a for a in model.schedule.agents if isinstance(a, Person)]
+    assert epidemic.occupants.sum() == 3 and epidemic.sick.sum() == 0
+    model.grid.move_agent(sick, (5, 5))
+    model.grid.move_agent(other, (5, 5))
+    sick.infected = True
+    sick.infected = True # Setting it twice counts once
+    assert epidemic.occupants[5, 5] == 2 and epidemic.sick[5, 5] == 1
+
+    model.grid.move_agent(sick, (7, 7))
+    assert epidemic.sick[5, 5] == 0 and epidemic.sick[7, 7] == 1
+    model.remove_agent(sick)
+    assert epidemic.sick.sum() == 0 and epidemic.occupants.sum() == 2
+
+def test_spread_reaches_neighbors_only(make_model):
+    model = make_model(initial_people=3)
+    sick, near, far = [a for a in model.schedule.agents if isinstance(a, Person)]
+    model.grid.move_agent(sick, (5, 5))
+    model.grid.move_agent(near, (6, 6))
+    model.grid.move_agent(far, (10, 10))
+    sick.infected = True
+
+    model.rng = FixedDraw(0.09) # Below the 10% contact chance, above base recovery
+    assert model.epidemic.step() == (1, 0)
+    assert near.infected and not far.infected and sick.infected
+
+def test_hospital_and_medicine_help_recovery(make_model):
+    model = make_model(initial_people=1)
+    person = [a for a in model.schedule.agents if isinstance(a, Person)][0]
+    person.infected = True
+    model.rng = FixedDraw(0.3)
+    assert model.epidemic.step() == (0, 0)
+
+    hospital = Hospital(model, tribe_id=person.tribe_id)
+    model.schedule.add(hospital)
+    model.grid.place_agent(hospital, person.pos)
+    model.tribe_technologies[person.tribe_id].add("Medicine")
+    assert model.epidemic.step() == (0, 1)
+    assert not person.infected
@@ -1,4 +1,5 @@
 import pytest
+import numpy as np
 from civilization_sim.model import CivilizationModel
 from civilization_sim.new_agents.people import Person
 from civilization_sim.new_agents.resources import Food
@@ -53,3 +54,40 @@ def test_farm_production():
     cell_mates = model.grid.get_cell_list_contents([(5, 5)])
     food = [a for a in cell_mates if isinstance(a, Food)]
     assert len(food) == 1
+
+def test_farm_harvest_is_scheduled():
+    """Test that farms keep one pending harvest event instead of ticking every step."""
+    model = CivilizationModel(initial_people=0, num_tribes=0, initial_food=0, initial_trees=0, initial_predators=0, initial_stone=0)
+    farm = Farm(model, tribe_id=0)
+    model.schedule.add(farm)
+    model.grid.place_agent(farm, (5, 5))
+
+    assert farm.harvest_event is not None
+    assert farm.harvest_event.time == 10 // farm.growth_per_step - 1
+
+    model.grid.remove_agent(farm)
+    assert farm not in model.harvests.farms
+    assert farm.harvest_event is None
+
+def test_drought_pauses_farm_growth():
+    """Test that progress is banked during a drought and growth resumes afterwards."""
+    model = CivilizationModel(initial_people=0, num_tribes=0, initial_food=0, initial_trees=0, initial_predators=0, initial_stone=0)
+    # Away from rivers, where a drought makes the soil too dry to farm
+    dry = np.argwhere(model.climate.base_moisture == 0.5)
+    pos = tuple(int(c) for c in dry[0])
+    farm = Farm(model, tribe_id=0)
+    model.schedule.add(farm)
+    model.grid.place_agent(farm, pos)
+    farm.growth_bonus = 0 # Ignore a random river next to the farm
+    model.harvests.remove(farm)
+    model.harvests.add(farm, 0)
+
+    model.harvests.refresh(3)
+    model.drought_active = True
+    model.harvests.refresh(3)
+    assert farm.growth_progress == 3
+    assert farm.harvest_event is None
+
+    model.drought_active = False
+    model.harvests.refresh(20)
+    assert farm.harvest_event.time == 20 + 7 - 1
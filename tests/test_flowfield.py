@@ -0,0 +1,77 @@
+import numpy as np
+from civilization_sim.new_agents.people import Barbarian
+from civilization_sim.new_agents.resources import Mountain, River, Tree
+from civilization_sim.new_agents.buildings import House, Farm, Wall
+
+def place(model, agent, pos):
+    model.schedule.add(agent)
+    model.grid.place_agent(agent, pos)
+    return agent
+
+def clear_terrain(model, terrain_types=(Mountain,)):
+    for terrain_type in terrain_types:
+        for agent in list(model.agents_by_type.get(terrain_type, ())):
+            model.remove_agent(agent)
+
+def test_movement_costs_match_per_cell_cost(make_model):
+    model = make_model(initial_trees=3, initial_stone=3)
+    costs = model.movement_costs()
+    for x in range(model.grid.width):
+        for y in range(model.grid.height):
+            assert costs[x, y] == model.get_movement_cost((x, y))
+
+def test_field_recomputes_only_when_targets_or_costs_change(make_model):
+    model = make_model(initial_trees=3, initial_stone=3)
+    clear_terrain(model)
+    field = model.settlement_field
+    assert field.next_step((3, 3)) is None # Nothing to raid yet
+
+    house = place(model, House(model, tribe_id=0), (10, 10))
+    assert field.refresh()
+    assert not field.refresh()
+    assert field.distance[10, 10] == 0
+    assert np.isfinite(field.distance[11, 11])
+
+    place(model, Wall(model), (4, 4)) # Not a target and doesn't change movement costs
+    assert not field.refresh()
+
+    before = field.distance[12, 12]
+    tree = place(model, Tree(model), (11, 11)) # Forest is dearer to cross than grass
+    assert field.refresh()
+    assert field.distance[12, 12] > before
+    model.remove_agent(tree)
+    assert field.refresh()
+    assert field.distance[12, 12] == before
+
+    model.remove_agent(house)
+    assert field.refresh()
+    assert not np.isfinite(field.distance).any()
+
+def test_added_target_updates_field_from_the_old_one(make_model):
+    model = make_model()
+    clear_terrain(model, (Mountain, River))
+    field = model.settlement_field
+    place(model, House(model, tribe_id=0), (10, 10))
+    field.refresh()
+    assert field.distance[12, 12] == 4 # Two diagonal steps over grass
+
+    place(model, Farm(model, tribe_id=0), (2, 2))
+    assert field.refresh()
+    incremental = field.distance.copy()
+    field.version = field.distance = None # Force a recompute from scratch
+    field.refresh()
+    assert np.array_equal(incremental, field.distance)
+    assert field.distance[3, 3] == 2 and field.distance[12, 12] == 4
+
+def test_barbarian_walks_to_nearest_settlement(make_model):
+    model = make_model()
+    clear_terrain(model, (Mountain, River)) # Flat ground: the closest building is also the cheapest
+    place(model, Farm(model, tribe_id=0), (10, 10))
+    place(model, House(model, tribe_id=0), (2, 2))
+    barbarian = place(model, Barbarian(model), (14, 14))
+
+    for _ in range(4):
+        barbarian.step()
+    assert barbarian.pos == (10, 10)
+    barbarian.step() # Raids the farm
+    assert not model.agents_by_type.get(Farm)
@@ -0,0 +1,70 @@
+import numpy as np
+from civilization_sim.space import box_sum, distance_field
+from civilization_sim.new_agents.people import Person, Predator, Barbarian
+from civilization_sim.new_agents.resources import Mountain, River
+
+def place(model, agent, pos):
+    # Clear impassable terrain so moves are free
+    for other in model.grid.get_cell_list_contents([pos]):
+        if isinstance(other, (Mountain, River)):
+            model.remove_agent(other)
+    model.schedule.add(agent)
+    model.grid.place_agent(agent, pos)
+    return agent
+
+def test_distance_field_and_box_sum_wrap():
+    mask = np.zeros((6, 6), dtype=bool)
+    mask[0, 0] = True
+    distance = distance_field(mask, 3)
+    assert distance[0, 0] == 0
+    assert distance[5, 5] == 2 # Across both edges
+    assert distance[3, 3] == 3 # Capped
+    window = box_sum(mask.astype(int), 1)
+    assert window[5, 5] == 1 and window[1, 1] == 1 and window.sum() == 9
+
+def test_fields_track_agents(make_model):
+    model = make_model()
+    place(model, Predator(model), (5, 5))
+    place(model, Barbarian(model), (10, 10))
+    place(model, Person(model, tribe_id=0), (15, 15))
+    model.influence.update()
+    influence = model.influence
+    assert influence.threat.sum() == 2
+    assert influence.threat_near[7, 7] and not influence.threat_near[8, 4]
+    assert influence.threat_distance[6, 5] == 1
+    assert influence.prey_near[13, 15] and not influence.prey_near[15, 15]
+
+def test_person_flees_and_guard_pursues(make_model):
+    model = make_model()
+    place(model, Predator(model), (5, 5))
+    person = place(model, Person(model, tribe_id=0), (6, 6))
+    person.profession = "Farmer"
+    guard = place(model, Person(model, tribe_id=0), (7, 5))
+    guard.profession = "Guard"
+    for pos in model.grid.get_neighborhood((6, 6), moore=True) + model.grid.get_neighborhood((7, 5), moore=True):
+        for other in model.grid.get_cell_list_contents([pos]):
+            if isinstance(other, (Mountain, River)):
+                model.remove_agent(other)
+    model.influence.update()
+
+    person.move()
+    assert model.influence.threat_distance[person.pos] == 4
+    guard.move()
+    assert model.influence.threat_distance[guard.pos] == 1
+
+def test_predator_moves_toward_prey(make_model):
+    model = make_model()
+    predator = place(model, Predator(model), (5, 5))
+    place(model, Person(model, tribe_id=0), (7, 7))
+    model.influence.update()
+    predator.move()
+    assert predator.pos == (6, 6)
+
+def test_predator_ignores_prey_on_its_own_cell(make_model):
+    model = make_model()
+    predator = place(model, Predator(model), (5, 5))
+    place(model, Person(model, tribe_id=0), (5, 5))
+    place(model, Person(model, tribe_id=0), (5, 7))
+    model.influence.update()
+    predator.move()
+    assert predator.pos == (5, 6)
@@ -0,0 +1,92 @@
+import pytest
+from civilization_sim.new_agents import people
+from civilization_sim.new_agents.people import Person, Predator
+from civilization_sim.new_agents.resources import Mountain
+
+def make_idle(person):
+    # Not hungry and already holding an intent to reuse
+    person.energy = 30
+    person.last_decision = ("context", None)
+
+def think_pattern(model, person, steps=8):
+    pattern = []
+    for step in range(steps):
+        model.schedule.steps = step
+        pattern.append(model.lod.should_think(person, [person]))
+    return pattern
+
+def test_idle_person_staggers_thinking(make_model):
+    """Test that an idle person only re-plans every lod_max_stagger steps."""
+    model = make_model(initial_people=1, lod_max_stagger=4)
+    person = [a for a in model.schedule.agents if isinstance(a, Person)][0]
+    make_idle(person)
+    model.lod.update()
+
+    assert sum(think_pattern(model, person)) == 2
+    assert model.lod.tier_counts == {"active": 0, "idle": 8}
+
+def test_person_near_predator_thinks_every_step(make_model):
+    model = make_model(initial_people=1, initial_predators=1, lod_max_stagger=4)
+    person = [a for a in model.schedule.agents if isinstance(a, Person)][0]
+    predator = [a for a in model.schedule.agents if isinstance(a, Predator)][0]
+    make_idle(person)
+    model.grid.move_agent(person, (5, 5))
+    model.grid.move_agent(predator, (7, 7))
+    model.lod.update()
+
+    assert all(think_pattern(model, person))
+    assert model.lod.tier_counts == {"active": 8, "idle": 0}
+
+def test_person_near_enemy_at_war_thinks_every_step(make_model):
+    model = make_model(initial_people=2, num_tribes=2, lod_max_stagger=4)
+    p1 = [a for a in model.schedule.agents if isinstance(a, Person) and a.tribe_id == 0][0]
+    p2 = [a for a in model.schedule.agents if isinstance(a, Person) and a.tribe_id == 1][0]
+    make_idle(p1)
+    make_idle(p2)
+    model.grid.move_agent(p1, (2, 2))
+    model.grid.move_agent(p2, (4, 4))
+
+    model.lod.update()
+    assert not all(think_pattern(model, p1))
+
+    model.wars.add((0, 1))
+    model.lod.update()
+    assert all(think_pattern(model, p1))
+
+def test_idle_person_follows_planned_path(make_model):
+    model = make_model(initial_people=1, lod_max_stagger=4)
+    person = [a for a in model.schedule.agents if isinstance(a, Person)][0]
+    model.grid.move_agent(person, (5, 5))
+    for pos in [(5, 6), (5, 7)]:
+        for agent in model.grid.get_cell_list_contents([pos]):
+            if isinstance(agent, Mountain):
+                model.remove_agent(agent)
+    person.current_path = [(5, 6), (5, 7)]
+
+    assert person.follow_path()
+    assert person.pos == (5, 6)
+    assert person.current_path == [(5, 7)]
+
+def test_stagger_of_one_disables_lod(make_model):
+    model = make_model(initial_people=1, lod_max_stagger=1)
+    person = [a for a in model.schedule.agents if isinstance(a, Person)][0]
+    make_idle(person)
+    model.lod.update()
+    assert all(think_pattern(model, person))
+
+def test_idle_person_off_tick_does_not_replan(make_model, monkeypatch):
+    model = make_model(initial_people=1, lod_max_stagger=4)
+    person = [a for a in model.schedule.agents if isinstance(a, Person)][0]
+    make_idle(person)
+    person.profession = "Farmer" # Would path towards remembered food when thinking
+    person.current_path = []
+    model.lod.update()
+    model.schedule.steps = 1 - person.unique_id % 4 + 4 # Off its think tick
+    assert not model.lod.should_think(person, [person])
+
+    def fail(*args):
+        raise AssertionError("pathfinding on an off tick")
+    monkeypatch.setattr(people, "a_star_search", fail)
+    monkeypatch.setattr(Person, "move", lambda self: fail())
+    person.step()
+    assert person.pos is not None
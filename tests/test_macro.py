@@ -0,0 +1,117 @@
+import numpy as np
+from civilization_sim.diplomacy import WAR
+from civilization_sim.macro import MacroEngine, AggregateTribe
+from civilization_sim.new_agents.people import Person
+
+def add_person(model, tribe_id, pos):
+    person = Person(model, tribe_id=tribe_id)
+    person.age = 20
+    model.schedule.add(person)
+    model.grid.place_agent(person, pos)
+    return person
+
+def settle(model, tribe_id, origin, count=4):
+    return [add_person(model, tribe_id, (origin[0] + i, origin[1])) for i in range(count)]
+
+def warm_up(model, engine, steps):
+    for _ in range(steps):
+        engine.record()
+        model.schedule.steps += 1
+
+def test_stable_isolated_tribe_collapses(make_model):
+    model = make_model(num_tribes=2, macro_tribes=True)
+    engine = MacroEngine(model, window=5)
+    settle(model, 0, (2, 2))
+    settle(model, 1, (6, 3)) # Within radius of tribe 0
+    warm_up(model, engine, 5)
+    assert engine.stable_tribes() == []
+
+    for person in list(model.tribes.members(1)):
+        model.remove_agent(person)
+    engine.history.clear()
+    warm_up(model, engine, 5)
+    assert engine.stable_tribes() == [0]
+
+    engine.collapse(0)
+    assert not list(model.tribes.members(0))
+    assert engine.population() == 4
+    assert engine.aggregates[0].territory[2, 2] and not engine.aggregates[0].territory[12, 12]
+
+def test_war_and_inspection_keep_tribes_at_agent_level(make_model):
+    model = make_model(num_tribes=2, macro_tribes=True)
+    engine = MacroEngine(model, window=3)
+    settle(model, 0, (2, 2))
+    warm_up(model, engine, 3)
+    model.diplomacy.relations[0, 1] = model.diplomacy.relations[1, 0] = WAR
+    assert engine.stable_tribes() == []
+    model.diplomacy.relations[0, 1] = model.diplomacy.relations[1, 0] = 0
+    engine.inspect(0)
+    assert engine.stable_tribes() == []
+    engine.release(0)
+    assert engine.stable_tribes() == [0]
+
+def test_advance_updates_every_aggregate_at_once(make_model):
+    model = make_model(num_tribes=2, macro_tribes=True)
+    engine = MacroEngine(model)
+    territory = np.zeros((model.grid.width, model.grid.height), dtype=bool)
+    stockpiles = model.tribe_stockpiles
+    stockpiles[0]["food"], stockpiles[1]["food"] = 100, 3
+    food = stockpiles.fields["food"]
+    for tribe_id, growth, per_capita in ((0, np.log(1.5), 0.5), (1, 0.0, -1.0)):
+        flows = np.zeros(len(stockpiles.fields))
+        flows[food] = per_capita
+        engine.aggregates[tribe_id] = AggregateTribe(tribe_id, 10.0, growth, flows, [((1, 1), 20, 30, "Farmer")], territory, 0)
+
+    engine.advance()
+    assert engine.aggregates[0].population == 15.0
+    assert stockpiles[0]["food"] == 107 and engine.aggregates[0].carry[food] == 0.5
+    assert stockpiles[1]["food"] == 0 # Clamped, and the tribe is marked as starving
+    assert engine.aggregates[1].starving and not engine.aggregates[0].starving
+
+def test_expansion_restores_members_when_disturbed(make_model):
+    model = make_model(num_tribes=2, macro_tribes=True)
+    engine = MacroEngine(model, window=3)
+    settle(model, 0, (2, 2))
+    warm_up(model, engine, 3)
+    engine.collapse(0)
+    engine.aggregates[0].population = 6.0
+    model.schedule.steps += 10
+
+    add_person(model, 1, (4, 4)) # Walks into the territory
+    engine.step()
+    assert 0 not in engine.aggregates
+    members = list(model.tribes.members(0))
+    assert len(members) == 6
+    assert sorted(m.age for m in members) == [0, 0, 30, 30, 30, 30]
+    assert all(m.pos is not None for m in members)
+
+def test_model_steps_with_a_collapsed_tribe(make_model):
+    model = make_model(width=40, height=40, num_tribes=2, macro_tribes=True, seed=1)
+    engine = model.macro
+    engine.window = 3
+    settle(model, 0, (2, 2), count=3)
+    warm_up(model, engine, 3)
+    engine.collapse(0)
+    assert not model.tribes.people
+
+    for _ in range(10):
+        model.step()
+    # Its members count towards the population, so nobody migrates in to "save" the world
+    assert 0 in engine.aggregates and engine.population() == 3
+    assert not model.tribes.people
+    assert model.datacollector.get_model_vars_dataframe()["Люди"].iloc[-1] == 3
+    assert 0 not in engine.history
+
+def test_joining_a_collapsed_tribe_expands_it_first(make_model):
+    model = make_model(num_tribes=2, macro_tribes=True)
+    engine = model.macro
+    engine.window = 3
+    settle(model, 0, (2, 2))
+    warm_up(model, engine, 3)
+    engine.collapse(0)
+
+    add_person(model, 0, (15, 15))
+    assert 0 not in engine.aggregates
+    assert len(list(model.tribes.members(0))) == 5
+    engine.record()
+    assert len(engine.history[0]) == 1 # A fresh history, not the pre-collapse one
@@ -0,0 +1,47 @@
+import numpy as np
+from civilization_sim.market import ClearingHouse
+from civilization_sim.new_agents.buildings import Market
+
+def build_market(model, tribe_id, pos):
+    market = Market(model, tribe_id=tribe_id)
+    model.schedule.add(market)
+    model.grid.place_agent(market, pos)
+    return market
+
+def test_fill_serves_largest_orders_first():
+    filled = ClearingHouse.fill(np.array([3, 5, 2]), 6)
+    assert filled.tolist() == [1, 5, 0]
+    assert ClearingHouse.fill(np.array([3, 5, 2]), 20).tolist() == [3, 5, 2]
+
+def test_clearing_trades_wood_for_food_between_market_tribes(make_model):
+    model = make_model(num_tribes=4)
+    stockpiles = model.tribe_stockpiles
+    stockpiles[0]["food"], stockpiles[0]["wood"] = 200, 0 # Rich in food, needs wood
+    stockpiles[1]["food"], stockpiles[1]["wood"] = 0, 30 # Surplus wood
+    stockpiles[2]["food"], stockpiles[2]["wood"] = 0, 23
+    stockpiles[3]["food"], stockpiles[3]["wood"] = 0, 40 # No market, can't sell
+    for tribe_id, pos in ((0, (1, 1)), (1, (3, 3)), (2, (5, 5))):
+        build_market(model, tribe_id, pos)
+
+    food_before = stockpiles.column("food", [0, 1, 2, 3]).sum()
+    wood_before = stockpiles.column("wood", [0, 1, 2, 3]).sum()
+    assert model.market.clear() == 5
+
+    assert stockpiles[0]["wood"] == 5 and stockpiles[0]["food"] == 150
+    assert stockpiles[1]["wood"] == 25 and stockpiles[1]["food"] == 50
+    assert stockpiles[2]["wood"] == 23 and stockpiles[2]["food"] == 0
+    assert stockpiles[3]["wood"] == 40
+    assert stockpiles.column("food", [0, 1, 2, 3]).sum() == food_before
+    assert stockpiles.column("wood", [0, 1, 2, 3]).sum() == wood_before
+
+def test_no_trade_without_two_markets_or_a_buyer(make_model):
+    model = make_model(num_tribes=4)
+    stockpiles = model.tribe_stockpiles
+    stockpiles[0]["food"] = 200
+    stockpiles[1]["wood"] = 30
+    build_market(model, 0, (1, 1))
+    assert model.market.clear() == 0
+
+    build_market(model, 1, (3, 3))
+    stockpiles[0]["food"] = 100 # Nothing to spare above the reserve
+    assert model.market.clear() == 0
@@ -0,0 +1,99 @@
+import pytest
+from civilization_sim.model import CivilizationModel
+from civilization_sim.new_agents.people import Person, Barbarian
+from civilization_sim.new_agents.resources import Tree, Food
+from civilization_sim.new_agents.buildings import House
+
+def test_memory_is_bounded():
+    """Test that each resource type keeps only the most recently seen locations."""
+    model = CivilizationModel(initial_people=1, num_tribes=1, initial_food=0, initial_trees=0, initial_predators=0, initial_stone=0, initial_iron=0)
+    person = [a for a in model.schedule.agents if isinstance(a, Person)][0]
+    person.memory.capacity = 3
+
+    for x in range(5):
+        person.memory.remember(Tree, (x, 0), step=0)
+
+    # Oldest sightings were evicted (LRU)
+    assert person.memory.locations(Tree, step=0) == [(2, 0), (3, 0), (4, 0)]
+    assert len(model.memory_index) == 3
+
+def test_memory_expires():
+    """Test that old sightings expire on lookup."""
+    model = CivilizationModel(initial_people=1, num_tribes=1, initial_food=0, initial_trees=0, initial_predators=0, initial_stone=0, initial_iron=0)
+    person = [a for a in model.schedule.agents if isinstance(a, Person)][0]
+    person.memory.max_age = 10
+
+    person.memory.remember(Food, (1, 1), step=0)
+    person.memory.remember(Food, (2, 2), step=8)
+
+    assert person.memory.locations(Food, step=15) == [(2, 2)]
+    assert person.memory.locations(Food, step=30) == []
+    assert Food not in person.memory
+    assert len(model.memory_index) == 0
+
+def test_gathering_invalidates_memory():
+    """Test that removing a resource clears it from every memory that points at it."""
+    model = CivilizationModel(initial_people=2, num_tribes=1, initial_food=0, initial_trees=0, initial_predators=0, initial_stone=0, initial_iron=0)
+    p1, p2 = [a for a in model.schedule.agents if isinstance(a, Person)]
+
+    tree = Tree(model)
+    model.schedule.add(tree)
+    model.grid.place_agent(tree, (5, 5))
+    model.grid.move_agent(p1, (5, 5))
+
+    p1.memory.remember(Tree, (5, 5), step=0)
+    p2.memory.remember(Tree, (5, 5), step=0)
+
+    p1.gather_wood()
+
+    assert Tree not in p1.memory
+    assert Tree not in p2.memory
+    assert len(model.memory_index) == 0
+
+def test_invalidation_waits_for_last_item():
+    """Test that a location stays remembered while the cell still holds that resource."""
+    model = CivilizationModel(initial_people=1, num_tribes=0, initial_food=0, initial_trees=0, initial_predators=0, initial_stone=0, initial_iron=0)
+    person = [a for a in model.schedule.agents if isinstance(a, Person)][0]
+
+    food_items = []
+    for _ in range(2):
+        food = Food(model)
+        model.schedule.add(food)
+        model.grid.place_agent(food, (3, 3))
+        food_items.append(food)
+    person.memory.remember(Food, (3, 3), step=0)
+
+    model.remove_agent(food_items[0])
+    assert person.memory.locations(Food, step=0) == [(3, 3)]
+
+    model.remove_agent(food_items[1])
+    assert Food not in person.memory
+
+def test_destroyed_building_invalidates_memory():
+    """Test that Barbarian destruction clears remembered buildings."""
+    model = CivilizationModel(initial_people=1, num_tribes=1, initial_food=0, initial_trees=0, initial_predators=0, initial_stone=0, initial_iron=0)
+    person = [a for a in model.schedule.agents if isinstance(a, Person)][0]
+    model.grid.move_agent(person, (0, 0))
+
+    house = House(model)
+    model.schedule.add(house)
+    model.grid.place_agent(house, (8, 8))
+    person.memory.remember(House, (8, 8), step=0)
+
+    barbarian = Barbarian(model)
+    model.schedule.add(barbarian)
+    model.grid.place_agent(barbarian, (8, 8))
+    barbarian.step()
+
+    assert house.pos is None
+    assert House not in person.memory
+
+def test_dead_person_releases_memory():
+    """Test that a dead person's subscriptions are dropped from the index."""
+    model = CivilizationModel(initial_people=1, num_tribes=0, initial_food=0, initial_trees=0, initial_predators=0, initial_stone=0, initial_iron=0)
+    person = [a for a in model.schedule.agents if isinstance(a, Person)][0]
+    person.memory.remember(Food, (1, 1), step=0)
+    assert len(model.memory_index) == 1
+
+    model.remove_agent(person)
+    assert len(model.memory_index) == 0
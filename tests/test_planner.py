@@ -0,0 +1,96 @@
+import pytest
+from civilization_sim.new_agents.people import Person
+from civilization_sim.new_agents.buildings import House, Farm, Wall, Road, Library, Barracks
+
+def place(model, building, pos):
+    model.schedule.add(building)
+    model.grid.place_agent(building, pos)
+    return building
+
+def test_affordable_rules_are_reused_within_a_stockpile_band(make_model):
+    model = make_model(initial_people=1)
+    person = [a for a in model.schedule.agents if isinstance(a, Person)][0]
+    stockpile = model.tribe_stockpiles[person.tribe_id]
+    stockpile.update({"wood": 5, "stone": 5, "food": 0})
+
+    planner = model.build_planner
+    assert planner.order_for(person.tribe_id, (5, 5)).building is Farm
+    stockpile["food"] = 10 # Still below every food threshold
+    planner.order_for(person.tribe_id, (5, 5))
+    assert planner.stats["bands"] == 1
+
+    stockpile.update({"wood": 500, "stone": 500})
+    assert planner.order_for(person.tribe_id, (5, 5)).building is Library
+    stockpile.update({"wood": 800, "stone": 800}) # Same band: past every wood and stone threshold
+    planner.order_for(person.tribe_id, (5, 5))
+    assert planner.stats["bands"] == 2
+
+def test_site_masks_follow_buildings_around_the_cell(make_model):
+    model = make_model(initial_people=1)
+    planner = model.build_planner
+    wall = 1 << [rule.building for rule in planner.rules].index(Wall)
+    assert not planner.allowed
+
+    house = place(model, House(model), (5, 5))
+    assert planner.allowed[(5, 6)] & wall
+    assert not planner.allowed[(5, 5)] & wall # Blocked by the House itself
+    assert (5, 7) not in planner.allowed
+
+    model.remove_agent(house)
+    assert not planner.allowed
+
+def test_builder_builds_on_its_own_cell(make_model):
+    model = make_model(initial_people=1)
+    person = [a for a in model.schedule.agents if isinstance(a, Person)][0]
+    place(model, House(model), (5, 5))
+    model.grid.move_agent(person, (4, 6))
+    model.tribe_stockpiles[person.tribe_id]["stone"] = 30
+
+    wall = model.build_planner.build(person)
+    assert isinstance(wall, Wall)
+    assert wall.pos == (4, 6) and person.pos == (4, 6)
+
+def test_site_index_tracks_placement_and_removal(make_model):
+    model = make_model(initial_people=1)
+    sites = model.grid.sites
+    house = place(model, House(model), (5, 5))
+
+    assert sites.has_any((5, 5), (House,))
+    assert sites.near_any((5, 6), (House, Farm))
+    assert not sites.near_any((5, 7), (House, Farm))
+
+    model.remove_agent(house)
+    assert not sites.has_any((5, 5), (House,))
+    assert not sites.near_any((5, 6), (House, Farm))
+
+def test_wall_needs_adjacent_house(make_model):
+    model = make_model(initial_people=1)
+    person = [a for a in model.schedule.agents if isinstance(a, Person)][0]
+    model.tribe_stockpiles[person.tribe_id]["stone"] = 30
+    model.grid.move_agent(person, (2, 2))
+
+    # No house next to (2, 2): nothing to build with stone alone
+    assert model.build_planner.build(person) is None
+
+    place(model, House(model), (2, 3))
+    wall = model.build_planner.build(person)
+    assert isinstance(wall, Wall)
+    assert wall.pos == (2, 2)
+    assert model.tribe_stockpiles[person.tribe_id]["stone"] == 27
+
+def test_blocked_rule_falls_through_to_next_priority(make_model):
+    model = make_model(initial_people=10)
+    person = [a for a in model.schedule.agents if isinstance(a, Person)][0]
+    stockpile = model.tribe_stockpiles[person.tribe_id]
+    stockpile.update({"wood": 30, "stone": 30, "science": 5})
+    model.grid.move_agent(person, (4, 4))
+
+    # Barracks may not be built on a Road, but a Library may
+    place(model, Road(model), (4, 4))
+    building = model.build_planner.build(person)
+    assert isinstance(building, Library)
+    assert building.tribe_id == person.tribe_id
+
+    # Off-road, Barracks has the higher priority
+    model.grid.move_agent(person, (8, 8))
+    assert isinstance(model.build_planner.build(person), Barracks)
@@ -0,0 +1,42 @@
+from civilization_sim.new_agents.people import Person
+from civilization_sim.new_agents.resources import Food
+
+def test_removal_outside_step_is_immediate(make_model):
+    model = make_model(initial_people=3)
+    person = [a for a in model.schedule.agents if isinstance(a, Person)][0]
+    model.remove_agent(person)
+    assert person.pos is None
+    assert person not in model.schedule.agents
+    assert not model.tombstones
+    model.remove_agent(person) # Removing twice is harmless
+
+def test_removals_during_step_are_flushed_at_the_end(make_model):
+    model = make_model(initial_people=3)
+    food = Food(model)
+    model.schedule.add(food)
+    model.grid.place_agent(food, (4, 4))
+    person = [a for a in model.schedule.agents if isinstance(a, Person)][0]
+
+    model.stepping = True
+    model.remove_agent(food)
+    model.remove_agent(person)
+    # Gone from the grid and the registries at once, still scheduled until the flush
+    assert food.pos is None and person.pos is None
+    assert person.unique_id not in model.tribes.people
+    assert not person.alive
+    assert food in model.schedule.agents
+    model.remove_agent(food)
+    assert len(model.tombstones) == 2
+
+    model.stepping = False
+    assert model.flush_removals() == 2
+    assert food not in model.schedule.agents and person not in model.schedule.agents
+    assert not model.agents_by_type.get(Food)
+
+def test_step_compacts_dead_agents(make_model):
+    model = make_model(initial_people=3)
+    for person in [a for a in model.schedule.agents if isinstance(a, Person)]:
+        person.energy = 1 # Starve this step
+    model.step()
+    assert not model.tombstones
+    assert all(agent.pos is not None for agent in model.schedule.agents)
@@ -0,0 +1,47 @@
+import pytest
+from civilization_sim.model import CivilizationModel
+from civilization_sim.tech import TechTree, ResearchTracker
+
+TECHS = {
+    "Writing": {"cost": 40, "req": None},
+    "Mining": {"cost": 30, "req": None},
+    "Philosophy": {"cost": 80, "req": "Writing"},
+    "Bronze Working": {"cost": 60, "req": ["Mining", "Writing"]},
+}
+
+def test_tree_compiles_prerequisite_masks():
+    tree = TechTree(TECHS)
+    assert tree.prereqs[tree.bits["Bronze Working"]] == tree.mask_of(["Mining", "Writing"])
+    assert [tree.names[i] for i in tree.frontier(0)] == ["Writing", "Mining"]
+    assert [tree.names[i] for i in tree.frontier(tree.mask_of(["Writing"]))] == ["Mining", "Philosophy"]
+
+def test_tree_rejects_cycles():
+    with pytest.raises(ValueError):
+        TechTree({"A": {"cost": 1, "req": "B"}, "B": {"cost": 1, "req": "A"}})
+
+def test_threshold_and_frontier_update():
+    research = ResearchTracker(TechTree(TECHS))
+    techs = set()
+    assert research.affordable(0, techs, 29) == []
+    assert research.thresholds[0] == 30
+    assert research.affordable(0, techs, 40) == ["Writing", "Mining"]
+
+    research.learn(0, techs, "Mining")
+    research.learn(0, techs, "Writing")
+    assert research.thresholds[0] == 60
+    assert research.affordable(0, techs, 100) == ["Philosophy", "Bronze Working"]
+
+    # Techs granted outside of learn() are picked up too
+    techs.update({"Philosophy", "Bronze Working"})
+    assert research.affordable(0, techs, 1000) == []
+
+def test_check_research_spends_science():
+    model = CivilizationModel(initial_people=1, num_tribes=1, initial_food=0, initial_trees=0, initial_predators=0)
+    model.tribe_stockpiles[0]["science"] = 29
+    model.check_research()
+    assert model.tribe_technologies[0] == set()
+
+    model.tribe_stockpiles[0]["science"] = 30
+    model.check_research()
+    assert model.tribe_technologies[0] in ({"Agriculture"}, {"Mining"})
+    assert model.tribe_stockpiles[0]["science"] == 0
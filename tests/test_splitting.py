@@ -69,3 +69,108 @@ def test_traits_bonuses():
         
     # Actual gain depends on random religion/professions too, so just check it increased significantly
     assert new_food - initial_food >= 15
+
+def test_membership_registry():
+    model = CivilizationModel(num_tribes=2, initial_people=6, initial_predators=0)
+    people = [a for a in model.schedule.agents if isinstance(a, Person)]
+    assert model.tribe_counts == {0: 3, 1: 3}
+
+    # Birth
+    people[0].energy = 50
+    people[0].reproduce()
+    assert model.tribe_counts[people[0].tribe_id] == 4
+
+    # Changing tribe
+    people[1].tribe_id = people[0].tribe_id
+    assert set(model.tribes.members(people[0].tribe_id)) >= {people[0], people[1]}
+
+    # Death
+    model.remove_agent(people[0])
+    assert people[0] not in model.tribes.members(people[1].tribe_id)
+
+    # Tribes without members disappear
+    for person in list(model.tribes.members(1)):
+        model.remove_agent(person)
+    assert 1 not in model.tribe_counts
+    assert sum(model.tribe_counts.values()) == sum(1 for a in model.schedule.agents if isinstance(a, Person) and a.tribe_id is not None)
+
+def test_leader_vacancy_and_election():
+    model = CivilizationModel(num_tribes=2, initial_people=5, initial_predators=0)
+    model.tribe_government[0] = "Monarchy"
+    people = [a for a in model.schedule.agents if isinstance(a, Person)]
+    for age, person in enumerate(people):
+        person.age = age
+    # Elders are ordered by birth, so re-register after changing ages directly
+    for person in people:
+        person.tribe_id = None
+        person.tribe_id = 0
+
+    model.update_politics()
+    leader = model.tribes.leader(0)
+    assert leader is people[-1]
+    assert not model.tribes.vacancies
+
+    # No election while the leader is alive
+    model.update_politics()
+    assert model.tribes.leader(0) is leader
+
+    # Death marks the seat vacant, the next oldest takes over
+    model.remove_agent(leader)
+    assert 0 in model.tribes.vacancies
+    model.update_politics()
+    assert model.tribes.leader(0) is people[-2]
+
+    # Leaving the tribe also vacates the seat
+    people[-2].tribe_id = 1
+    model.update_politics()
+    assert model.tribes.leader(0) is people[-3]
+
+def test_elder_heap_stays_bounded():
+    model = CivilizationModel(num_tribes=2, initial_people=6, initial_predators=0)
+    people = [a for a in model.schedule.agents if isinstance(a, Person)]
+    for person in people:
+        person.tribe_id = 0
+    for _ in range(50):
+        for person in people[1:]:
+            person.tribe_id = 1
+            person.tribe_id = 0
+    assert len(model.tribes._elders[0]) <= 2 * len(people)
+    assert model.tribes.oldest(0) in people
+
+def test_theocracy_elects_priest():
+    model = CivilizationModel(num_tribes=1, initial_people=4, initial_predators=0)
+    model.tribe_government[0] = "Theocracy"
+    people = [a for a in model.schedule.agents if isinstance(a, Person)]
+    for person in people:
+        person.profession = "Farmer"
+    people[2].profession = "Priest"
+
+    model.update_politics()
+    assert model.tribe_leaders[0] == people[2].unique_id
+
+def test_nearest_members_follow_moves():
+    model = CivilizationModel(num_tribes=1, initial_people=40, initial_predators=0, width=20, height=20)
+    people = [a for a in model.schedule.agents if isinstance(a, Person)]
+    for person in people:
+        person.tribe_id = 0
+
+    def distances(pos, group):
+        return sorted(abs(p.pos[0] - pos[0]) + abs(p.pos[1] - pos[1]) for p in group)
+
+    # Same distances as sorting every member
+    origin = people[0].pos
+    nearest = model.tribes.nearest(0, origin, 13)
+    assert len(nearest) == 13
+    assert distances(origin, nearest) == distances(origin, people)[:13]
+
+    # Moving a member updates its bucket
+    mover = people[1]
+    model.grid.move_agent(mover, (19, 19))
+    assert model.tribes.nearest(0, (19, 19), 1)[0].pos == (19, 19)
+    assert distances((19, 19), model.tribes.nearest(0, (19, 19), 5)) == distances((19, 19), people)[:5]
+
+    # Split rebels are the members closest to the rebel leader
+    model.split_tribe(0)
+    rebels = list(model.tribes.members(1))
+    assert len(rebels) == 13
+    assert len(model.tribes.members(0)) == 27
@@ -0,0 +1,51 @@
+from civilization_sim.model import CivilizationModel
+from civilization_sim.new_agents.people import Person
+from civilization_sim.new_agents.resources import Tree
+from civilization_sim.stockpiles import StockpileTable
+
+def test_dict_like_access():
+    stockpiles = StockpileTable()
+    stockpiles[3] = {"food": 50, "wood": 10}
+    stockpile = stockpiles[3]
+    stockpile["food"] -= 5
+    stockpile["morale"] = stockpile.get("morale", 0) + 1
+
+    assert stockpile["food"] == 45
+    assert stockpile["morale"] == 1
+    assert stockpile.get("iron", 0) == 0
+    assert 3 in stockpiles and 4 not in stockpiles
+    assert dict(stockpile)["wood"] == 10
+
+def test_table_grows_and_keeps_values():
+    stockpiles = StockpileTable()
+    for tribe_id in range(20):
+        stockpiles[tribe_id] = {"food": tribe_id}
+    assert stockpiles[7]["food"] == 7
+    assert stockpiles.array.shape[0] == 20
+    assert stockpiles.column("food", [19, 2, 99]).tolist() == [19, 2, 0]
+
+def test_batched_deposits():
+    stockpiles = StockpileTable()
+    stockpiles[0] = {"wood": 1}
+    stockpiles.deposit(0, "wood", 1) # No batch open: applied at once
+    assert stockpiles[0]["wood"] == 2
+
+    stockpiles.begin()
+    stockpiles.deposit(0, "wood", 3)
+    stockpiles.deposit(0, "wood", 4)
+    assert stockpiles[0]["wood"] == 2
+    assert stockpiles.commit() == 2
+    assert stockpiles[0]["wood"] == 9
+
+def test_gathered_wood_lands_after_the_step():
+    model = CivilizationModel(initial_people=1, num_tribes=1, initial_food=0, initial_trees=0, initial_predators=0, initial_stone=0, initial_iron=0)
+    person = [a for a in model.schedule.agents if isinstance(a, Person)][0]
+    tree = Tree(model)
+    model.schedule.add(tree)
+    model.grid.place_agent(tree, person.pos)
+
+    model.tribe_stockpiles.begin()
+    person.gather_wood()
+    assert model.tribe_stockpiles[0]["wood"] == 0
+    model.tribe_stockpiles.commit()
+    assert model.tribe_stockpiles[0]["wood"] >= 1
@@ -0,0 +1,51 @@
+from civilization_sim.climate import Season
+from civilization_sim.model import CivilizationModel
+from civilization_sim.new_agents.people import Person
+from civilization_sim.timers import TimingWheel
+
+def run(wheel, ticks):
+    for _ in range(ticks):
+        wheel.advance()
+
+def test_timers_fire_on_their_tick_across_levels():
+    wheel = TimingWheel(slots=4, levels=2) # Overflow beyond 16 ticks
+    fired = []
+    for delay in (1, 3, 4, 5, 15, 16, 17, 40):
+        wheel.schedule(delay, lambda d=delay: fired.append((d, wheel.now)))
+    run(wheel, 45)
+    assert fired == [(d, d) for d in (1, 3, 4, 5, 15, 16, 17, 40)]
+
+def test_periodic_and_cancelled_timers():
+    wheel = TimingWheel(slots=4, levels=2)
+    ticks = []
+    wheel.schedule(3, lambda: ticks.append(wheel.now), period=5)
+    cancelled = wheel.schedule(2, lambda: ticks.append("cancelled"))
+    cancelled.cancel()
+    run(wheel, 20)
+    assert ticks == [3, 8, 13, 18]
+    assert len(wheel) == 1
+
+def test_season_changes_on_schedule():
+    model = CivilizationModel(initial_people=0, num_tribes=0, initial_food=0, initial_trees=0, initial_predators=0, initial_stone=0, initial_iron=0)
+    # The wheel ticks at the end of each step; the season turns after step 98 (before the 100th step)
+    run(model.timers, 98)
+    assert model.season == Season.SPRING
+    run(model.timers, 1)
+    assert model.season == Season.SUMMER
+    run(model.timers, 100)
+    assert model.season == Season.AUTUMN
+
+def test_person_scans_every_eleven_steps():
+    model = CivilizationModel(initial_people=1, num_tribes=1, initial_food=0, initial_trees=0, initial_predators=0, initial_stone=0, initial_iron=0)
+    person = [a for a in model.schedule.agents if isinstance(a, Person)][0]
+    person.scan_environment()
+    assert not person.scan_due
+    run(model.timers, 10)
+    assert not person.scan_due
+    run(model.timers, 1)
+    assert person.scan_due
+
+    # Dead persons leave no live timers behind
+    person.scan_environment()
+    model.remove_agent(person)
+    assert person.scan_timer.cancelled